@@ -1,23 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
 import json
-from PIL import Image, ImageTk, ImageDraw, ImageFont
-import threading
-import cv2
-import numpy as np
-from mutagen.mp3 import MP3
-import requests
-import subprocess
-from datetime import datetime, timedelta
-import math
-import PyPDF2
-import time
-import shutil
-import google.generativeai as genai
-from openai import OpenAI
+from PIL import Image, ImageTk
 from dotenv import load_dotenv
 import os
 
+from job_executor import JOB_RUNNING, JobExecutor
+from precompute import Precomputer
+from reels_pipeline import (ReelsPipeline, build_script_prompt, extract_image_prompts, style_texts,
+                            validate_script_json)
+from video_generator import DEFAULT_ENCODING_PROFILE, ENCODING_PROFILES
+
 # .env dosyasını yükle
 load_dotenv()
 
@@ -29,47 +22,76 @@ openai_api_key = os.getenv("OPENAI_API_KEY")
 # API anahtarlarını sınıfta kullan
 
 
-class ProcessingDialog:
-    def __init__(self, parent, title="İşlem"):
-        self.dialog = tk.Toplevel(parent)
-        self.dialog.title(title)
-        self.dialog.geometry("300x100")
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        
-        # Center window
-        self.center_window()
-        
-        # Processing message
-        self.message_var = tk.StringVar()
-        self.label = ttk.Label(
-            self.dialog,
-            textvariable=self.message_var,
-            font=('Helvetica', 10),
-            wraplength=250
+class JobPanel(ttk.LabelFrame):
+    """Arka planda çalışan işlerin listesi, durumları ve iptal butonu"""
+
+    POLL_INTERVAL = 100
+
+    def __init__(self, parent, root, executor):
+        super().__init__(parent, text="İşler", padding="5")
+        self.root = root
+        self.executor = executor
+        self.rows = {}
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=("durum", "mesaj", "sure"),
+            height=4
         )
-        self.label.pack(pady=20)
-        
-        # Keep dialog on top
-        self.dialog.attributes('-topmost', True)
-        
-    def center_window(self):
-        self.dialog.update_idletasks()
-        width = self.dialog.winfo_width()
-        height = self.dialog.winfo_height()
-        x = (self.dialog.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.dialog.winfo_screenheight() // 2) - (height // 2)
-        self.dialog.geometry(f'{width}x{height}+{x}+{y}')
-    
-    def update_message(self, message):
-        self.message_var.set(message)
-        self.dialog.update()
-    
-    def close(self):
-        self.dialog.grab_release()
-        self.dialog.destroy()
-        
-        
+        self.tree.heading("#0", text="İş")
+        self.tree.heading("durum", text="Durum")
+        self.tree.heading("mesaj", text="Mesaj")
+        self.tree.heading("sure", text="Süre")
+        self.tree.column("#0", width=250)
+        self.tree.column("durum", width=100)
+        self.tree.column("mesaj", width=600)
+        self.tree.column("sure", width=70, anchor=tk.E)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        button_frame = ttk.Frame(self)
+        button_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(5, 0))
+        ttk.Button(
+            button_frame,
+            text="Seçili İşi İptal Et",
+            command=self.cancel_selected
+        ).pack(fill=tk.X, pady=(0, 5))
+        ttk.Button(
+            button_frame,
+            text="Bitenleri Temizle",
+            command=self.clear_finished
+        ).pack(fill=tk.X)
+
+        self.executor.add_listener(self.update_job)
+        self.poll()
+
+    def poll(self):
+        """İş olaylarını Tk ana döngüsünde işle, çalışan işlerin süresini güncelle"""
+        self.executor.poll()
+        for job in self.executor.active_jobs():
+            if job.state == JOB_RUNNING and job.id in self.rows:
+                self.tree.set(self.rows[job.id], "sure", f"{job.elapsed():.0f} sn")
+        self.root.after(self.POLL_INTERVAL, self.poll)
+
+    def update_job(self, job):
+        values = (job.state, job.message, f"{job.elapsed():.0f} sn")
+        if job.id not in self.rows:
+            self.rows[job.id] = self.tree.insert("", tk.END, text=job.title, values=values)
+        else:
+            self.tree.item(self.rows[job.id], values=values)
+
+    def cancel_selected(self):
+        selected = set(self.tree.selection())
+        for job in self.executor.active_jobs():
+            if self.rows.get(job.id) in selected:
+                job.cancel()
+
+    def clear_finished(self):
+        for job in self.executor.jobs:
+            if job.finished and job.id in self.rows:
+                self.tree.delete(self.rows.pop(job.id))
+        self.executor.clear_finished()
+
+
 class PDFAnalyzerFrame(ttk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
@@ -80,45 +102,11 @@ class PDFAnalyzerFrame(ttk.Frame):
     def create_project_folder(self, pdf_content):
         """PDF içeriğinden proje klasörü oluştur"""
         try:
-            # İlk sayfanın ilk birkaç satırını başlık olarak kullan
-            title_lines = pdf_content.split('\n')[:3]  # İlk 3 satır
-            project_title = ' '.join(line.strip() for line in title_lines if line.strip())[:100]
-            
-            # Başlığı klasör adına uygun hale getir
-            folder_name = "".join(x for x in project_title if x.isalnum() or x in (" ", "-", "_"))
-            folder_name = folder_name.replace(" ", "_")[:50]  # Uzunluğu sınırla
-            
-            # Tarih ekle (benzersiz olması için)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            project_folder = f"{folder_name}_{timestamp}"
-            
-            # Ana proje klasörünü oluştur
-            os.makedirs("projects", exist_ok=True)
-            full_project_path = os.path.join("projects", project_folder)
-            os.makedirs(full_project_path, exist_ok=True)
-            
-            # Alt klasörleri oluştur
-            folders = [
-                'pdf_analizi',
-                'prompt_ciktisi',
-                'gorseller',
-                'video_dosyalari',
-                'video_dosyalari/sesler',
-                'final_video'
-            ]
-            
-            for folder in folders:
-                os.makedirs(os.path.join(full_project_path, folder), exist_ok=True)
-            
-            return full_project_path
-            
+            return self.controller.pipeline.create_project_folder(pdf_content)
         except Exception as e:
             messagebox.showerror("Hata", f"Proje klasörü oluşturma hatası: {str(e)}")
             return None
     
-    
-    
-    
     def setup_ui(self):
         # Frame başlığı
         header_frame = ttk.Frame(self)
@@ -164,307 +152,124 @@ class PDFAnalyzerFrame(ttk.Frame):
             state=tk.DISABLED  # Başlangıçta devre dışı
         )
         self.analyze_button.pack(side=tk.LEFT, padx=5)
+        
+        # İşaretlenirse önbellekteki analiz kullanılmaz, Gemini'ye yeniden sorulur
+        self.bypass_cache = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            button_frame,
+            text="Önbelleği atla",
+            variable=self.bypass_cache
+        ).pack(side=tk.LEFT, padx=5)
 
     def load_pdf_content(self, pdf_path):
-        """PDF içeriğini yükle ve metin kontrolü yap"""
-        try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-        
-                # Metin içeriği kontrolü
-                if not text.strip() or len(text.strip()) < 50:
-                    messagebox.showerror(
-                        "Hata", 
-                        "PDF dosyası yeterli metin içermiyor veya sadece görsel içeriyor.\n"
-                        "Lütfen metin içeren başka bir PDF dosyası seçin."
-                    )
-                    self.content_text.delete(1.0, tk.END)
-                    self.analyze_button.configure(state=tk.DISABLED)
-                    return None
-        
+        """PDF içeriğini arka planda yükle ve metin kontrolü yap"""
+        self.analyze_button.configure(state=tk.DISABLED)
+        self.content_text.delete(1.0, tk.END)
+        self.content_text.insert(tk.END, "PDF okunuyor...")
+
+        def run(job):
+            job.report("PDF okunuyor...")
+            return self.controller.pipeline.extract_pdf_text(pdf_path, progress=job.report)
+
+        def on_success(text):
+            # Bu arada başka bir PDF seçildiyse sonuç kullanılmaz
+            if self.controller.pdf_path != pdf_path:
+                return
+            # Aynı PDF'e geri dönüldüyse mevcut proje klasörünü kullan
+            same_pdf = (getattr(self.controller, 'loaded_pdf_path', None) == pdf_path
+                        and self.controller.project_folder
+                        and os.path.isdir(self.controller.project_folder))
+            if not same_pdf:
                 # Proje klasörü oluştur ve controller'a aktar
                 project_folder = self.create_project_folder(text)
                 if project_folder:
                     self.controller.project_folder = project_folder
-        
-                self.content_text.delete(1.0, tk.END)
-                self.content_text.insert(tk.END, text)
-                self.analyze_button.configure(state=tk.NORMAL)
-                return text
-                    
-        except Exception as e:
-                messagebox.showerror("Hata", f"PDF yüklenirken hata oluştu: {str(e)}")
-                self.analyze_button.configure(state=tk.DISABLED)
-                return None
+                    self.controller.loaded_pdf_path = pdf_path
+                    self.controller.pipeline.save_pdf_text(text, project_folder)
+
+            self.content_text.delete(1.0, tk.END)
+            self.content_text.insert(tk.END, text)
+            self.analyze_button.configure(state=tk.NORMAL)
+
+        def on_error(e):
+            if self.controller.pdf_path != pdf_path:
+                return
+            messagebox.showerror("Hata", f"PDF yüklenirken hata oluştu: {str(e)}")
+            self.content_text.delete(1.0, tk.END)
+            self.analyze_button.configure(state=tk.DISABLED)
+
+        return self.controller.jobs.submit(
+            f"PDF Yükleme: {os.path.basename(pdf_path)}",
+            run,
+            on_success=on_success,
+            on_error=on_error
+        )
 
     def analyze_pdf(self):
-        """PDF'yi analiz et ve Gemini API ile özet çıkar"""
-        try:
-            pdf_content = self.content_text.get(1.0, tk.END.strip())
-            if not pdf_content:
-                messagebox.showerror("Hata", "PDF içeriği bulunamadı!")
+        """PDF'yi arka planda Gemini API ile analiz et"""
+        pdf_content = self.content_text.get(1.0, tk.END.strip())
+        if not pdf_content:
+            messagebox.showerror("Hata", "PDF içeriği bulunamadı!")
+            return
+
+        project_folder = getattr(self.controller, 'project_folder', None)
+        use_cache = not self.bypass_cache.get()
+        self.analyze_button.configure(state=tk.DISABLED)
+        self.analysis_text.delete(1.0, tk.END)
+
+        def show_chunk(chunk):
+            # Yanıt geldikçe ekrana eklenir; başka bir PDF'e geçildiyse yazılmaz
+            if self.controller.project_folder == project_folder:
+                self.analysis_text.insert(tk.END, chunk)
+                self.analysis_text.see(tk.END)
+
+        def run(job):
+            job.report("PDF analiz ediliyor...")
+            # Analiz sonuçları proje klasörüne de kaydedilir
+            return self.controller.pipeline.analyze_pdf(
+                pdf_content,
+                project_folder,
+                use_cache=use_cache,
+                progress=job.report,
+                on_chunk=lambda chunk: job.post(lambda: show_chunk(chunk))
+            )
+
+        def on_success(analysis):
+            self.analyze_button.configure(state=tk.NORMAL)
+            # Bu arada başka bir PDF'e geçildiyse ekran güncellenmez
+            if self.controller.project_folder != project_folder:
                 return
-    
-            # Show processing dialog
-            processing = ProcessingDialog(self.winfo_toplevel(), "PDF Analizi")
-            processing.update_message("PDF analiz ediliyor...")
-    
-            analysis_prompt = f"""
-            Aşağıdaki PDF içeriğini analiz et ve şu başlıklar altında özetle (detaya gir):
-    
-            1. Ana Konular
-            2. Önemli Noktalar
-            3. Önerilen Konu Başlıkları (4 başlık öner)
-            4. Hedef Kitle Önerisi
-            5. İçerik Tonu Önerisi
-    
-            PDF İçeriği:
-            {pdf_content[:]}
-            """
-    
-            model = genai.GenerativeModel("gemini-1.5-pro")
-            response = model.generate_content(analysis_prompt)
-    
-            # Analiz sonuçlarını hem metin kutusuna hem de dosyaya kaydet
             self.analysis_text.delete(1.0, tk.END)
-            self.analysis_text.insert(tk.END, response.text)
-    
-            # Analiz sonuçlarını dosyaya kaydet
-            if hasattr(self.controller, 'project_folder'):
-                analysis_path = os.path.join(
-                    self.controller.project_folder,
-                    'pdf_analizi',
-                    'analiz_sonuclari.txt'
-                )
-                with open(analysis_path, 'w', encoding='utf-8') as f:
-                    f.write(response.text)
-    
+            self.analysis_text.insert(tk.END, analysis)
+
             # Controller'a analiz sonucunu aktar
-            self.controller.pdf_analysis = response.text
-    
-            processing.close()
+            self.controller.pdf_analysis = analysis
             messagebox.showinfo("Başarılı", "PDF analizi tamamlandı!")
-    
-        except Exception as e:
-            if 'processing' in locals():
-                processing.close()
-            messagebox.showerror("Hata", f"Analiz sırasında hata oluştu: {str(e)}")
 
-class VideoGenerator:
-    def __init__(self, output_dir, generation_data):
-        self.output_dir = output_dir
-        self.generation_data = generation_data
-        self.height = 1920
-        self.width = 1080
-        self.fps = 30
-
-    def create_base_frame(self):
-        """Temel frame oluştur"""
-        return np.zeros((self.height, self.width, 3), dtype=np.uint8)
-
-    def add_text_to_frame(self, frame, text, y_position, font_size=60, color=(255, 255, 255)):
-        """Frame'e text ekle"""
-        img_pil = Image.fromarray(frame)
-        draw = ImageDraw.Draw(img_pil)
-        
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            font = ImageFont.load_default()
-        
-        # Text wrap
-        words = text.split()
-        lines = []
-        current_line = []
-        max_width = self.width - 100  # Margins
-        
-        for word in words:
-            current_line.append(word)
-            line = ' '.join(current_line)
-            line_width = draw.textlength(line, font=font)
-            if line_width > max_width:
-                current_line.pop()
-                lines.append(' '.join(current_line))
-                current_line = [word]
-        lines.append(' '.join(current_line))
-        
-        y = y_position
-        for line in lines:
-            text_width = draw.textlength(line, font=font)
-            x = (self.width - text_width) / 2
-            draw.text((x, y), line, font=font, fill=color)
-            y += font_size * 1.5
-            
-        return np.array(img_pil)
-
-    def add_text_overlay(self, frame, text, pos_y, font_size=40):
-        """Yarı saydam arkaplan üzerine text ekle"""
-        overlay = frame.copy()
-        overlay_height = 200
-        cv2.rectangle(overlay, 
-                     (0, pos_y), 
-                     (self.width, pos_y + overlay_height),
-                     (0, 0, 0), 
-                     -1)
-        
-        alpha = 0.7
-        frame = cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0)
-        return self.add_text_to_frame(frame, text, pos_y + 20, font_size)
-
-    def get_audio_duration(self, audio_path):
-        """MP3 dosyasının süresini al"""
-        try:
-            audio = MP3(audio_path)
-            return audio.info.length
-        except Exception as e:
-            print(f"Ses süresi alınamadı: {str(e)}")
-            return 5.0  # Varsayılan süre
-
-    def create_title_overlay(self, image, title):
-        """İlk görsele başlık ekle"""
-        overlay_height = 200
-        overlay = image.copy()
-        
-        # Üst kısma yarı saydam siyah overlay ekle
-        cv2.rectangle(overlay, 
-                     (0, 0),
-                     (self.width, overlay_height),
-                     (0, 0, 0),
-                     -1)
-        
-        # Blend the overlay
-        alpha = 0.7
-        image = cv2.addWeighted(overlay, alpha, image, 1 - alpha, 0)
-        
-        # Başlığı ekle
-        return self.add_text_to_frame(image, title, 50, 60)
+        def on_error(e):
+            self.analyze_button.configure(state=tk.NORMAL)
+            messagebox.showerror("Hata", f"Analiz sırasında hata oluştu: {str(e)}")
 
-    def generate_video(self):
-        try:
-            if not self.generation_data or 'title' not in self.generation_data:
-                raise Exception("Video başlığı bulunamadı")
-                
-            if not self.generation_data.get('images'):
-                raise Exception("Görsel dosyaları bulunamadı")
-                
-            if not self.generation_data.get('texts'):
-                raise Exception("Metin içeriği bulunamadı")
-            
-            os.makedirs(self.output_dir, exist_ok=True)
-            
-            # Get project title and clean it
-            title = str(self.generation_data['title'])
-            clean_title = "".join(x for x in title if x.isalnum() or x in (" ", "-", "_"))
-            clean_title = clean_title.replace(" ", "_")[:50]
-            
-            if not clean_title:
-                clean_title = "video"
-            
-            # Ses dosyalarının yolları
-            ses_klasoru = os.path.join(self.output_dir, "sesler")
-            ana_baslik_ses = os.path.join(ses_klasoru, "0_ana_baslik.mp3")
-            
-            # Video writer
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            temp_video_path = os.path.join(self.output_dir, f'temp_{clean_title}.mp4')
-            
-            out = cv2.VideoWriter(
-                temp_video_path,
-                fourcc,
-                self.fps,
-                (self.width, self.height)
-            )
-            
-            if not out.isOpened():
-                raise Exception("Video writer açılamadı")
+        self.controller.jobs.submit(
+            f"PDF Analizi: {os.path.basename(self.controller.pdf_path or '')}",
+            run,
+            on_success=on_success,
+            on_error=on_error
+        )
 
-            # Başlık süresi
-            title_duration = self.get_audio_duration(ana_baslik_ses)
-            
-            # İlk görsel üzerine başlık ekle
-            first_image = cv2.imread(self.generation_data['images'][0])
-            first_image = cv2.resize(first_image, (self.width, self.height))
-            titled_first_image = self.create_title_overlay(first_image, self.generation_data['title'])
-            
-            # Başlık süresince frame'leri yaz
-            for _ in range(int(title_duration * self.fps)):
-                out.write(titled_first_image)
-            
-            # Diğer bölümler için
-            for i in range(4):
-                # Ses süresini al
-                audio_path = os.path.join(ses_klasoru, f"{i+1}_metin.mp3")
-                section_duration = self.get_audio_duration(audio_path)
-                
-                # Görseli hazırla
-                image = cv2.imread(self.generation_data['images'][i])
-                image = cv2.resize(image, (self.width, self.height))
-                
-                # Text overlay ekle
-                frame_with_text = self.add_text_overlay(
-                    image,
-                    self.generation_data['texts'][i],
-                    self.height - 250
-                )
-                
-                # Ses süresi kadar frame ekle
-                for _ in range(int(section_duration * self.fps)):
-                    out.write(frame_with_text)
-            
-            out.release()
-            
-            # Sesleri birleştir
-            audio_files = [ana_baslik_ses]
-            for i in range(1, 5):
-                audio_files.append(os.path.join(ses_klasoru, f"{i}_metin.mp3"))
-            
-            # Ses listesi dosyası
-            concat_list = os.path.join(self.output_dir, "concat_list.txt")
-            with open(concat_list, "w") as f:
-                for audio_file in audio_files:
-                    f.write(f"file '{audio_file}'\n")
-            
-            # Sesleri birleştir
-            combined_audio = os.path.join(self.output_dir, "combined_audio.mp3")
-            subprocess.call([
-                'ffmpeg', '-y', '-f', 'concat', '-safe', '0',
-                '-i', concat_list,
-                '-c', 'copy', combined_audio
-            ])
-            
-            # Final video oluştur
-            final_video_path = os.path.join(self.output_dir, f'{clean_title}.mp4')
-            subprocess.call([
-                'ffmpeg', '-y',
-                '-i', temp_video_path,
-                '-i', combined_audio,
-                '-c:v', 'copy',
-                '-c:a', 'aac',
-                final_video_path
-            ])
-            
-            # Geçici dosyaları temizle
-            os.remove(temp_video_path)
-            os.remove(combined_audio)
-            os.remove(concat_list)
-            
-            return final_video_path
-            
-        except Exception as e:
-            print(f"Video generation error details: {str(e)}")
-            raise Exception(f"Video generation error: {str(e)}")
 class InteractiveReelsGenerator:
     def __init__(self, root):
         self.root = root
         self.root.title("Interactive Reels Generator")
         self.root.geometry("1400x800")
 
-        genai.configure(api_key=genai_api_key)
         self.ELEVENLABS_API_KEY = elevenlabs_api_key
         self.OPENAI_API_KEY = openai_api_key
+        self.pipeline = ReelsPipeline(
+            genai_api_key=genai_api_key,
+            elevenlabs_api_key=elevenlabs_api_key,
+            openai_api_key=openai_api_key
+        )
         
         # Variables
         self.pdf_path = None
@@ -475,13 +280,21 @@ class InteractiveReelsGenerator:
             'prompt': '',
             'output': '',
             'image_prompts': [],
-            'images': []
+            'images': [],
+            'image_reused': []
         }
         self.current_image_index = 0
         
+        # Uzun işlemler arka planda çalışır, arayüz bloklanmaz
+        self.jobs = JobExecutor(max_workers=4)
+        # Sesler ve segmentler operatör düzenlerken önceden hazırlanır
+        self.precompute = Precomputer(self.pipeline)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Create frames
         self.setup_ui()
         self.project_folder = None
+        self.loaded_pdf_path = None
         
     def setup_ui(self):
         # Main container
@@ -529,6 +342,10 @@ class InteractiveReelsGenerator:
         )
         self.next_button.pack(side=tk.RIGHT)
         
+        # Arka plan işleri
+        self.job_panel = JobPanel(self.main_frame, self.root, self.jobs)
+        self.job_panel.pack(fill=tk.X)
+        
         # Show initial step
         self.show_current_step()
         
@@ -609,6 +426,14 @@ class InteractiveReelsGenerator:
             command=self.apply_prompt_changes
         ).pack(side=tk.LEFT, padx=5)
         
+        # İşaretlenirse önbellekteki çıktı kullanılmaz, Gemini'ye yeniden sorulur
+        self.bypass_llm_cache = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            button_frame,
+            text="Önbelleği atla",
+            variable=self.bypass_llm_cache
+        ).pack(side=tk.LEFT, padx=5)
+        
         return frame
     
     def on_style_text_change(self, *args):
@@ -617,44 +442,7 @@ class InteractiveReelsGenerator:
             return
             
         try:
-            template = {
-                "reels_başlık": "Ana Başlık Buraya",
-                "içerik": {
-                    "bölüm1": {
-                        "text1_başlık": "Birinci Bölüm Başlığı",
-                        "text1": "Birinci bölüm metni",
-                        "image_prompt1": "Birinci görsel promptu"
-                    },
-                    "bölüm2": {
-                        "text2_başlık": "İkinci Bölüm Başlığı",
-                        "text2": "İkinci bölüm metni",
-                        "image_prompt2": "İkinci görsel promptu"
-                    },
-                    "bölüm3": {
-                        "text3_başlık": "Üçüncü Bölüm Başlığı",
-                        "text3": "Üçüncü bölüm metni",
-                        "image_prompt3": "Üçüncü görsel promptu"
-                    },
-                    "bölüm4": {
-                        "text4_başlık": "Dördüncü Bölüm Başlığı",
-                        "text4": "Dördüncü bölüm metni",
-                        "image_prompt4": "Dördüncü görsel promptu"
-                    }
-                }
-            }
-    
-            prompt = f"""
-            PDF Analiz Sonuçları:
-            {self.pdf_analysis}
-    
-            Yukarıdaki analiz sonuçlarını kullanarak ve aşağıdaki anlatım tarzında bir metin oluştur:
-    
-            Anlatım Tarzı:
-            {self.style_text.get()}
-            
-            Text formatı:
-            {json.dumps(template, indent=2, ensure_ascii=False)}
-            """
+            prompt = build_script_prompt(self.pdf_analysis, self.style_text.get())
     
             self.generation_data['prompt'] = prompt
             self.prompt_text.delete(1.0, tk.END)
@@ -666,53 +454,13 @@ class InteractiveReelsGenerator:
     def process_texts_to_audio(self, json_data, output_dir):
         """Metinleri sese çevirme"""
         try:
-            ses_klasoru = os.path.join(output_dir, "sesler")
-            os.makedirs(ses_klasoru, exist_ok=True)
-    
-            # Ana başlık sesi
-            ana_baslik_dosya = os.path.join(ses_klasoru, "0_ana_baslik.mp3")
-            if self.create_audio_file(json_data['title'], ana_baslik_dosya):
-                print("Ana başlık sesi oluşturuldu")
-    
-            # Diğer metinlerin sesleri
-            for i, text in enumerate(json_data['texts'], 1):
-                filename = os.path.join(ses_klasoru, f"{i}_metin.mp3")
-                if self.create_audio_file(text, filename):
-                    print(f"Ses dosyası oluşturuldu: {i}_metin.mp3")
-                time.sleep(1)  # API rate limiting
-    
+            self.pipeline.synthesize_audio(json_data, output_dir)
         except Exception as e:
             raise Exception(f"Ses oluşturma hatası: {str(e)}")
 
     def create_audio_file(self, text, filename):
         """Eleven Labs API ile ses dosyası oluştur"""
-        url = "https://api.elevenlabs.io/v1/text-to-speech/KbaseEXyT9EE0CQLEfbB"
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": self.ELEVENLABS_API_KEY
-        }
-        data = {
-            "text": text,
-            "model_id": "eleven_multilingual_v2",
-            "voice_settings": {
-                "stability": 0.5,
-                "similarity_boost": 0.5
-            }
-        }
-    
-        try:
-            response = requests.post(url, json=data, headers=headers)
-            response.raise_for_status()
-    
-            with open(filename, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=1024):
-                    if chunk:
-                        f.write(chunk)
-            return True
-        except Exception as e:
-            print(f"Ses dosyası oluşturma hatası: {str(e)}")
-            return False
+        return self.pipeline.create_audio_file(text, filename)
 
 
     def create_output_frame(self):
@@ -744,6 +492,14 @@ class InteractiveReelsGenerator:
             command=self.apply_output_changes
         ).pack(side=tk.LEFT, padx=5)
         
+        # Aynı prompt için daha önce üretilmiş görseller yeniden kullanılsın mı
+        self.use_image_cache = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            button_frame,
+            text="Önbellekteki görselleri kullan",
+            variable=self.use_image_cache
+        ).pack(side=tk.LEFT, padx=5)
+        
         return frame
 
     def create_image_frame(self):
@@ -800,6 +556,20 @@ class InteractiveReelsGenerator:
             command=self.regenerate_current_image
         ).pack(pady=10)
         
+        # Video kodlama profili (draft: hızlı önizleme, archive: yüksek kalite)
+        profile_frame = ttk.Frame(right_frame)
+        profile_frame.pack(fill=tk.X)
+        ttk.Label(profile_frame, text="Kodlama Profili:").pack(side=tk.LEFT, padx=(0, 5))
+        self.encoding_profile = tk.StringVar(value=DEFAULT_ENCODING_PROFILE)
+        self.encoding_profile.trace_add("write", lambda *args: self.update_precompute())
+        ttk.Combobox(
+            profile_frame,
+            textvariable=self.encoding_profile,
+            values=list(ENCODING_PROFILES),
+            state="readonly",
+            width=12
+        ).pack(side=tk.LEFT)
+        
         return frame
 
     def show_current_step(self):
@@ -846,51 +616,7 @@ class InteractiveReelsGenerator:
             return
 
         try:
-            style_texts = {
-                "çarpıcı": "çarpıcı sözlerle başlıkları anlat",
-                "detaylı": "konuyu detaylı bir şekilde anlat",
-                "öğretici": "öğrencilerin anlayabileceği şekilde anlat",
-                "eğlenceli": "eğlenceli bir şekilde anlat"
-            }
-
-            template = {
-                "reels_başlık": "Ana Başlık Buraya",
-                "içerik": {
-                    "bölüm1": {
-                        "text1_başlık": "Birinci Bölüm Başlığı",
-                        "text1": "Birinci bölüm metni",
-                        "image_prompt1": "Birinci görsel promptu"
-                    },
-                    "bölüm2": {
-                        "text2_başlık": "İkinci Bölüm Başlığı",
-                        "text2": "İkinci bölüm metni",
-                        "image_prompt2": "İkinci görsel promptu"
-                    },
-                    "bölüm3": {
-                        "text3_başlık": "Üçüncü Bölüm Başlığı",
-                        "text3": "Üçüncü bölüm metni",
-                        "image_prompt3": "Üçüncü görsel promptu"
-                    },
-                    "bölüm4": {
-                        "text4_başlık": "Dördüncü Bölüm Başlığı",
-                        "text4": "Dördüncü bölüm metni",
-                        "image_prompt4": "Dördüncü görsel promptu"
-                    }
-                }
-            }
-
-            prompt = f"""
-            PDF Analiz Sonuçları:
-            {self.pdf_analysis}
-
-            Yukarıdaki analiz sonuçlarını kullanarak ve aşağıdaki anlatım tarzında bir metin oluştur:
-
-            Anlatım Tarzı:
-            {style_texts[self.style_var.get()]}
-            
-            Text formatı:
-            {json.dumps(template, indent=2, ensure_ascii=False)}
-            """
+            prompt = build_script_prompt(self.pdf_analysis, style_texts[self.style_var.get()])
 
             self.generation_data['prompt'] = prompt
             self.prompt_text.delete(1.0, tk.END)
@@ -900,39 +626,46 @@ class InteractiveReelsGenerator:
             messagebox.showerror("Hata", f"Prompt oluşturulurken hata: {str(e)}")
 
     def apply_prompt_changes(self):
-        try:
-            prompt = self.prompt_text.get(1.0, tk.END.strip())
-            self.generation_data['prompt'] = prompt
-            
-            processing = ProcessingDialog(self.root, "Prompt İşleniyor")
-            processing.update_message("Prompt işleniyor ve çıktı oluşturuluyor...")
-            
-            model = genai.GenerativeModel("gemini-1.5-pro")
-            response = model.generate_content(prompt)
-            
-            # Çıktıyı JSON formatına dönüştür
-            response_text = response.text.replace("```json", "").replace("```", "").strip()
-            try:
-                json_data = json.loads(response_text)
-            except json.JSONDecodeError:
-                raise Exception("Gemini çıktısı JSON formatında değil. Lütfen çıktıyı düzenleyip tekrar deneyin.")
-            
-            # JSON dosyasını kaydet
-            if self.project_folder:
-                prompt_output_path = os.path.join(self.project_folder, "prompt_ciktisi", "output.json")
-                with open(prompt_output_path, 'w', encoding='utf-8') as f:
-                    json.dump(json_data, f, ensure_ascii=False, indent=2)
-            
+        prompt = self.prompt_text.get(1.0, tk.END.strip())
+        self.generation_data['prompt'] = prompt
+        project_folder = self.project_folder
+        use_cache = not self.bypass_llm_cache.get()
+        self.output_text.delete(1.0, tk.END)
+
+        def show_chunk(chunk):
+            if self.project_folder == project_folder:
+                self.output_text.insert(tk.END, chunk)
+                self.output_text.see(tk.END)
+
+        def run(job):
+            job.report("Prompt işleniyor ve çıktı oluşturuluyor...")
+            # Ham yanıt geldikçe gösterilir; tamamlanan bölümler ilerleme olarak bildirilir
+            _, response_text = self.pipeline.generate_script(
+                prompt,
+                project_folder,
+                use_cache=use_cache,
+                on_chunk=lambda chunk: job.post(lambda: show_chunk(chunk)),
+                on_section=lambda index, section: job.report(f"{index}. bölüm hazır")
+            )
+            return response_text
+
+        def on_success(response_text):
+            if self.project_folder != project_folder:
+                return
             self.generation_data['output'] = response_text
             self.output_text.delete(1.0, tk.END)
             self.output_text.insert(tk.END, response_text)
-            
-            processing.close()
             messagebox.showinfo("Başarılı", "Prompt işlendi ve çıktı oluşturuldu!")
-            
-        except Exception as e:
-            processing.close()
-            messagebox.showerror("Hata", f"Prompt işlenirken hata: {str(e)}")
+
+        self.jobs.submit(
+            f"Prompt İşleme: {self.project_name(project_folder)}",
+            run,
+            on_success=on_success,
+            on_error=lambda e: messagebox.showerror("Hata", f"Prompt işlenirken hata: {str(e)}")
+        )
+
+    def project_name(self, project_folder):
+        return os.path.basename(project_folder) if project_folder else "proje"
 
     def format_json(self):
         try:
@@ -943,10 +676,8 @@ class InteractiveReelsGenerator:
             formatted_json = json.dumps(json_obj, indent=2, ensure_ascii=False)
             
             # JSON'ı dosyaya kaydet
-            if self.project_folder:
-                prompt_output_path = os.path.join(self.project_folder, "prompt_ciktisi", "output.json")
-                with open(prompt_output_path, 'w', encoding='utf-8') as f:
-                    json.dump(json_obj, f, ensure_ascii=False, indent=2)
+            self.pipeline.save_script(json_obj, self.project_folder)
+            self.update_precompute()
             
             self.output_text.delete(1.0, tk.END)
             self.output_text.insert(tk.END, formatted_json)
@@ -956,74 +687,72 @@ class InteractiveReelsGenerator:
 
     def apply_output_changes(self):
         try:
-            # Önce çıktının JSON formatında olduğundan emin ol
+            # Önce çıktının şemaya uyan JSON olduğundan emin ol; eksik alanlar birlikte listelenir
             output = self.output_text.get(1.0, tk.END.strip())
-            json_data = json.loads(output)
+            json_data = validate_script_json(output)
             
-            # JSON dosyasını kaydet
-            if self.project_folder:
-                output_path = os.path.join(self.project_folder, "prompt_ciktisi", "output.json")
-                with open(output_path, "w", encoding='utf-8') as f:
-                    json.dump(json_data, f, ensure_ascii=False, indent=2)
+            # JSON dosyasını kaydet; metinler artık sabit, sesler arka planda hazırlanmaya başlar.
+            # Görseller yeniden oluşturulacağı için segmentler görseller gelince hazırlanır
+            self.pipeline.save_script(json_data, self.project_folder)
+            self.update_precompute(with_images=False)
             
             # Image prompts'ları ayıkla
-            self.generation_data['image_prompts'] = [
-                json_data['içerik'][f'bölüm{i}'][f'image_prompt{i}']
-                for i in range(1, 5)
-            ]
+            self.generation_data['image_prompts'] = extract_image_prompts(json_data)
             
             # Görselleri oluştur
             if messagebox.askyesno("Onay", "Görseller oluşturulacak. Bu işlem biraz zaman alabilir. Devam etmek istiyor musunuz?"):
                 self.generate_all_images_with_progress()
                 
-        except json.JSONDecodeError:
-            messagebox.showerror("Hata", "Geçersiz JSON formatı!")
         except KeyError as e:
             messagebox.showerror("Hata", f"JSON formatında gerekli alan bulunamadı: {str(e)}")
         except Exception as e:
             messagebox.showerror("Hata", f"Çıktı işlenirken hata: {str(e)}")
 
     def generate_all_images_with_progress(self):
-        try:
-            client = OpenAI(api_key=self.OPENAI_API_KEY)
-            self.generation_data['images'] = []
-            
-            # Show processing dialog
-            processing = ProcessingDialog(self.root, "Görseller Oluşturuluyor")
-            
-            for i, prompt in enumerate(self.generation_data['image_prompts'], 1):
-                processing.update_message(f"{i}/4 görsel oluşturuluyor...")
-                
-                response = client.images.generate(
-                    model="dall-e-3",
-                    prompt=prompt,
-                    n=1,
-                    size="1024x1024",
-                    quality="standard",
-                    response_format="url"
-                )
-                
-                image_url = response.data[0].url
-                image_response = requests.get(image_url)
-                image_response.raise_for_status()
-                
-                os.makedirs("output/images", exist_ok=True)
-                image_path = os.path.join("output/images", f"image_{i}.png")
-                
-                with open(image_path, 'wb') as f:
-                    f.write(image_response.content)
-                
-                self.generation_data['images'].append(image_path)
-            
-            processing.close()
+        """Görselleri arka planda proje klasörüne oluştur; iş panelinden iptal edilebilir"""
+        if not self.project_folder:
+            messagebox.showerror("Hata", "Proje klasörü bulunamadı")
+            return
+
+        self.generation_data['images'] = []
+        image_prompts = list(self.generation_data['image_prompts'])
+        reused = [False] * len(image_prompts)
+        project_folder = self.project_folder
+        use_cache = self.use_image_cache.get()
+        output_dir = os.path.join(project_folder, "gorseller")
+
+        def run(job):
+            return self.pipeline.generate_images(
+                image_prompts,
+                output_dir,
+                progress=job.report,
+                cancel_event=job.cancel_event,
+                on_image=lambda index, path, was_reused: reused.__setitem__(index, was_reused),
+                use_cache=use_cache
+            )
+
+        def on_success(images):
+            if self.project_folder != project_folder:
+                return
+            self.generation_data['images'] = images
+            self.generation_data['image_reused'] = reused
             self.current_image_index = 0
             self.update_image_display()
-            messagebox.showinfo("Başarılı", "Tüm görseller oluşturuldu!")
-            
-        except Exception as e:
-            if 'processing' in locals():
-                processing.close()
-            messagebox.showerror("Hata", f"Görsel oluşturma hatası: {str(e)}")
+            self.update_precompute()
+            if any(reused):
+                messagebox.showinfo(
+                    "Başarılı",
+                    f"Tüm görseller hazır! {sum(reused)} görsel önbellekten kullanıldı."
+                )
+            else:
+                messagebox.showinfo("Başarılı", "Tüm görseller oluşturuldu!")
+
+        self.jobs.submit(
+            f"Görseller: {self.project_name(project_folder)}",
+            run,
+            on_success=on_success,
+            on_error=lambda e: messagebox.showerror("Hata", f"Görsel oluşturma hatası: {str(e)}")
+        )
 
     def update_image_display(self):
         if not self.generation_data['images']:
@@ -1040,8 +769,10 @@ class InteractiveReelsGenerator:
         self.image_prompt_text.insert(tk.END, 
             self.generation_data['image_prompts'][self.current_image_index])
         
+        reused = self.generation_data.get('image_reused', [])
+        source = " (önbellekten)" if self.current_image_index < len(reused) and reused[self.current_image_index] else ""
         self.image_counter.configure(
-            text=f"{self.current_image_index + 1}/{len(self.generation_data['images'])}")
+            text=f"{self.current_image_index + 1}/{len(self.generation_data['images'])}{source}")
         
         self.prev_img_button.configure(
             state=tk.NORMAL if self.current_image_index > 0 else tk.DISABLED)
@@ -1059,33 +790,47 @@ class InteractiveReelsGenerator:
             self.update_image_display()
 
     def regenerate_current_image(self):
-        try:
-            new_prompt = self.image_prompt_text.get(1.0, tk.END.strip())
-            self.generation_data['image_prompts'][self.current_image_index] = new_prompt
-            
-            client = OpenAI(api_key=self.OPENAI_API_KEY)
-            response = client.images.generate(
-                model="dall-e-3",
-                prompt=new_prompt,
-                n=1,
-                size="1024x1024",
-                quality="standard",
-                response_format="url"
-            )
-            
-            image_url = response.data[0].url
-            image_response = requests.get(image_url)
-            image_response.raise_for_status()
-            
-            image_path = self.generation_data['images'][self.current_image_index]
-            with open(image_path, 'wb') as f:
-                f.write(image_response.content)
-            
+        if not self.generation_data['images']:
+            messagebox.showerror("Hata", "Lütfen önce görselleri oluşturun!")
+            return
+
+        index = self.current_image_index
+        new_prompt = self.image_prompt_text.get(1.0, tk.END.strip())
+        prompt_changed = new_prompt != self.generation_data['image_prompts'][index]
+        self.generation_data['image_prompts'][index] = new_prompt
+        image_path = self.generation_data['images'][index]
+        images = self.generation_data['images']
+
+        # Prompt aynıysa kullanıcı yeni bir görsel istiyor; önbellek atlanır
+        use_cache = prompt_changed and self.use_image_cache.get()
+
+        def run(job):
+            job.report("Görsel oluşturuluyor...")
+            _, reused = self.pipeline.generate_image(new_prompt, image_path, use_cache=use_cache)
+            return reused
+
+        def on_success(reused):
+            # Bu arada görseller yeniden oluşturulduysa ekran güncellenmez
+            if self.generation_data['images'] is not images:
+                return
+            image_reused = self.generation_data.setdefault('image_reused', [])
+            image_reused.extend([False] * (len(images) - len(image_reused)))
+            image_reused[index] = reused
+
             self.update_image_display()
-            messagebox.showinfo("Başarılı", "Görsel yeniden oluşturuldu!")
-            
-        except Exception as e:
-            messagebox.showerror("Hata", f"Görsel yeniden oluşturma hatası: {str(e)}")
+            # Yalnızca bu görselin sahneleri yeniden hazırlanır
+            self.update_precompute()
+            if reused:
+                messagebox.showinfo("Başarılı", "Bu prompt için önbellekteki görsel kullanıldı.")
+            else:
+                messagebox.showinfo("Başarılı", "Görsel yeniden oluşturuldu!")
+
+        self.jobs.submit(
+            f"Görsel {index + 1}: {self.project_name(self.project_folder)}",
+            run,
+            on_success=on_success,
+            on_error=lambda e: messagebox.showerror("Hata", f"Görsel yeniden oluşturma hatası: {str(e)}")
+        )
 
     def previous_step(self):
         if self.current_step > 1:
@@ -1123,165 +868,68 @@ class InteractiveReelsGenerator:
 
 
     def finish_generation(self):
-        if messagebox.askyesno("Onay", "Video oluşturma işlemi başlatılsın mı?"):
-            try:
-                if not self.project_folder:
-                    raise Exception("Proje klasörü bulunamadı")
-                    
-                output_path = os.path.join(self.project_folder, "prompt_ciktisi", "output.json")
-                if not os.path.exists(output_path):
-                    raise Exception("Output JSON dosyası bulunamadı")
-                
-                with open(output_path, 'r', encoding='utf-8') as f:
-                    json_data = json.load(f)
-                
-                if not json_data.get('reels_başlık'):
-                    raise Exception("Video başlığı bulunamadı")
-                
-                processing = ProcessingDialog(self.root, "Video Oluşturuluyor")
-                
-                video_data = {
-                    'title': json_data['reels_başlık'],
-                    'images': self.generation_data['images'],
-                    'texts': [
-                        f"{json_data['içerik'][f'bölüm{i}'][f'text{i}_başlık']}: "
-                        f"{json_data['içerik'][f'bölüm{i}'][f'text{i}']}"
-                        for i in range(1, 5)
-                    ]
-                }
-    
-                # Gerekli klasörleri oluştur
-                video_dosyalari = os.path.join(self.project_folder, "video_dosyalari")
-                os.makedirs(video_dosyalari, exist_ok=True)
-                
-                ses_klasoru = os.path.join(video_dosyalari, "sesler")
-                os.makedirs(ses_klasoru, exist_ok=True)
-    
-                # Ana başlık sesi
-                processing.update_message("Ana başlık sesi oluşturuluyor...")
-                ana_baslik_dosya = os.path.join(ses_klasoru, "0_ana_baslik.mp3")
-                if not self.create_audio_file(video_data['title'], ana_baslik_dosya):
-                    raise Exception("Ana başlık sesi oluşturulamadı")
-    
-                # Diğer metinlerin sesleri
-                for i, text in enumerate(video_data['texts'], 1):
-                    processing.update_message(f"{i}/4 ses dosyası oluşturuluyor...")
-                    filename = os.path.join(ses_klasoru, f"{i}_metin.mp3")
-                    if not self.create_audio_file(text, filename):
-                        raise Exception(f"{i}. metin sesi oluşturulamadı")
-                    time.sleep(1)
-    
-                # Video oluşturma
-                processing.update_message("Video oluşturuluyor...")
-                video_gen = VideoGenerator(video_dosyalari, video_data)
-                video_path = video_gen.generate_video()
-                
-                if not video_path or not os.path.exists(video_path):
-                    raise Exception("Video dosyası oluşturulamadı")
-    
-                # Final video klasörüne kopyala
-                clean_title = "".join(x for x in video_data['title'] if x.isalnum() or x in (" ", "-", "_"))
-                clean_title = clean_title.replace(" ", "_")[:50] or "video"
-                final_video_path = os.path.join(self.project_folder, "final_video", f"{clean_title}.mp4")
-                
-                os.makedirs(os.path.dirname(final_video_path), exist_ok=True)
-                shutil.copy2(video_path, final_video_path)
-    
-                processing.close()
-                messagebox.showinfo("Başarılı", f"Video oluşturuldu!\nKonum: {final_video_path}")
-    
-            except Exception as e:
-                if 'processing' in locals():
-                    processing.close()
-                messagebox.showerror("Hata", f"Video oluşturma hatası: {str(e)}")
-    
-    def combine_audio_video(self, video_path):
-        """Ses ve videoyu birleştir"""
-        output_dir = os.path.dirname(video_path)
-        ses_klasoru = os.path.join(output_dir, "sesler")
-        
-        # Concat listesi oluştur
-        concat_list = os.path.join(output_dir, "concat_list.txt")
-        with open(concat_list, "w") as f:
-            ses_dosyalari = sorted(
-                [f for f in os.listdir(ses_klasoru) if f.endswith('.mp3')],
-                key=lambda x: int(''.join(filter(str.isdigit, x.split('_')[0])))
+        """Videoyu arka planda oluştur
+
+        İş başlarken proje klasörü ve görseller kopyalanır; render sürerken
+        bir sonraki PDF'e geçilebilir.
+        """
+        if not messagebox.askyesno("Onay", "Video oluşturma işlemi başlatılsın mı?"):
+            return
+        try:
+            if not self.project_folder:
+                raise Exception("Proje klasörü bulunamadı")
+            json_data = self.pipeline.load_script(self.project_folder)
+        except Exception as e:
+            messagebox.showerror("Hata", f"Video oluşturma hatası: {str(e)}")
+            return
+
+        project_folder = self.project_folder
+        images = list(self.generation_data['images'])
+        encoding_profile = self.encoding_profile.get()
+
+        def run(job):
+            # Önceden hazırlanan sesler ve segmentler önbellekten alınır
+            self.precompute.wait(job.report)
+            return self.pipeline.render_video(
+                project_folder,
+                json_data,
+                images,
+                progress=job.report,
+                encoding_profile=encoding_profile
             )
-            for ses_dosya in ses_dosyalari:
-                f.write(f"file '{os.path.join(ses_klasoru, ses_dosya)}'\n")
-        
-        # Sesleri birleştir
-        combined_audio = os.path.join(output_dir, "combined_audio.mp3")
-        subprocess.call([
-            'ffmpeg', '-y', '-f', 'concat', '-safe', '0',
-            '-i', concat_list,
-            '-c', 'copy', combined_audio
-        ])
-        
-        # Video ve sesi birleştir
-        final_video = os.path.join(output_dir, "final_reels.mp4")
-        subprocess.call([
-            'ffmpeg', '-y',
-            '-i', video_path,
-            '-i', combined_audio,
-            '-c:v', 'copy', '-c:a', 'aac',
-            final_video
-        ])
-        
-        # Geçici dosyaları temizle
-        os.remove(video_path)
-        os.remove(combined_audio)
-        os.remove(concat_list)
-
-# VideoGenerator sınıfındaki create_title_sequence metodunu da güncelleyelim
-    def create_title_sequence(self, title, duration):
-        """Başlık sekansı oluştur"""
-        n_frames = int(duration * self.fps)
-        frames = []
-        
-        # Siyah arkaplan oluştur
-        base_frame = self.create_base_frame()
-        
-        # Başlığı ekle
-        img_pil = Image.fromarray(base_frame)
-        draw = ImageDraw.Draw(img_pil)
-        
+
+        self.jobs.submit(
+            f"Video ({encoding_profile}): {self.project_name(project_folder)}",
+            run,
+            on_success=lambda path: messagebox.showinfo("Başarılı", f"Video oluşturuldu!\nKonum: {path}"),
+            on_error=lambda e: messagebox.showerror("Hata", f"Video oluşturma hatası: {str(e)}")
+        )
+
+    def update_precompute(self, with_images=True):
+        """Kaydedilmiş metin ve görsellerle arka plandaki ön hazırlığı güncelle"""
+        if not self.project_folder:
+            return
+        images = list(self.generation_data.get('images') or []) if with_images else []
+        # Önceki projeden kalan görseller kullanılmaz. Yol öneki yetmez:
+        # "X_..._2" projesinin görselleri "X_..." projesine ait sayılırdı
+        image_dir = os.path.abspath(os.path.join(self.project_folder, "gorseller"))
+        if not all(os.path.dirname(os.path.abspath(image)) == image_dir for image in images):
+            images = []
         try:
-            font = ImageFont.truetype("arial.ttf", 60)
-        except:
-            font = ImageFont.load_default()
-        
-        # Text wrap uygula
-        words = title.split()
-        lines = []
-        current_line = []
-        max_width = self.width - 100  # Margins
-        
-        for word in words:
-            current_line.append(word)
-            line = ' '.join(current_line)
-            line_width = draw.textlength(line, font=font)
-            if line_width > max_width:
-                current_line.pop()
-                lines.append(' '.join(current_line))
-                current_line = [word]
-        lines.append(' '.join(current_line))
-        
-        # Başlığı ortala
-        y = (self.height - (len(lines) * 80)) // 2  # 80 piksel line spacing
-        for line in lines:
-            text_width = draw.textlength(line, font=font)
-            x = (self.width - text_width) // 2
-            draw.text((x, y), line, font=font, fill=(255, 255, 255))
-            y += 80
-        
-        frame_with_text = np.array(img_pil)
-        
-        # Frameleri oluştur
-        for _ in range(n_frames):
-            frames.append(frame_with_text.copy())
-            
-        return frames
+            json_data = self.pipeline.load_script(self.project_folder)
+            self.precompute.update(json_data, images, self.encoding_profile.get())
+        except Exception as e:
+            # Ön hazırlık isteğe bağlıdır; sorun olursa render her şeyi kendisi yapar
+            print(f"Ön hazırlık başlatılamadı: {str(e)}")
+
+    def on_close(self):
+        active = self.jobs.active_jobs()
+        if active and not messagebox.askyesno(
+                "Onay", f"{len(active)} iş devam ediyor. Çıkılırsa iptal edilecek. Çıkılsın mı?"):
+            return
+        self.jobs.shutdown()
+        self.precompute.shutdown()
+        self.root.destroy()
 
 def main():
     root = tk.Tk()
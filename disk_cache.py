@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+
+DEFAULT_CACHE_DIR = os.getenv("REELS_CACHE_DIR", "cache")
+
+
+def make_key(*parts):
+    """Parçaların JSON gösteriminden sha256 anahtar üret"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Dosya içeriğinin sha256 özeti"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def temp_path_for(path):
+    """Hedefle aynı klasörde benzersiz geçici dosya yolu"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f".tmp_{uuid.uuid4().hex}")
+
+
+def atomic_write_bytes(path, data):
+    """Dosyayı geçici isimle yazıp tek adımda yerine koy
+
+    Hedef daha önce önbellekten hard link ile bağlanmışsa önbellekteki
+    kopya bozulmaz; yalnızca dizin girdisi değişir.
+    """
+    tmp_path = temp_path_for(path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class DiskCache:
+    """İçerik adresli, boyut ve yaş sınırlı kalıcı dosya önbelleği
+
+    Her girdi `root/<anahtarın ilk 2 hanesi>/<anahtar><uzantı>` yolunda
+    tutulur. Son kullanım zamanı dosyanın mtime değeridir; `max_bytes`
+    aşılınca en uzun süredir kullanılmayan girdiler (LRU), `max_age`
+    saniyeden eski girdiler ise yaşlarına göre silinir.
+    """
+
+    def __init__(self, root, max_bytes=None, max_age=None, suffix=""):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, key):
+        return os.path.join(self.root, key[:2], key + self.suffix)
+
+    def _count(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key, count=True):
+        """Girdi varsa yolunu döndür ve kullanım zamanını güncelle, yoksa None
+
+        count=False ise isabet/ıska sayaçları değişmez.
+        """
+        path = self.path_for(key)
+        try:
+            if self.max_age is not None and time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                raise FileNotFoundError(path)
+            os.utime(path, None)
+        except OSError:
+            if count:
+                self._count(False)
+            return None
+        if count:
+            self._count(True)
+        return path
+
+    def get_bytes(self, key):
+        path = self.get(key)
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def put_bytes(self, key, data):
+        path = self.path_for(key)
+        atomic_write_bytes(path, data)
+        self.evict()
+        return path
+
+    def put_file(self, key, src_path):
+        """Var olan bir dosyayı önbelleğe kopyala"""
+        path = self.path_for(key)
+        tmp_path = temp_path_for(path)
+        try:
+            shutil.copyfile(src_path, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+        return path
+
+    def materialize(self, key, dest_path, link=False, count=True):
+        """Önbellekteki girdiyi hedef yola kopyala (link=True ise hard link dene)
+
+        Girdi yoksa False döner.
+        """
+        path = self.get(key, count)
+        if path is None:
+            return False
+
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+        if link:
+            try:
+                os.link(path, dest_path)
+                return True
+            except OSError:
+                pass
+        shutil.copyfile(path, dest_path)
+        return True
+
+    def entries(self):
+        """(yol, boyut, mtime) listesi"""
+        result = []
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if name.startswith(".tmp_"):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                result.append((path, stat.st_size, stat.st_mtime))
+        return result
+
+    def evict(self):
+        """Yaş ve toplam boyut sınırlarını uygula, silinen girdi sayısını döndür"""
+        if self.max_bytes is None and self.max_age is None:
+            return 0
+
+        removed = 0
+        now = time.time()
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, mtime in entries:
+            too_old = self.max_age is not None and now - mtime > self.max_age
+            too_big = self.max_bytes is not None and total > self.max_bytes
+            if not too_old and not too_big:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self):
+        entries = self.entries()
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries)
+            }
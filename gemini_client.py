@@ -0,0 +1,118 @@
+import json
+import os
+import time
+
+from disk_cache import DEFAULT_CACHE_DIR, DiskCache, atomic_write_bytes, make_key
+from providers import GeminiTextProvider
+
+
+GEMINI_MODEL = "gemini-1.5-pro"
+LLM_CACHE_TTL = 7 * 24 * 60 * 60
+LLM_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+
+def default_llm_cache(max_bytes=LLM_CACHE_MAX_BYTES):
+    """Projeler arasında paylaşılan Gemini yanıt önbelleği"""
+    return DiskCache(os.path.join(DEFAULT_CACHE_DIR, "gemini"), max_bytes=max_bytes, suffix=".json")
+
+
+def normalize_prompt(prompt):
+    """Girinti, satır sonu boşlukları ve boş satır farklarını yok say"""
+    lines = [line.strip() for line in prompt.replace("\r\n", "\n").split("\n")]
+    normalized = []
+    for line in lines:
+        if line or (normalized and normalized[-1]):
+            normalized.append(line)
+    return "\n".join(normalized).strip()
+
+
+class GeminiClient:
+    """Gemini metin üretimi, model adı + normalize prompt ile önbelleklenir
+
+    Yanıtlar hem global önbellekte hem de verilen proje klasöründe
+    (`cache_dir`) saklanır; proje yeniden açıldığında veya sihirbazda geri
+    dönüldüğünde API'ye gidilmez. `ttl` saniyeden eski yanıtlar kullanılmaz.
+    İstekler `provider` üzerinden gider (varsayılan: gerçek Gemini API'si).
+    """
+
+    def __init__(self, model_name=GEMINI_MODEL, cache=None, ttl=LLM_CACHE_TTL, provider=None):
+        self.model_name = model_name
+        self.cache = cache
+        self.ttl = ttl
+        self.provider = provider or GeminiTextProvider()
+
+    def cache_key(self, prompt, response_schema=None):
+        if response_schema is None:
+            return make_key("gemini", self.model_name, normalize_prompt(prompt))
+        return make_key("gemini", self.model_name, normalize_prompt(prompt), response_schema)
+
+    def _read_entry(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self.ttl is not None and time.time() - entry.get("created_at", 0) > self.ttl:
+            return None
+        return entry.get("text")
+
+    def lookup(self, prompt, cache_dir=None, response_schema=None):
+        """Önbellekteki yanıtı döndür, yoksa None"""
+        key = self.cache_key(prompt, response_schema)
+        if cache_dir:
+            text = self._read_entry(os.path.join(cache_dir, f"{key}.json"))
+            if text is not None:
+                return text
+        if self.cache is not None:
+            path = self.cache.get(key)
+            if path is not None:
+                text = self._read_entry(path)
+                if text is not None:
+                    if cache_dir:
+                        self.store(prompt, text, cache_dir, global_store=False, response_schema=response_schema)
+                    return text
+        return None
+
+    def store(self, prompt, text, cache_dir=None, global_store=True, response_schema=None):
+        key = self.cache_key(prompt, response_schema)
+        data = json.dumps({
+            "model": self.model_name,
+            "created_at": time.time(),
+            "text": text
+        }, ensure_ascii=False).encode("utf-8")
+        if cache_dir:
+            atomic_write_bytes(os.path.join(cache_dir, f"{key}.json"), data)
+        if global_store and self.cache is not None:
+            self.cache.put_bytes(key, data)
+
+    def generate(self, prompt, use_cache=True, cache_dir=None, response_schema=None, on_chunk=None):
+        """Prompt için yanıt metni ve önbellekten gelip gelmediğini döndür
+
+        use_cache=False önbelleği okumadan yeni istek atar, sonucu yine saklar.
+        response_schema verilirse yanıt bu şemaya uyan JSON olarak istenir.
+        on_chunk verilirse yanıt akışlı istenir ve her parça geldikçe çağıran
+        thread üzerinde `on_chunk(parça)` çağrılır; önbellekten gelen yanıt
+        tek parça olarak iletilir.
+        """
+        if use_cache:
+            text = self.lookup(prompt, cache_dir, response_schema)
+            if text is not None:
+                if on_chunk:
+                    on_chunk(text)
+                return text, True
+
+        request = {"model": self.model_name, "prompt": prompt}
+        if response_schema is not None:
+            request["response_schema"] = response_schema
+        if on_chunk is not None and hasattr(self.provider, "stream"):
+            chunks = []
+            for chunk in self.provider.stream(request):
+                chunks.append(chunk)
+                on_chunk(chunk)
+            text = "".join(chunks)
+        else:
+            text = self.provider.call(request)
+            if on_chunk:
+                on_chunk(text)
+        self.store(prompt, text, cache_dir, response_schema=response_schema)
+        return text, False
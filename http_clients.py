@@ -0,0 +1,68 @@
+import os
+import threading
+
+import google.generativeai as genai
+import httpx
+import requests
+from openai import DefaultHttpxClient, OpenAI
+from requests.adapters import HTTPAdapter
+
+
+# Hiçbir istek sonsuza kadar beklememeli: (bağlantı, okuma) zaman aşımları saniye cinsinden
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 120
+HTTP_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+GEMINI_TIMEOUT = 300
+DEFAULT_POOL_SIZE = 10
+
+_lock = threading.Lock()
+_clients = {}
+_pid = None
+
+
+def shared_client(key, factory, pool_size=DEFAULT_POOL_SIZE):
+    """Süreç başına tek istemci; `factory(pool_size)` yalnızca ilk kullanımda çağrılır
+
+    Daha büyük bir havuz istenirse istemci o boyutla yeniden oluşturulur.
+    Fork edilmiş süreçler ebeveynin bağlantılarını paylaşmaz.
+    """
+    global _pid
+    with _lock:
+        if _pid != os.getpid():
+            _clients.clear()
+            _pid = os.getpid()
+        entry = _clients.get(key)
+        if entry is None or entry[1] < pool_size:
+            entry = (factory(pool_size), pool_size)
+            _clients[key] = entry
+        return entry[0]
+
+
+def http_session(name, pool_size=DEFAULT_POOL_SIZE):
+    """Keep-alive bağlantı havuzlu paylaşılan requests oturumu"""
+    def factory(size):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    return shared_client(("session", name), factory, pool_size)
+
+
+def openai_client(api_key, pool_size=DEFAULT_POOL_SIZE):
+    """Zaman aşımlı ve havuz boyutu eşzamanlılığa göre ayarlı OpenAI istemcisi"""
+    def factory(size):
+        timeout = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+        http_client = DefaultHttpxClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=size, max_keepalive_connections=size)
+        )
+        return OpenAI(api_key=api_key, timeout=timeout, http_client=http_client)
+
+    return shared_client(("openai", api_key), factory, pool_size)
+
+
+def gemini_model(model_name):
+    """Model adı başına bir kez oluşturulan Gemini modeli"""
+    return shared_client(("gemini", model_name), lambda size: genai.GenerativeModel(model_name))
@@ -0,0 +1,112 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from disk_cache import DEFAULT_CACHE_DIR, DiskCache, atomic_write_bytes, make_key
+from providers import OpenAIImageProvider
+
+
+DALLE_MODEL = "dall-e-3"
+DALLE_SIZE = "1024x1024"
+DALLE_QUALITY = "standard"
+IMAGE_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+IMAGE_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def default_image_cache(max_bytes=IMAGE_CACHE_MAX_BYTES, max_age=IMAGE_CACHE_MAX_AGE):
+    """Projeler arasında paylaşılan görsel önbelleği"""
+    return DiskCache(os.path.join(DEFAULT_CACHE_DIR, "images"), max_bytes=max_bytes,
+                     max_age=max_age, suffix=".png")
+
+
+class GenerationCancelled(Exception):
+    """Kullanıcı işlemi iptal etti"""
+
+
+class DalleImageGenerator:
+    """DALL-E görsel üretici
+
+    Promptlar birbirinden bağımsız olduğu için en fazla `max_concurrency`
+    istek aynı anda gönderilir; toplam süre en yavaş görsele yaklaşır.
+
+    `cache` verilirse prompt + model + boyut + kalite ile daha önce üretilmiş
+    görsel API'ye gitmeden proje klasörüne hard link ile bağlanır. İstekler
+    `provider` üzerinden gider (varsayılan: gerçek OpenAI API'si).
+    """
+
+    def __init__(self, api_key, model=DALLE_MODEL, size=DALLE_SIZE, quality=DALLE_QUALITY,
+                 max_concurrency=4, cache=None, provider=None):
+        self.api_key = api_key
+        self.model = model
+        self.size = size
+        self.quality = quality
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.cache = cache
+        self.provider = provider or OpenAIImageProvider(api_key, self.max_concurrency)
+
+    def cache_key(self, prompt):
+        return make_key("dall-e", prompt, self.model, self.size, self.quality)
+
+    def generate_image(self, prompt, image_path, use_cache=True):
+        """DALL-E ile tek görsel oluştur ve dosyaya yaz
+
+        (görsel yolu, önbellekten mi alındı) döndürür. use_cache=False ise
+        önbellekte olsa bile yeni görsel üretilir ve önbellek güncellenir.
+        """
+        key = self.cache_key(prompt)
+        if use_cache and self.cache is not None and self.cache.materialize(key, image_path, link=True):
+            return image_path, True
+
+        image = self.provider.call({
+            "prompt": prompt,
+            "model": self.model,
+            "size": self.size,
+            "quality": self.quality
+        })
+
+        if self.cache is not None:
+            self.cache.put_bytes(key, image)
+            if self.cache.materialize(key, image_path, link=True, count=False):
+                return image_path, False
+
+        # Hedef önbelleğe hard link olabilir; yerine yazmak önbelleği bozmaz
+        atomic_write_bytes(image_path, image)
+        return image_path, False
+
+    def generate_images(self, items, on_complete=None, cancel_event=None, on_wait=None,
+                        use_cache=True):
+        """(prompt, dosya yolu) listesi için görselleri eşzamanlı oluştur
+
+        Sonuç yolları girdi sırasıyla döner. `on_complete(index, path, reused)`
+        her görsel bittiğinde, `on_wait()` beklerken kısa aralıklarla çağıran
+        thread üzerinde çağrılır. `cancel_event` set edilirse başlamamış
+        istekler iptal edilir ve GenerationCancelled fırlatılır; bir görsel
+        hata verirse kalanlar iptal edilip hata yukarı aktarılır.
+        """
+        results = [None] * len(items)
+        if not items:
+            return results
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items)))
+        try:
+            futures = {
+                executor.submit(self.generate_image, prompt, image_path, use_cache): index
+                for index, (prompt, image_path) in enumerate(items)
+            }
+            pending = set(futures)
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise GenerationCancelled("Görsel oluşturma iptal edildi")
+
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures[future]
+                    results[index], reused = future.result()
+                    if on_complete:
+                        on_complete(index, results[index], reused)
+
+                if on_wait:
+                    on_wait()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
@@ -0,0 +1,170 @@
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+JOB_PENDING = "bekliyor"
+JOB_RUNNING = "çalışıyor"
+JOB_DONE = "tamamlandı"
+JOB_FAILED = "hata"
+JOB_CANCELLED = "iptal edildi"
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobCancelled(Exception):
+    """İş kullanıcı tarafından iptal edildi"""
+
+
+class Job:
+    """Arka planda çalışan tek bir iş
+
+    İş fonksiyonu `job` nesnesini ilk argüman olarak alır; ilerlemeyi
+    `job.report(mesaj)` ile bildirir ve uzun döngülerde `job.cancel_event`
+    kontrol edebilir. `report` aynı zamanda bir iptal noktasıdır.
+    """
+
+    def __init__(self, job_id, title, executor):
+        self.id = job_id
+        self.title = title
+        self.executor = executor
+        self.state = JOB_PENDING
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self.on_success = None
+        self.on_error = None
+
+    @property
+    def finished(self):
+        return self.state in FINISHED_STATES
+
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def report(self, message):
+        """İlerleme mesajı bildir (worker thread'den çağrılır)"""
+        if self.cancel_event.is_set():
+            raise JobCancelled(f"{self.title} iptal edildi")
+        self.message = message
+        self.executor.events.put((self, None))
+
+    def post(self, callback):
+        """`callback()` fonksiyonunu poll eden (arayüz) thread'de çalıştır
+
+        Akışlı yanıt parçalarını ekrana yazmak gibi iş sürerken yapılacak
+        arayüz güncellemeleri içindir; `report` gibi bir iptal noktasıdır.
+        """
+        if self.cancel_event.is_set():
+            raise JobCancelled(f"{self.title} iptal edildi")
+        self.executor.events.put((self, callback))
+
+    def cancel(self):
+        """Başlamamış işi hemen, çalışan işi ilk iptal noktasında durdur"""
+        self.cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self.executor.finish(self, JOB_CANCELLED, message="İptal edildi")
+
+
+class JobExecutor:
+    """Uzun işlemleri worker thread'lerde çalıştıran iş yürütücü
+
+    Worker'lar arayüze dokunmaz; durum değişiklikleri bir kuyruğa yazılır
+    ve `poll()` çağıran thread üzerinde dinleyicileri ve `on_success` /
+    `on_error` geri çağrılarını çalıştırır. Tk'da `poll` root.after ile
+    ana döngüden düzenli çağrılır.
+    """
+
+    def __init__(self, max_workers=4):
+        self.pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="job")
+        self.events = queue.Queue()
+        self.jobs = []
+        self.listeners = []
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def add_listener(self, listener):
+        """`listener(job)` her durum veya mesaj değişikliğinde çağrılır"""
+        self.listeners.append(listener)
+
+    def submit(self, title, fn, *args, on_success=None, on_error=None, **kwargs):
+        """`fn(job, *args, **kwargs)` işini kuyruğa ekle ve Job döndür
+
+        `on_success(result)` ve `on_error(exception)` poll eden thread
+        üzerinde çağrılır; iptal edilen işler için hiçbiri çağrılmaz.
+        """
+        with self.lock:
+            job = Job(next(self.ids), title, self)
+            job.on_success = on_success
+            job.on_error = on_error
+            self.jobs.append(job)
+        job.future = self.pool.submit(self.run_job, job, fn, args, kwargs)
+        self.events.put((job, None))
+        return job
+
+    def run_job(self, job, fn, args, kwargs):
+        if job.cancel_event.is_set():
+            self.finish(job, JOB_CANCELLED, message="İptal edildi")
+            return
+        job.state = JOB_RUNNING
+        job.started_at = time.time()
+        self.events.put((job, None))
+        try:
+            result = fn(job, *args, **kwargs)
+        except Exception as e:
+            # İptal sırasında yükselen hatalar iptal sayılır
+            if job.cancel_event.is_set():
+                self.finish(job, JOB_CANCELLED, message="İptal edildi")
+            else:
+                self.finish(job, JOB_FAILED, error=e, message=str(e))
+            return
+        self.finish(job, JOB_DONE, result=result, message="Tamamlandı")
+
+    def finish(self, job, state, result=None, error=None, message=""):
+        with self.lock:
+            if job.finished:
+                return
+            job.result = result
+            job.error = error
+            job.message = message
+            job.finished_at = time.time()
+            job.state = state
+        callback = None
+        if state == JOB_DONE and job.on_success:
+            callback = lambda: job.on_success(result)
+        elif state == JOB_FAILED and job.on_error:
+            callback = lambda: job.on_error(error)
+        self.events.put((job, callback))
+
+    def poll(self):
+        """Biriken olayları çağıran thread üzerinde işle"""
+        while True:
+            try:
+                job, callback = self.events.get_nowait()
+            except queue.Empty:
+                return
+            for listener in self.listeners:
+                listener(job)
+            if callback:
+                callback()
+
+    def active_jobs(self):
+        return [job for job in self.jobs if not job.finished]
+
+    def clear_finished(self):
+        with self.lock:
+            self.jobs = [job for job in self.jobs if not job.finished]
+
+    def shutdown(self, cancel=True):
+        if cancel:
+            for job in self.active_jobs():
+                job.cancel()
+        self.pool.shutdown(wait=False, cancel_futures=cancel)
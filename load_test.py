@@ -0,0 +1,271 @@
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dotenv import load_dotenv
+
+from providers import PROVIDER_MODES, create_providers, provider_stats
+from rate_limiter import RateLimitedProvider
+from reels_pipeline import ReelsPipeline, style_texts
+from resilience import DEFAULT_POLICIES, ResiliencePolicy, ResilientProvider, resilient_providers
+from video_generator import ENCODING_PROFILES, RENDER_MODES
+
+
+SAMPLE_LINES = (
+    "Photosynthesis converts light energy into chemical energy stored in glucose.",
+    "Chlorophyll absorbs mostly blue and red light and reflects green light.",
+    "The light dependent reactions take place in the thylakoid membranes.",
+    "The Calvin cycle fixes carbon dioxide in the stroma of the chloroplast.",
+    "Oxygen is released as a by-product when water molecules are split.",
+)
+
+
+def make_sample_pdf(path, pages=3, lines_per_page=40):
+    """Harici kütüphane olmadan metin içeren basit bir PDF yaz"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in range(pages):
+        lines = ["BT", "/F1 11 Tf", "14 TL", "50 800 Td", f"(Chapter {page + 1}) Tj"]
+        for i in range(lines_per_page):
+            lines.append(f"({SAMPLE_LINES[(page + i) % len(SAMPLE_LINES)]}) '")
+        lines.append("ET")
+        stream = "\n".join(lines).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode("ascii")
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_at = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        data += b"%010d 00000 n \n" % offset
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def percentile(values, p):
+    """En yakın sıra yöntemiyle yüzdelik"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="N eşzamanlı işi tüm pipeline'dan geçirip verim ve kuyruk gecikmesini ölçer."
+    )
+    parser.add_argument("pdfs", nargs="*", help="Kullanılacak PDF'ler (verilmezse sentetik PDF üretilir)")
+    parser.add_argument("--jobs", type=int, default=8, help="Toplam iş sayısı")
+    parser.add_argument("--concurrency", type=int, default=4, help="Aynı anda çalışan iş sayısı")
+    parser.add_argument("--providers", choices=PROVIDER_MODES, default="fake",
+                        help="Servis modu (varsayılan: fake, API anahtarı gerekmez)")
+    parser.add_argument("--record-dir", default="recordings", help="replay modunda kayıt dizini")
+    parser.add_argument("--replay-fallback", action="store_true",
+                        help="replay modunda kaydı olmayan isteklere sentetik yanıt ver")
+    parser.add_argument("--latency", type=float, default=0.5, help="Servis çağrısı başına gecikme (sn)")
+    parser.add_argument("--jitter", type=float, default=0.25, help="Gecikmeye eklenen ± sapma (sn)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Servis çağrısı hata olasılığı (0-1)")
+    parser.add_argument("--slow-rate", type=float, default=0.0,
+                        help="Bir çağrının yavaş (kuyruk) yanıt verme olasılığı (0-1)")
+    parser.add_argument("--slow-latency", type=float, default=10.0, help="Yavaş çağrılara eklenen gecikme (sn)")
+    parser.add_argument("--chunk-delay", type=float, default=0.0,
+                        help="Akışlı metin yanıtında parçalar arası gecikme (sn)")
+    parser.add_argument("--no-streaming", action="store_true",
+                        help="Görselleri metnin tamamı gelince başlat (karşılaştırma için)")
+    parser.add_argument("--hedge-after", type=float,
+                        help="Tüm servislerde bu kadar sn içinde yanıt gelmezse isteği bir kez daha gönder")
+    parser.add_argument("--tts-rps", type=float,
+                        help="Tüm işlerin paylaştığı ses isteği/sn sınırı (varsayılan: iş başına 2)")
+    parser.add_argument("--tts-concurrency", type=int,
+                        help="Tüm işlerin paylaştığı eşzamanlı ses isteği sınırı (varsayılan: iş başına 2)")
+    parser.add_argument("--no-resilience", action="store_true",
+                        help="Tekrar deneme, hedge ve devre kesiciyi kapat (karşılaştırma için)")
+    parser.add_argument("--seed", type=int, default=1, help="Gecikme/hata dizisi için tohum")
+    parser.add_argument("--style", choices=sorted(style_texts), default="öğretici")
+    parser.add_argument("--render-mode", choices=RENDER_MODES, default="segments")
+    parser.add_argument("--profile", choices=list(ENCODING_PROFILES), default="draft")
+    parser.add_argument("--use-cache", action="store_true",
+                        help="Önbellekleri kullan (varsayılan: her iş tüm adımları baştan yapar)")
+    parser.add_argument("--projects-dir", help="Proje klasörleri (varsayılan: iş sonunda silinen geçici dizin)")
+    parser.add_argument("--output", help="JSON sonuçların yazılacağı dosya (varsayılan: standart çıktı)")
+    args = parser.parse_args(argv)
+    args.jobs = max(1, args.jobs)
+    args.concurrency = max(1, args.concurrency)
+    if args.tts_rps is None:
+        args.tts_rps = 2.0 * args.concurrency
+    if args.tts_concurrency is None:
+        args.tts_concurrency = 2 * args.concurrency
+    return args
+
+
+def run_job(index, args, providers, pdf_path, projects_dir, started_at):
+    """Tek bir PDF'yi baştan sona işle, zamanlamaları döndür"""
+    caches = {} if args.use_cache else {
+        "audio_cache": False, "image_cache": False, "llm_cache": False,
+        "pdf_text_cache": False, "segment_cache": False
+    }
+    pipeline = ReelsPipeline(
+        genai_api_key=os.getenv("GENAI_API_KEY"),
+        projects_dir=projects_dir,
+        render_mode=args.render_mode,
+        encoding_profile=args.profile,
+        render_workers=1,
+        providers=providers,
+        resilience=False if args.no_resilience else None,
+        streaming=not args.no_streaming,
+        **caches
+    )
+    start = time.perf_counter()
+    result = {"job": index, "pdf": pdf_path, "queued_s": round(start - started_at, 4)}
+    try:
+        pipeline.run(pdf_path, args.style)
+        result["ok"] = True
+    except Exception as e:
+        result["ok"] = False
+        result["error"] = str(e)
+    result["latency_s"] = round(time.perf_counter() - start, 4)
+    if pipeline.last_graph is not None:
+        # Aşama bazında durum ve süreler; kuyruk gecikmesinin hangi aşamadan geldiğini gösterir
+        result["stages"] = pipeline.last_graph.summary()
+    return result
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    load_dotenv()
+
+    work_dir = tempfile.mkdtemp(prefix="reels_load_")
+    projects_dir = args.projects_dir or os.path.join(work_dir, "projects")
+    pdfs = args.pdfs or [make_sample_pdf(os.path.join(work_dir, "ornek.pdf"))]
+    # Tüm işler aynı servis nesnelerini paylaşır; eşzamanlı yük tek bir servise biner
+    providers = create_providers(
+        args.providers,
+        record_dir=args.record_dir,
+        elevenlabs_api_key=os.getenv("ELEVENLABS_API_KEY"),
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+        chunk_delay=args.chunk_delay,
+        seed=args.seed,
+        replay_fallback=args.replay_fallback
+    )
+    service_providers = providers
+    # Aynı hesabın plan limiti tüm işlere ortaktır; tekrar ve hedge'ler de sınıra uysun diye
+    # sınırlayıcı dayanıklılık katmanının altındadır
+    providers = dict(providers, speech=RateLimitedProvider(providers["speech"], args.tts_rps, args.tts_concurrency))
+    if not args.no_resilience:
+        policies = None
+        if args.hedge_after is not None:
+            policies = {
+                kind: ResiliencePolicy(policy.deadline, policy.attempts, policy.base_delay, policy.max_delay,
+                                       hedge_after=args.hedge_after)
+                for kind, policy in DEFAULT_POLICIES.items()
+            }
+        # Sarmalayıcılar da paylaşılır; sayaçlar tüm işleri kapsar
+        providers = resilient_providers(providers, policies)
+
+    results = []
+    try:
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = [
+                executor.submit(run_job, index, args, providers, pdfs[index % len(pdfs)],
+                                projects_dir, started_at)
+                for index in range(args.jobs)
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                status = "tamam" if result["ok"] else f"hata: {result['error']}"
+                print(f"[{len(results)}/{args.jobs}] iş {result['job']}: "
+                      f"{result['latency_s']:.2f} sn ({status})", file=sys.stderr, flush=True)
+        wall = time.perf_counter() - started_at
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results.sort(key=lambda result: result["job"])
+    latencies = [result["latency_s"] for result in results if result["ok"]]
+    completed = len(latencies)
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "jobs": args.jobs,
+            "concurrency": args.concurrency,
+            "providers": args.providers,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "error_rate": args.error_rate,
+            "slow_rate": args.slow_rate,
+            "slow_latency": args.slow_latency,
+            "chunk_delay": args.chunk_delay,
+            "streaming": not args.no_streaming,
+            "hedge_after": args.hedge_after,
+            "tts_rps": args.tts_rps,
+            "tts_concurrency": args.tts_concurrency,
+            "resilience": not args.no_resilience,
+            "seed": args.seed,
+            "render_mode": args.render_mode,
+            "profile": args.profile,
+            "use_cache": args.use_cache
+        },
+        "summary": {
+            "wall_s": round(wall, 4),
+            "completed": completed,
+            "failed": len(results) - completed,
+            "throughput_jobs_per_min": round(completed / wall * 60, 2) if wall > 0 else None,
+            "latency_s": {
+                "p50": percentile(latencies, 50),
+                "p90": percentile(latencies, 90),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "max": max(latencies) if latencies else None
+            },
+            "providers": provider_stats(service_providers),
+            "resilience": {kind: dict(provider.stats) for kind, provider in providers.items()
+                           if isinstance(provider, ResilientProvider)}
+        },
+        "jobs": results
+    }
+
+    summary = report["summary"]
+    print(f"\n{completed}/{args.jobs} iş tamamlandı, {summary['wall_s']:.1f} sn, "
+          f"{summary['throughput_jobs_per_min']} iş/dk, p50 {summary['latency_s']['p50']} sn, "
+          f"p99 {summary['latency_s']['p99']} sn", file=sys.stderr)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0 if completed == args.jobs else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
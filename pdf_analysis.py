@@ -0,0 +1,158 @@
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# Yaklaşık token hesabı için karakter/token oranı
+CHARS_PER_TOKEN = 4
+CHUNK_TOKENS = 6000
+LONG_PDF_TOKENS = 20000
+ANALYSIS_MODES = ("auto", "single", "chunked")
+
+HEADING_PATTERN = re.compile(
+    r"^(\d+(\.\d+)*[.)]?\s+\S|(BÖLÜM|Bölüm|KISIM|Kısım|ÜNİTE|Ünite|CHAPTER|Chapter)\b)"
+)
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def is_heading(line):
+    """Kısa, numaralı veya tamamı büyük harf satırları başlık say"""
+    line = line.strip()
+    if not line or len(line) > 80:
+        return False
+    if HEADING_PATTERN.match(line):
+        return True
+    letters = [c for c in line if c.isalpha()]
+    return len(letters) >= 4 and all(c.isupper() for c in letters)
+
+
+def split_blocks(text):
+    """Metni başlık ve boş satır sınırlarından bloklara ayır"""
+    blocks = []
+    current = []
+    for line in text.split("\n"):
+        if (not line.strip() or is_heading(line)) and current:
+            blocks.append("\n".join(current))
+            current = []
+        if line.strip():
+            current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+def split_into_chunks(text, max_tokens=CHUNK_TOKENS):
+    """Metni token bütçesini aşmayan parçalara böl
+
+    Parçalar başlık/paragraf sınırlarında kesilir; bütçeden büyük tek bir
+    blok satır satır, o da yetmezse karakter bazında bölünür. Aynı metin her
+    zaman aynı parçaları üretir, böylece değişmeyen parçaların özetleri
+    önbellekten gelir.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    units = []
+    for block in split_blocks(text):
+        if len(block) <= max_chars:
+            units.append(block)
+            continue
+        for line in block.split("\n"):
+            units.extend(line[i:i + max_chars] for i in range(0, len(line), max_chars))
+
+    chunks = []
+    current = []
+    current_len = 0
+    for unit in units:
+        if current and current_len + len(unit) + 1 > max_chars:
+            chunks.append("\n".join(current))
+            current = []
+            current_len = 0
+        current.append(unit)
+        current_len += len(unit) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def build_chunk_prompt(chunk):
+    """Tek bir parçanın özeti için prompt (yalnızca parça metnine bağlıdır)"""
+    return f"""
+            Aşağıdaki metin uzun bir PDF belgesinin bir parçasıdır. Bu parçadaki ana konuları,
+            önemli noktaları, tanımları ve örnekleri maddeler halinde, bilgi kaybetmeden özetle.
+            Parçada geçmeyen bilgi ekleme.
+
+            Metin:
+            {chunk}
+            """
+
+
+def build_reduce_prompt(summaries):
+    """Parça özetlerini tek analizde birleştirmek için prompt"""
+    joined = "\n\n".join(f"--- Parça {i} ---\n{summary}" for i, summary in enumerate(summaries, 1))
+    return f"""
+            Aşağıda uzun bir PDF içeriğinin sırayla parça parça çıkarılmış özetleri var.
+            Bu özetleri birleştirerek belgenin tamamını şu başlıklar altında özetle (detaya gir):
+
+            1. Ana Konular
+            2. Önemli Noktalar
+            3. Önerilen Konu Başlıkları (4 başlık öner)
+            4. Hedef Kitle Önerisi
+            5. İçerik Tonu Önerisi
+
+            Parça Özetleri:
+            {joined}
+            """
+
+
+class ChunkedAnalyzer:
+    """Uzun PDF'ler için map-reduce analiz
+
+    Metin parçalara bölünür, parçalar eşzamanlı özetlenir (her parça ayrı
+    önbelleklenir) ve özetler tek bir beş başlıklı analizde birleştirilir.
+    Özetler de bütçeyi aşarsa birleştirme adımı kademeli tekrarlanır.
+    """
+
+    def __init__(self, gemini, chunk_tokens=CHUNK_TOKENS, max_workers=4):
+        self.gemini = gemini
+        self.chunk_tokens = chunk_tokens
+        self.max_workers = max(1, int(max_workers))
+
+    def summarize_chunks(self, chunks, use_cache=True, cache_dir=None, report=None):
+        summaries = [None] * len(chunks)
+        cached_count = 0
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+            futures = {
+                executor.submit(self.gemini.generate, build_chunk_prompt(chunk), use_cache, cache_dir): index
+                for index, chunk in enumerate(chunks)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                summaries[futures[future]], cached = future.result()
+                cached_count += cached
+                if report:
+                    report(f"{done}/{len(chunks)} parça özetlendi ({cached_count} önbellekten)")
+        return summaries
+
+    def analyze(self, text, use_cache=True, cache_dir=None, report=None, on_chunk=None):
+        """Beş başlıklı analiz metnini ve parça sayısını döndür
+
+        on_chunk verilirse son birleştirme yanıtı akışlı alınır.
+        """
+        chunks = split_into_chunks(text, self.chunk_tokens)
+        if report:
+            report(f"PDF {len(chunks)} parçaya bölündü, parçalar özetleniyor...")
+        summaries = self.summarize_chunks(chunks, use_cache, cache_dir, report)
+
+        # Özetler tek istekte sığmıyorsa özetleri de parçalayıp özetle
+        while len(summaries) > 1 and estimate_tokens("\n\n".join(summaries)) > self.chunk_tokens * 2:
+            groups = split_into_chunks("\n\n".join(summaries), self.chunk_tokens)
+            if len(groups) >= len(summaries):
+                break
+            if report:
+                report(f"{len(summaries)} özet {len(groups)} gruba indiriliyor...")
+            summaries = self.summarize_chunks(groups, use_cache, cache_dir, report)
+
+        if report:
+            report("Parça özetleri birleştiriliyor...")
+        analysis, _ = self.gemini.generate(build_reduce_prompt(summaries), use_cache, cache_dir, on_chunk=on_chunk)
+        return analysis, len(chunks)
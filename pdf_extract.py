@@ -0,0 +1,97 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import PyPDF2
+
+from disk_cache import DEFAULT_CACHE_DIR, DiskCache, file_sha256, make_key
+
+
+PDF_TEXT_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+
+def default_pdf_text_cache(max_bytes=PDF_TEXT_CACHE_MAX_BYTES):
+    """Dosya özetine göre çıkarılmış PDF metinleri"""
+    return DiskCache(os.path.join(DEFAULT_CACHE_DIR, "pdf_text"), max_bytes=max_bytes, suffix=".txt")
+
+
+def extract_page_range(pdf_path, start, end):
+    """[start, end) aralığındaki sayfaların metnini (sayfa no, metin) listesi olarak döndür
+
+    İşçi süreçte çalışır; her süreç PDF'yi kendisi açar.
+    """
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        return [(index, reader.pages[index].extract_text() or "") for index in range(start, end)]
+
+
+class PdfTextExtractor:
+    """Sayfa aralıklarını süreç havuzunda paralel işleyen PDF metin çıkarıcı
+
+    Az sayfalı PDF'ler süreç başlatma maliyetine girmeden aynı süreçte
+    okunur. Sonuç dosyanın sha256 özetiyle önbelleklenir; aynı PDF tekrar
+    yüklendiğinde metin doğrudan önbellekten gelir.
+    """
+
+    def __init__(self, cache=None, max_workers=None, pages_per_task=16, parallel_min_pages=32):
+        self.cache = cache
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_task = max(1, int(pages_per_task))
+        self.parallel_min_pages = parallel_min_pages
+
+    def page_count(self, pdf_path):
+        with open(pdf_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+
+    def iter_pages(self, pdf_path):
+        """Sayfaları bittikçe (sayfa no, metin, toplam sayfa) olarak üret
+
+        Paralel modda sayfalar sırasız gelebilir.
+        """
+        total = self.page_count(pdf_path)
+        if total < self.parallel_min_pages or self.max_workers < 2:
+            with open(pdf_path, 'rb') as file:
+                reader = PyPDF2.PdfReader(file)
+                for index, page in enumerate(reader.pages):
+                    yield index, page.extract_text() or "", total
+            return
+
+        ranges = [
+            (start, min(start + self.pages_per_task, total))
+            for start in range(0, total, self.pages_per_task)
+        ]
+        # fork, Tk ve worker thread'leri olan süreçte kilitlenmeye yol açabilir
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(ranges)), mp_context=context) as executor:
+            futures = [executor.submit(extract_page_range, pdf_path, start, end) for start, end in ranges]
+            for future in as_completed(futures):
+                for index, text in future.result():
+                    yield index, text, total
+
+    def cache_key(self, pdf_path):
+        return make_key("pdf_text", PyPDF2.__version__, file_sha256(pdf_path))
+
+    def extract(self, pdf_path, on_page=None):
+        """PDF'nin tüm metnini döndür
+
+        `on_page(sayfa no, metin, toplam)` her sayfa okunduğunda çağıran thread
+        üzerinde çağrılır. Önbellekten gelen metin için çağrılmaz.
+        """
+        key = None
+        if self.cache is not None:
+            key = self.cache_key(pdf_path)
+            cached = self.cache.get_bytes(key)
+            if cached is not None:
+                return cached.decode("utf-8")
+
+        pages = {}
+        for index, text, total in self.iter_pages(pdf_path):
+            pages[index] = text
+            if on_page:
+                on_page(index, text, total)
+
+        text = "".join(pages[index] + "\n" for index in sorted(pages))
+
+        if self.cache is not None:
+            self.cache.put_bytes(key, text.encode("utf-8"))
+        return text
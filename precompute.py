@@ -0,0 +1,138 @@
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from reels_pipeline import build_video_data
+from video_generator import VideoGenerator
+
+
+class Precomputer:
+    """Operatör düzenlemeye devam ederken ses ve segmentleri önceden hazırlar
+
+    Metin JSON'ı doğrulandığında başlık ve bölüm sesleri, görseller de hazır
+    olunca her sahnenin boyutlandırılmış, yazı bindirilmiş ve kodlanmış
+    segmenti arka planda üretilir. Sonuçlar ses ve segment önbelleklerine
+    yazılır; "Bitir"deki render aynı anahtarları bulur ve çoğunlukla yalnızca
+    birleştirme yapar.
+
+    Her görev girdilerinden oluşan bir anahtarla tutulur. `update` yalnızca
+    anahtarı değişen görevleri iptal edip yeniden başlatır; bir bölümün
+    metni değişirse yalnızca o bölümün sesi ve segmenti yeniden hazırlanır.
+    Hatalar yutulur, eksik kalan iş render sırasında normal yoldan yapılır.
+    """
+
+    def __init__(self, pipeline, render_workers=1):
+        self.pipeline = pipeline
+        self.audio_pool = ThreadPoolExecutor(max_workers=pipeline.tts.max_concurrency,
+                                             thread_name_prefix="onhazirlik-ses")
+        self.render_pool = ThreadPoolExecutor(max_workers=max(1, int(render_workers)),
+                                              thread_name_prefix="onhazirlik-segment")
+        self.tasks = {}
+        self.lock = threading.Lock()
+        self.stats = {"started": 0, "invalidated": 0, "completed": 0, "failed": 0}
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def schedule(self, name, key, pool, fn, *args):
+        """Anahtarı aynı olan görev varsa onu kullan, yoksa eskisini iptal edip yenisini başlat"""
+        with self.lock:
+            current = self.tasks.get(name)
+            if current is not None:
+                current_key, future = current
+                usable = not future.cancelled() and not (future.done() and future.exception() is not None)
+                if current_key == key and usable:
+                    return future
+                if current_key != key:
+                    # Çalışmakta olan eski görev bitince sonucu kullanılmaz
+                    future.cancel()
+                    self.stats["invalidated"] += 1
+            future = pool.submit(self.run_task, fn, *args)
+            self.tasks[name] = (key, future)
+            self.stats["started"] += 1
+            return future
+
+    def drop(self, name):
+        with self.lock:
+            current = self.tasks.pop(name, None)
+        if current is not None:
+            current[1].cancel()
+
+    def run_task(self, fn, *args):
+        try:
+            result = fn(*args)
+        except Exception:
+            self.count("failed")
+            raise
+        self.count("completed")
+        return result
+
+    def can_prepare_audio(self):
+        return self.pipeline.tts.cache is not None
+
+    def can_prepare_segments(self):
+        return self.pipeline.render_mode == "segments" and self.pipeline.segment_cache is not None
+
+    def update(self, json_data, images=None, encoding_profile=None):
+        """Güncel metin JSON'ı ve görsellerle değişen görevleri yeniden başlat
+
+        Tk thread'inden çağrılır ve beklemez; images verilmezse yalnızca
+        sesler hazırlanır.
+        """
+        video_data = build_video_data(json_data, images or [])
+        texts = [str(video_data['title'])] + video_data['texts']
+        encoding_profile = encoding_profile or self.pipeline.encoding_profile
+
+        for index, text in enumerate(texts):
+            if not self.can_prepare_audio():
+                break
+            audio = self.schedule(f"ses_{index}", text, self.audio_pool, self.prepare_audio, text)
+
+            image = images[max(0, index - 1)] if images and len(images) >= len(texts) - 1 else None
+            if image is None or not self.can_prepare_segments() or not os.path.exists(image):
+                self.drop(f"segment_{index}")
+                continue
+            stat = os.stat(image)
+            # Görsel yeniden oluşturulduğunda dosya değişir; yol aynı kalsa da anahtar değişir
+            key = (text, image, stat.st_mtime_ns, stat.st_size, encoding_profile)
+            self.schedule(f"segment_{index}", key, self.render_pool, self.prepare_segment,
+                          index, video_data, audio, encoding_profile)
+
+    def prepare_audio(self, text):
+        """Sesi önbelleğe al ve süresini döndür"""
+        work_dir = tempfile.mkdtemp(prefix="onhazirlik_", dir=self.pipeline.scratch_dir)
+        try:
+            audio_path = os.path.join(work_dir, "ses.mp3")
+            self.pipeline.tts.create_audio_file(text, audio_path)
+            return VideoGenerator(work_dir, None).get_audio_duration(audio_path)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def prepare_segment(self, index, video_data, audio, encoding_profile):
+        """Sahnenin ses süresiyle segmentini kodlayıp önbelleğe al"""
+        duration = audio.result()
+        work_dir = tempfile.mkdtemp(prefix="onhazirlik_", dir=self.pipeline.scratch_dir)
+        try:
+            video_gen = VideoGenerator(work_dir, video_data, "segments", self.pipeline.segment_cache,
+                                       encoding_profile)
+            return video_gen.precompute_segment(index, video_gen.scene_spec(index, duration), work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def wait(self, progress=None):
+        """Devam eden görevlerin bitmesini bekle; aynı işin render'da tekrarlanmasını önler"""
+        with self.lock:
+            futures = [future for _, future in self.tasks.values()]
+        pending = [future for future in futures if not future.done()]
+        if pending and progress:
+            progress(f"Ön hazırlık bitiyor ({len(futures) - len(pending)}/{len(futures)} hazır)...")
+        wait(pending)
+
+    def shutdown(self):
+        with self.lock:
+            self.tasks.clear()
+        self.audio_pool.shutdown(wait=False, cancel_futures=True)
+        self.render_pool.shutdown(wait=False, cancel_futures=True)
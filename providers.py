@@ -0,0 +1,377 @@
+import hashlib
+import json
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+from disk_cache import DiskCache, make_key
+from http_clients import (DEFAULT_POOL_SIZE, GEMINI_TIMEOUT, HTTP_TIMEOUT, gemini_model, http_session,
+                          openai_client)
+
+
+PROVIDER_MODES = ("live", "record", "replay", "fake")
+PROVIDER_KINDS = ("text", "speech", "image")
+# Sahte seslerde konuşma hızı (kelime/saniye)
+FAKE_WORDS_PER_SECOND = 2.5
+# Sahte akışlı yanıtlarda parça başına karakter
+FAKE_STREAM_CHUNK_CHARS = 80
+
+
+class ProviderError(Exception):
+    """Servis çağrısı başarısız oldu (gerçek ya da enjekte edilmiş hata)
+
+    `retryable=False` tekrar denemenin sonucu değiştirmeyeceği hatalar içindir.
+    """
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class GeminiTextProvider:
+    """Gemini metin üretimi; istek: {"model", "prompt", ["response_schema"]}, yanıt: metin
+
+    `response_schema` verilirse Gemini şemaya uyan JSON döndürmeye zorlanır.
+    `stream` aynı isteği parça parça üreten bir generator döndürür.
+    """
+
+    kind = "text"
+
+    def generate_content(self, request, stream=False):
+        generation_config = None
+        if request.get("response_schema"):
+            generation_config = {
+                "response_mime_type": "application/json",
+                "response_schema": request["response_schema"]
+            }
+        return gemini_model(request["model"]).generate_content(
+            request["prompt"],
+            generation_config=generation_config,
+            stream=stream,
+            request_options={"timeout": GEMINI_TIMEOUT}
+        )
+
+    def call(self, request):
+        return self.generate_content(request).text
+
+    def stream(self, request):
+        for chunk in self.generate_content(request, stream=True):
+            # Metin içermeyen parçalar (ör. yalnızca bitiş nedeni) atlanır
+            if chunk.parts:
+                yield chunk.text
+
+
+class ElevenLabsSpeechProvider:
+    """Eleven Labs metin-ses; istek: {"text", "voice_id", "model_id", "voice_settings"}, yanıt: MP3"""
+
+    kind = "speech"
+
+    def __init__(self, api_key, pool_size=DEFAULT_POOL_SIZE):
+        self.api_key = api_key
+        self.pool_size = pool_size
+
+    def call(self, request):
+        url = f"https://api.elevenlabs.io/v1/text-to-speech/{request['voice_id']}"
+        headers = {
+            "Accept": "audio/mpeg",
+            "Content-Type": "application/json",
+            "xi-api-key": self.api_key
+        }
+        data = {
+            "text": request["text"],
+            "model_id": request["model_id"],
+            "voice_settings": request["voice_settings"]
+        }
+        session = http_session("elevenlabs", self.pool_size)
+        response = session.post(url, json=data, headers=headers, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return b"".join(chunk for chunk in response.iter_content(chunk_size=1024) if chunk)
+
+
+class OpenAIImageProvider:
+    """DALL-E görsel üretimi; istek: {"prompt", "model", "size", "quality"}, yanıt: PNG"""
+
+    kind = "image"
+
+    def __init__(self, api_key, pool_size=DEFAULT_POOL_SIZE):
+        self.api_key = api_key
+        self.pool_size = pool_size
+
+    def call(self, request):
+        response = openai_client(self.api_key, self.pool_size).images.generate(
+            model=request["model"],
+            prompt=request["prompt"],
+            n=1,
+            size=request["size"],
+            quality=request["quality"],
+            response_format="url"
+        )
+        image_response = http_session("images", self.pool_size).get(response.data[0].url, timeout=HTTP_TIMEOUT)
+        image_response.raise_for_status()
+        return image_response.content
+
+
+def request_key(kind, request):
+    return make_key("provider", kind, request)
+
+
+def recording_store(record_dir, kind):
+    """Bir servis türünün kayıtlı yanıtları (sınırsız, silinmez)"""
+    suffix = ".txt" if kind == "text" else ".bin"
+    return DiskCache(os.path.join(record_dir, kind), suffix=suffix)
+
+
+def encode_response(kind, response):
+    return response.encode("utf-8") if kind == "text" else response
+
+
+def decode_response(kind, data):
+    return data.decode("utf-8") if kind == "text" else data
+
+
+class RecordingProvider:
+    """Gerçek servisi çağırır ve her yanıtı isteğin özetiyle diske kaydeder"""
+
+    def __init__(self, inner, record_dir):
+        self.inner = inner
+        self.kind = inner.kind
+        self.store = recording_store(record_dir, self.kind)
+
+    def call(self, request):
+        response = self.inner.call(request)
+        self.store.put_bytes(request_key(self.kind, request), encode_response(self.kind, response))
+        return response
+
+    def stream(self, request):
+        chunks = []
+        for chunk in self.inner.stream(request):
+            chunks.append(chunk)
+            yield chunk
+        self.store.put_bytes(request_key(self.kind, request), encode_response(self.kind, "".join(chunks)))
+
+
+class SimulatedProvider(ABC):
+    """Gecikme ve hata enjeksiyonu yapan çevrimdışı servislerin temeli
+
+    Her çağrı `latency` ± `jitter` saniye bekler ve `error_rate` olasılıkla
+    ProviderError fırlatır. `slow_rate` olasılıkla gecikmeye `slow_latency`
+    eklenir (kuyruk gecikmesi). Aynı `seed` aynı gecikme/hata dizisini üretir.
+    Metin servislerinde `stream` ilk parçayı bu gecikmeden sonra, sonrakileri
+    `chunk_delay` aralıklarla verir.
+    Çağrı, hata ve toplam bekleme sayaçları `stats` içinde tutulur.
+    """
+
+    kind = None
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, slow_rate=0.0, slow_latency=0.0,
+                 chunk_delay=0.0, seed=None):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"calls": 0, "errors": 0, "latency_s": 0.0}
+
+    def call(self, request):
+        with self.lock:
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            if self.random.random() < self.slow_rate:
+                delay += self.slow_latency
+            failed = self.random.random() < self.error_rate
+            self.stats["calls"] += 1
+            self.stats["errors"] += int(failed)
+            self.stats["latency_s"] += delay
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise ProviderError(f"Enjekte edilmiş {self.kind} servisi hatası")
+        return self.respond(request)
+
+    def stream(self, request):
+        text = self.call(request)
+        for start in range(0, len(text), FAKE_STREAM_CHUNK_CHARS):
+            if start and self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield text[start:start + FAKE_STREAM_CHUNK_CHARS]
+
+    @abstractmethod
+    def respond(self, request):
+        """Gecikme ve hata enjeksiyonundan sonra isteğin yanıtını üret"""
+
+
+def fill_template(value, label="sahte"):
+    """JSON şablonundaki her metni deterministik sahte bir değerle değiştir"""
+    if isinstance(value, dict):
+        return {key: fill_template(item, f"{label} {key}") for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill_template(item, label) for item in value]
+    return f"{value} ({label})"
+
+
+def fill_schema(schema, label="sahte"):
+    """JSON şemasına uyan deterministik sahte değer"""
+    if schema.get("type") == "object":
+        return {name: fill_schema(sub, f"{label} {name}") for name, sub in schema.get("properties", {}).items()}
+    if schema.get("type") == "array":
+        return [fill_schema(schema.get("items", {}), label)]
+    return label
+
+
+class FakeTextProvider(SimulatedProvider):
+    """Analiz metni, istenen şemaya ya da prompttaki JSON şablonuna uyan metin üretir"""
+
+    kind = "text"
+
+    def respond(self, request):
+        if request.get("response_schema"):
+            return json.dumps(fill_schema(request["response_schema"]), ensure_ascii=False)
+
+        prompt = request["prompt"]
+        match = re.search(r"Text formatı:\s*(\{.*\})", prompt, re.DOTALL)
+        if match:
+            try:
+                template = json.loads(match.group(1))
+            except json.JSONDecodeError:
+                template = None
+            if template is not None:
+                body = json.dumps(fill_template(template), ensure_ascii=False, indent=2)
+                return f"```json\n{body}\n```"
+
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        return (
+            f"1. Ana Konular\n- Sahte konu {digest}\n"
+            "2. Önemli Noktalar\n- Çevrimdışı test yanıtı\n"
+            "3. Önerilen Konu Başlıkları\n- Giriş\n- Temeller\n- Örnekler\n- Özet\n"
+            "4. Hedef Kitle Önerisi\n- Öğrenciler\n"
+            "5. İçerik Tonu Önerisi\n- Öğretici"
+        )
+
+
+@lru_cache(maxsize=64)
+def silent_mp3(duration):
+    """Verilen sürede (0.1 sn adımlarla) sessiz MP3"""
+    return subprocess.run([
+        'ffmpeg', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', 'anullsrc=r=44100:cl=mono',
+        '-t', f"{duration:.1f}", '-c:a', 'libmp3lame', '-f', 'mp3', 'pipe:1'
+    ], capture_output=True, check=True).stdout
+
+
+class FakeSpeechProvider(SimulatedProvider):
+    """Metin uzunluğuyla orantılı süreli sessiz MP3 üretir"""
+
+    kind = "speech"
+
+    def respond(self, request):
+        words = len(request["text"].split())
+        return silent_mp3(round(max(1.0, words / FAKE_WORDS_PER_SECOND), 1))
+
+
+class FakeImageProvider(SimulatedProvider):
+    """Prompta göre renklenen, istenen boyutta PNG üretir"""
+
+    kind = "image"
+
+    def respond(self, request):
+        width, height = (int(v) for v in request["size"].split("x"))
+        seed = int(hashlib.sha256(request["prompt"].encode("utf-8")).hexdigest()[:8], 16)
+        rng = np.random.default_rng(seed)
+        gradient = np.linspace(0, 1, width, dtype=np.float32)[None, :, None]
+        image = np.broadcast_to(gradient, (height, width, 3)) * rng.uniform(60, 255, 3)
+        image = np.clip(image + rng.normal(0, 10, (height, width, 3)), 0, 255).astype(np.uint8)
+        ok, data = cv2.imencode(".png", image)
+        if not ok:
+            raise ProviderError("Sahte görsel oluşturulamadı", retryable=False)
+        return data.tobytes()
+
+
+class ReplayProvider(SimulatedProvider):
+    """Kaydedilmiş yanıtları gecikme/hata enjeksiyonuyla yeniden oynatır
+
+    Kaydı olmayan istek için `fallback` verilmişse onun yanıtı kullanılır,
+    yoksa ProviderError fırlatılır.
+    """
+
+    def __init__(self, kind, record_dir, fallback=None, **simulation):
+        super().__init__(**simulation)
+        self.kind = kind
+        self.store = recording_store(record_dir, kind)
+        self.fallback = fallback
+        self.stats["misses"] = 0
+
+    def respond(self, request):
+        path = self.store.get(request_key(self.kind, request))
+        if path is not None:
+            with open(path, "rb") as f:
+                return decode_response(self.kind, f.read())
+        with self.lock:
+            self.stats["misses"] += 1
+        if self.fallback is not None:
+            return self.fallback.respond(request)
+        raise ProviderError(f"Kayıtlı {self.kind} yanıtı bulunamadı", retryable=False)
+
+
+FAKE_PROVIDERS = {
+    "text": FakeTextProvider,
+    "speech": FakeSpeechProvider,
+    "image": FakeImageProvider
+}
+
+
+def live_providers(elevenlabs_api_key=None, openai_api_key=None, pool_size=DEFAULT_POOL_SIZE):
+    return {
+        "text": GeminiTextProvider(),
+        "speech": ElevenLabsSpeechProvider(elevenlabs_api_key, pool_size),
+        "image": OpenAIImageProvider(openai_api_key, pool_size)
+    }
+
+
+def create_providers(mode="live", record_dir="recordings", elevenlabs_api_key=None, openai_api_key=None,
+                     latency=0.0, jitter=0.0, error_rate=0.0, slow_rate=0.0, slow_latency=0.0, chunk_delay=0.0,
+                     seed=None, replay_fallback=False, pool_size=DEFAULT_POOL_SIZE):
+    """Seçilen moda göre {"text", "speech", "image"} servislerini oluştur
+
+    live: gerçek API'ler, record: gerçek API'ler + yanıtları `record_dir`e
+    kaydet, replay: kayıtlardan oynat (replay_fallback=True ise kaydı
+    olmayan istekler sahte yanıt alır), fake: tamamen sentetik yanıtlar.
+    Gecikme ve hata enjeksiyonu yalnızca replay ve fake modlarında uygulanır.
+    `pool_size` gerçek API'lerin bağlantı havuzu boyutudur.
+    """
+    if mode not in PROVIDER_MODES:
+        raise ValueError(f"Bilinmeyen servis modu: {mode}")
+
+    if mode in ("live", "record"):
+        providers = live_providers(elevenlabs_api_key, openai_api_key, pool_size)
+        if mode == "record":
+            providers = {kind: RecordingProvider(provider, record_dir) for kind, provider in providers.items()}
+        return providers
+
+    providers = {}
+    for index, kind in enumerate(PROVIDER_KINDS):
+        # Her servis kendi rastgele dizisini kullanır; aynı seed aynı senaryoyu üretir
+        simulation = {"latency": latency, "jitter": jitter, "error_rate": error_rate,
+                      "slow_rate": slow_rate, "slow_latency": slow_latency, "chunk_delay": chunk_delay,
+                      "seed": None if seed is None else seed + index}
+        if mode == "fake":
+            providers[kind] = FAKE_PROVIDERS[kind](**simulation)
+        else:
+            fallback = FAKE_PROVIDERS[kind]() if replay_fallback else None
+            providers[kind] = ReplayProvider(kind, record_dir, fallback, **simulation)
+    return providers
+
+
+def provider_stats(providers):
+    """Simüle edilen servislerin çağrı/hata sayaçları"""
+    return {kind: dict(provider.stats) for kind, provider in providers.items()
+            if isinstance(provider, SimulatedProvider)}
@@ -0,0 +1,73 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket hız sınırlayıcı
+
+    `rate` saniyede eklenen token sayısı, `capacity` aynı anda harcanabilecek
+    en fazla token (burst) sayısıdır. `acquire` token kalmadıysa bir sonraki
+    token eklenene kadar bekler.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate pozitif olmalı")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self, tokens=1):
+        """Token varsa harca ve True döndür, yoksa beklemeden False döndür"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1, timeout=None):
+        """Token alınana kadar bekle; timeout dolarsa False döndür"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens - self.tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class RateLimitedProvider:
+    """Bir servisi istek hızı ve eşzamanlılık sınırıyla sarar
+
+    Sınır her gerçek istekte uygulanır. Dayanıklılık katmanının altına
+    konduğunda tekrar denemeler ve hedge kopyaları da token harcar ve aynı
+    anda en fazla `max_concurrency` istek gönderilir.
+    """
+
+    def __init__(self, inner, requests_per_second, max_concurrency, burst=None):
+        self.inner = inner
+        self.kind = inner.kind
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.limiter = TokenBucket(requests_per_second, burst if burst is not None else self.max_concurrency)
+        self.slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    def call(self, request):
+        with self.slots:
+            self.limiter.acquire()
+            return self.inner.call(request)
@@ -0,0 +1,322 @@
+import argparse
+import os
+import shutil
+import sys
+
+from dotenv import load_dotenv
+
+from image_generation import default_image_cache
+from pdf_analysis import ANALYSIS_MODES, CHUNK_TOKENS
+from providers import PROVIDER_MODES, create_providers
+from reels_pipeline import ReelsPipeline, style_texts
+from render_farm import RenderFarm
+from tts import default_audio_cache
+from video_generator import DEFAULT_ENCODING_PROFILE, ENCODING_PROFILES, RENDER_MODES, default_segment_cache
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="PDF dosyalarından arayüz açmadan reels videosu üretir."
+    )
+    parser.add_argument("pdfs", nargs="+", help="İşlenecek PDF dosyaları")
+    parser.add_argument(
+        "--style",
+        choices=sorted(style_texts),
+        default="öğretici",
+        help="Hazır anlatım tarzı (varsayılan: öğretici)"
+    )
+    parser.add_argument(
+        "--custom-style",
+        help="Hazır tarz yerine kullanılacak serbest anlatım tarzı metni"
+    )
+    parser.add_argument(
+        "--projects-dir",
+        default="projects",
+        help="Proje klasörlerinin oluşturulacağı dizin"
+    )
+    parser.add_argument(
+        "--render-mode",
+        choices=RENDER_MODES,
+        default="segments",
+        help="segments: bölümler önbelleklenen segmentler olarak kodlanıp birleştirilir, "
+             "scenes: her sahne bir kez kodlanır, stream: frame'ler ffmpeg'e pipe ile akıtılır, "
+             "frames: her frame ayrı yazılır"
+    )
+    parser.add_argument(
+        "--profile",
+        choices=list(ENCODING_PROFILES),
+        default=DEFAULT_ENCODING_PROFILE,
+        help="Kodlama profili: draft hızlı önizleme, standard paylaşım, archive yüksek kalite"
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=None,
+        help="segments modunda paralel kodlanacak en fazla bölüm sayısı (varsayılan: çekirdek sayısı)"
+    )
+    parser.add_argument(
+        "--segment-cache-mb",
+        type=int,
+        default=2048,
+        help="Kodlanmış bölüm segmentleri önbelleğinin en fazla boyutu (MB)"
+    )
+    parser.add_argument(
+        "--no-segment-cache",
+        action="store_true",
+        help="Bölüm segmentlerini önbelleğe almadan her seferinde yeniden kodla"
+    )
+    parser.add_argument(
+        "--tts-concurrency",
+        type=int,
+        default=2,
+        help="Eleven Labs'e aynı anda gönderilecek en fazla istek (plan limiti)"
+    )
+    parser.add_argument(
+        "--tts-rps",
+        type=float,
+        default=2.0,
+        help="Eleven Labs için saniyedeki en fazla istek sayısı"
+    )
+    parser.add_argument(
+        "--image-concurrency",
+        type=int,
+        default=4,
+        help="Aynı anda oluşturulacak en fazla görsel sayısı"
+    )
+    parser.add_argument(
+        "--audio-cache-mb",
+        type=int,
+        default=500,
+        help="Ses önbelleğinin en fazla boyutu (MB)"
+    )
+    parser.add_argument(
+        "--no-audio-cache",
+        action="store_true",
+        help="Ses önbelleğini kullanma, tüm klipleri yeniden oluştur"
+    )
+    parser.add_argument(
+        "--image-cache-mb",
+        type=int,
+        default=2048,
+        help="Görsel önbelleğinin en fazla boyutu (MB)"
+    )
+    parser.add_argument(
+        "--image-cache-days",
+        type=float,
+        default=30,
+        help="Bu kadar gündür kullanılmayan önbellek görselleri silinir"
+    )
+    parser.add_argument(
+        "--fresh-images",
+        action="store_true",
+        help="Önbellekteki görselleri kullanma, hepsini yeniden oluştur"
+    )
+    parser.add_argument(
+        "--llm-cache-hours",
+        type=float,
+        default=7 * 24,
+        help="Önbellekteki Gemini yanıtlarının geçerlilik süresi (saat)"
+    )
+    parser.add_argument(
+        "--fresh-llm",
+        action="store_true",
+        help="Önbellekteki Gemini yanıtlarını kullanma, analizi ve metni yeniden üret"
+    )
+    parser.add_argument(
+        "--analysis-mode",
+        choices=ANALYSIS_MODES,
+        default="auto",
+        help="single: tek istek, chunked: parçalı map-reduce, auto: uzun PDF'lerde parçalı"
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=CHUNK_TOKENS,
+        help="Parçalı analizde parça başına yaklaşık token bütçesi"
+    )
+    parser.add_argument(
+        "--free-form-output",
+        action="store_true",
+        help="Metin çıktısını şemaya bağlı JSON modu yerine serbest metin olarak iste"
+    )
+    parser.add_argument(
+        "--no-streaming",
+        action="store_true",
+        help="Görselleri metnin tamamı gelince başlat (varsayılan: her bölüm hazır olunca başlar)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Aynı anda ayrı süreçlerde işlenecek PDF sayısı"
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=1,
+        help="--jobs ile hata veren veya çöken bir PDF'nin yeniden deneme sayısı"
+    )
+    parser.add_argument(
+        "--scratch-dir",
+        help="Render ara dosyalarının yazılacağı dizin (varsayılan: proje ya da sistem geçici dizini)"
+    )
+    parser.add_argument(
+        "--providers",
+        choices=PROVIDER_MODES,
+        default="live",
+        help="live: gerçek API'ler, record: gerçek API'ler + yanıtları kaydet, "
+             "replay: kayıtlı yanıtları oynat, fake: API anahtarı gerektirmeyen sentetik yanıtlar"
+    )
+    parser.add_argument(
+        "--record-dir",
+        default="recordings",
+        help="record/replay modlarında yanıtların tutulduğu dizin"
+    )
+    parser.add_argument(
+        "--replay-fallback",
+        action="store_true",
+        help="replay modunda kaydı olmayan isteklere sentetik yanıt ver"
+    )
+    parser.add_argument(
+        "--fake-latency",
+        type=float,
+        default=0.0,
+        help="replay/fake modlarında her servis çağrısına eklenen gecikme (sn)"
+    )
+    parser.add_argument(
+        "--fake-jitter",
+        type=float,
+        default=0.0,
+        help="Gecikmeye eklenen ± rastgele sapma (sn)"
+    )
+    parser.add_argument(
+        "--fake-error-rate",
+        type=float,
+        default=0.0,
+        help="replay/fake modlarında bir çağrının hata verme olasılığı (0-1)"
+    )
+    parser.add_argument(
+        "--stop-on-error",
+        action="store_true",
+        help="Bir PDF hata verirse kalanları işlemeden dur"
+    )
+    args = parser.parse_args(argv)
+    args.jobs = max(1, args.jobs)
+    return args
+
+
+def build_pipeline(args, prefix, scratch_dir=None):
+    """Komut satırı seçeneklerinden pipeline oluştur
+
+    --jobs ile eşzamanlı çalışan işler Eleven Labs limitlerini ve CPU
+    çekirdeklerini paylaşır; her işe payına düşen kısım verilir.
+    """
+    audio_cache = False if args.no_audio_cache else default_audio_cache(args.audio_cache_mb * 1024 * 1024)
+    image_cache = default_image_cache(
+        args.image_cache_mb * 1024 * 1024,
+        args.image_cache_days * 24 * 60 * 60
+    )
+    segment_cache = (False if args.no_segment_cache
+                     else default_segment_cache(args.segment_cache_mb * 1024 * 1024))
+
+    providers = create_providers(
+        args.providers,
+        record_dir=args.record_dir,
+        elevenlabs_api_key=os.getenv("ELEVENLABS_API_KEY"),
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        latency=args.fake_latency,
+        jitter=args.fake_jitter,
+        error_rate=args.fake_error_rate,
+        replay_fallback=args.replay_fallback,
+        pool_size=max(args.tts_concurrency, args.image_concurrency)
+    )
+
+    return ReelsPipeline(
+        genai_api_key=os.getenv("GENAI_API_KEY"),
+        elevenlabs_api_key=os.getenv("ELEVENLABS_API_KEY"),
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        projects_dir=args.projects_dir,
+        render_mode=args.render_mode,
+        tts_concurrency=max(1, args.tts_concurrency // args.jobs),
+        tts_requests_per_second=args.tts_rps / args.jobs,
+        image_concurrency=args.image_concurrency,
+        audio_cache=audio_cache,
+        image_cache=image_cache,
+        llm_cache_ttl=args.llm_cache_hours * 60 * 60,
+        analysis_mode=args.analysis_mode,
+        chunk_tokens=args.chunk_tokens,
+        segment_cache=segment_cache,
+        encoding_profile=args.profile,
+        render_workers=args.render_workers or max(1, (os.cpu_count() or 1) // args.jobs),
+        scratch_dir=scratch_dir,
+        providers=providers,
+        structured_output=not args.free_form_output,
+        streaming=not args.no_streaming,
+        progress=lambda message: print(f"{prefix}: {message}", flush=True)
+    )
+
+
+def render_pdf(args, pdf_path, prefix, discard_failed_project=False, scratch_dir=None):
+    """Tek bir PDF'den video üret; render farm işçi süreçlerinde de çalışır
+
+    discard_failed_project=True ise hata veren denemenin açtığı proje klasörü
+    silinir; yeniden deneme yarım kalan klasörün yanına ikinci bir proje açmaz.
+    """
+    pipeline = build_pipeline(args, prefix, scratch_dir)
+    try:
+        return pipeline.run(pdf_path, args.style, args.custom_style, args.fresh_images, args.fresh_llm)
+    except BaseException:
+        project_folder = pipeline.last_graph.values.get("project_folder") if pipeline.last_graph else None
+        if discard_failed_project and project_folder:
+            shutil.rmtree(project_folder, ignore_errors=True)
+        raise
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    load_dotenv()
+
+    prefixes = [
+        f"[{index}/{len(args.pdfs)}] {os.path.basename(pdf_path)}"
+        for index, pdf_path in enumerate(args.pdfs, 1)
+    ]
+
+    results = []
+    if args.jobs > 1:
+        # Her PDF ayrı süreçte ve kendi geçici klasöründe işlenir
+        farm = RenderFarm(
+            render_pdf,
+            workers=args.jobs,
+            retries=args.retries,
+            scratch_root=args.scratch_dir,
+            on_event=lambda message: print(message, flush=True)
+        )
+        jobs = farm.run(
+            [(prefix, (args, pdf_path, prefix, True)) for prefix, pdf_path in zip(prefixes, args.pdfs)],
+            stop_on_error=args.stop_on_error
+        )
+        for job in jobs:
+            if job.succeeded:
+                print(f"{job.name}: Video oluşturuldu -> {job.value}", flush=True)
+            else:
+                print(f"{job.name}: Hata: {job.error}", file=sys.stderr, flush=True)
+            results.append((job.args[1], job.value, job.error))
+    else:
+        for prefix, pdf_path in zip(prefixes, args.pdfs):
+            try:
+                video_path = render_pdf(args, pdf_path, prefix, args.scratch_dir)
+                print(f"{prefix}: Video oluşturuldu -> {video_path}", flush=True)
+                results.append((pdf_path, video_path, None))
+            except Exception as e:
+                print(f"{prefix}: Hata: {str(e)}", file=sys.stderr, flush=True)
+                results.append((pdf_path, None, e))
+                if args.stop_on_error:
+                    break
+
+    failed = [r for r in results if r[2] is not None]
+    print(f"Tamamlanan: {len(results) - len(failed)}, Hatalı: {len(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
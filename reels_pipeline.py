@@ -0,0 +1,742 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import google.generativeai as genai
+
+from gemini_client import LLM_CACHE_TTL, GeminiClient, default_llm_cache
+from image_generation import DalleImageGenerator, default_image_cache
+from pdf_analysis import CHUNK_TOKENS, LONG_PDF_TOKENS, ChunkedAnalyzer, estimate_tokens
+from pdf_extract import PdfTextExtractor, default_pdf_text_cache
+from providers import ElevenLabsSpeechProvider, GeminiTextProvider, OpenAIImageProvider, ProviderError
+from rate_limiter import RateLimitedProvider
+from resilience import ResilientProvider, resilient_providers
+from script_schema import (IncrementalJSONParser, build_repair_prompt, build_repair_schema, build_script_schema,
+                           fold_key, gemini_schema, invalid_fields, parse_json_text, path_name, repair, set_path)
+from stage_graph import Stage, StageGraph
+from tts import ElevenLabsTTS, default_audio_cache
+from video_generator import DEFAULT_ENCODING_PROFILE, VideoGenerator, clean_title, default_segment_cache
+
+
+# Hazır anlatım tarzları
+style_texts = {
+    "çarpıcı": "çarpıcı sözlerle başlıkları anlat",
+    "detaylı": "konuyu detaylı bir şekilde anlat",
+    "öğretici": "öğrencilerin anlayabileceği şekilde anlat",
+    "eğlenceli": "eğlenceli bir şekilde anlat"
+}
+
+# Gemini'den beklenen metin formatı
+script_template = {
+    "reels_başlık": "Ana Başlık Buraya",
+    "içerik": {
+        "bölüm1": {
+            "text1_başlık": "Birinci Bölüm Başlığı",
+            "text1": "Birinci bölüm metni",
+            "image_prompt1": "Birinci görsel promptu"
+        },
+        "bölüm2": {
+            "text2_başlık": "İkinci Bölüm Başlığı",
+            "text2": "İkinci bölüm metni",
+            "image_prompt2": "İkinci görsel promptu"
+        },
+        "bölüm3": {
+            "text3_başlık": "Üçüncü Bölüm Başlığı",
+            "text3": "Üçüncü bölüm metni",
+            "image_prompt3": "Üçüncü görsel promptu"
+        },
+        "bölüm4": {
+            "text4_başlık": "Dördüncü Bölüm Başlığı",
+            "text4": "Dördüncü bölüm metni",
+            "image_prompt4": "Dördüncü görsel promptu"
+        }
+    }
+}
+
+# Proje klasörü altındaki alt klasörler
+project_subfolders = [
+    'pdf_analizi',
+    'prompt_ciktisi',
+    'gorseller',
+    'video_dosyalari',
+    'video_dosyalari/sesler',
+    'final_video'
+]
+
+SECTION_COUNT = 4
+SCRIPT_SCHEMA = build_script_schema(SECTION_COUNT)
+# Eksik alanlar için en fazla kaç kez yeniden sorulur
+MAX_REPAIR_ROUNDS = 2
+
+
+class PipelineError(Exception):
+    """Pipeline adımlarından birinde oluşan hata"""
+
+
+def build_analysis_prompt(pdf_content):
+    """PDF analizi için Gemini promptunu oluştur"""
+    return f"""
+            Aşağıdaki PDF içeriğini analiz et ve şu başlıklar altında özetle (detaya gir):
+
+            1. Ana Konular
+            2. Önemli Noktalar
+            3. Önerilen Konu Başlıkları (4 başlık öner)
+            4. Hedef Kitle Önerisi
+            5. İçerik Tonu Önerisi
+
+            PDF İçeriği:
+            {pdf_content}
+            """
+
+
+def build_script_prompt(pdf_analysis, style_text):
+    """Analiz sonuçları ve anlatım tarzından metin promptunu oluştur"""
+    return f"""
+            PDF Analiz Sonuçları:
+            {pdf_analysis}
+
+            Yukarıdaki analiz sonuçlarını kullanarak ve aşağıdaki anlatım tarzında bir metin oluştur:
+
+            Anlatım Tarzı:
+            {style_text}
+
+            Text formatı:
+            {json.dumps(script_template, indent=2, ensure_ascii=False)}
+            """
+
+
+def parse_script_json(response_text):
+    """Gemini çıktısını JSON'a çevir ve şemaya göre yerel olarak onar
+
+    (JSON, geçersiz alan yolları) döndürür; metin JSON olarak hiç
+    çözülemezse PipelineError fırlatır.
+    """
+    json_data = parse_json_text(response_text)
+    if not isinstance(json_data, dict):
+        raise PipelineError("Gemini çıktısı JSON formatında değil. Lütfen çıktıyı düzenleyip tekrar deneyin.")
+    json_data = repair(json_data, SCRIPT_SCHEMA)
+    return json_data, invalid_fields(json_data, SCRIPT_SCHEMA)
+
+
+def describe_fields(paths):
+    return "\n".join(f"- {path_name(path)}" for path in paths)
+
+
+def validate_script_json(response_text):
+    """Elle düzenlenmiş çıktıyı doğrula; eksik alanlar varsa hepsini birlikte bildir"""
+    json_data, invalid = parse_script_json(response_text)
+    if invalid:
+        raise PipelineError(f"JSON'da eksik veya boş alanlar var:\n{describe_fields(invalid)}")
+    return json_data
+
+
+def parse_section(path, text):
+    """Akışta kapanan nesne tam ve geçerli bir bölümse (numara, bölüm) döndür, değilse None"""
+    if len(path) != 2 or fold_key(path[0]) != "icerik":
+        return None
+    match = re.fullmatch(r"bolum(\d+)", fold_key(path[1]))
+    if not match or not 1 <= int(match.group(1)) <= SECTION_COUNT:
+        return None
+    index = int(match.group(1))
+    section_schema = SCRIPT_SCHEMA["properties"]["içerik"]["properties"][f"bölüm{index}"]
+    try:
+        section = repair(json.loads(text), section_schema)
+    except json.JSONDecodeError:
+        return None
+    if invalid_fields(section, section_schema):
+        return None
+    return index, section
+
+
+def extract_image_prompts(json_data):
+    """JSON içinden görsel promptlarını ayıkla"""
+    return [
+        json_data['içerik'][f'bölüm{i}'][f'image_prompt{i}']
+        for i in range(1, SECTION_COUNT + 1)
+    ]
+
+
+def build_video_data(json_data, images):
+    """VideoGenerator için başlık, görsel ve metin verisini hazırla"""
+    if not json_data.get('reels_başlık'):
+        raise PipelineError("Video başlığı bulunamadı")
+
+    return {
+        'title': json_data['reels_başlık'],
+        'images': list(images),
+        'texts': [
+            f"{json_data['içerik'][f'bölüm{i}'][f'text{i}_başlık']}: "
+            f"{json_data['içerik'][f'bölüm{i}'][f'text{i}']}"
+            for i in range(1, SECTION_COUNT + 1)
+        ]
+    }
+
+
+def image_path(project_folder, index):
+    return os.path.join(project_folder, "gorseller", f"image_{index}.png")
+
+
+def audio_path(project_folder, index):
+    """Başlık (0) ve bölüm seslerinin proje içindeki yolu; VideoGenerator aynı adları okur"""
+    name = "0_ana_baslik.mp3" if index == 0 else f"{index}_metin.mp3"
+    return os.path.join(project_folder, "video_dosyalari", "sesler", name)
+
+
+def wait_quietly(future):
+    """Future'ın bitmesini bekle, sonucu veya hatası önemsiz"""
+    try:
+        future.result()
+    except Exception:
+        pass
+
+
+class ReelsPipeline:
+    """PDF -> analiz -> metin JSON -> görseller -> ses -> video akışı
+
+    Arayüzden bağımsızdır; Tk sihirbazı ve komut satırı aynı motoru kullanır.
+    İlerleme mesajları `progress` fonksiyonuna gönderilir.
+    """
+
+    def __init__(self, genai_api_key=None, elevenlabs_api_key=None, openai_api_key=None,
+                 projects_dir="projects", render_mode="segments", tts_concurrency=2,
+                 tts_requests_per_second=2.0, image_concurrency=4, audio_cache=None, image_cache=None,
+                 llm_cache=None, llm_cache_ttl=LLM_CACHE_TTL, pdf_text_cache=None, analysis_mode="auto",
+                 chunk_tokens=CHUNK_TOKENS, segment_cache=None, encoding_profile=DEFAULT_ENCODING_PROFILE,
+                 render_workers=None, scratch_dir=None, providers=None, resilience=None, structured_output=True,
+                 streaming=True, progress=None):
+        if genai_api_key:
+            genai.configure(api_key=genai_api_key)
+        self.elevenlabs_api_key = elevenlabs_api_key
+        # providers: {"text", "speech", "image"} servisleri; eksik olanlar gerçek API'yi kullanır
+        providers = dict(providers or {})
+        providers.setdefault("text", GeminiTextProvider())
+        providers.setdefault("speech", ElevenLabsSpeechProvider(elevenlabs_api_key, tts_concurrency))
+        providers.setdefault("image", OpenAIImageProvider(openai_api_key, image_concurrency))
+        # Eleven Labs plan limitleri her denemeye (tekrar ve hedge dahil) uygulanır; bu yüzden
+        # sınırlayıcı dayanıklılık katmanının altındadır. Hazır sarılmış servisin sınırı çağırana aittir.
+        if not isinstance(providers["speech"], (RateLimitedProvider, ResilientProvider)):
+            providers["speech"] = RateLimitedProvider(providers["speech"], tts_requests_per_second, tts_concurrency)
+        # resilience: None varsayılan politikalar, {tür: ResiliencePolicy} özel ayarlar, False kapalı
+        if resilience is not False:
+            providers = resilient_providers(providers, resilience)
+        self.providers = providers
+        if llm_cache is None:
+            llm_cache = default_llm_cache()
+        self.gemini = GeminiClient(cache=llm_cache or None, ttl=llm_cache_ttl, provider=self.providers["text"])
+        self.analysis_mode = analysis_mode
+        # Metin çıktısı Gemini'den şemaya uyan JSON olarak istenir
+        self.structured_output = structured_output
+        # run() metin akışında tamamlanan bölümlerin görsellerini metnin kalanını beklemeden başlatır
+        self.streaming = streaming
+        self.chunked_analyzer = ChunkedAnalyzer(self.gemini, chunk_tokens)
+        if pdf_text_cache is None:
+            pdf_text_cache = default_pdf_text_cache()
+        self.pdf_extractor = PdfTextExtractor(cache=pdf_text_cache or None)
+        # audio_cache: None varsayılan önbellek, False önbelleksiz, DiskCache özel önbellek
+        if audio_cache is None:
+            audio_cache = default_audio_cache()
+        self.tts = ElevenLabsTTS(
+            elevenlabs_api_key,
+            max_concurrency=tts_concurrency,
+            cache=audio_cache or None,
+            provider=self.providers["speech"]
+        )
+        self.openai_api_key = openai_api_key
+        if image_cache is None:
+            image_cache = default_image_cache()
+        self.image_generator = DalleImageGenerator(
+            openai_api_key,
+            max_concurrency=image_concurrency,
+            cache=image_cache or None,
+            provider=self.providers["image"]
+        )
+        self.projects_dir = projects_dir
+        self.render_mode = render_mode
+        if segment_cache is None:
+            segment_cache = default_segment_cache()
+        self.segment_cache = segment_cache or None
+        self.encoding_profile = encoding_profile
+        # Segmentler varsayılan olarak tüm çekirdeklerde paralel kodlanır
+        self.render_workers = render_workers or os.cpu_count() or 1
+        # Render ara dosyaları için kök dizin; verilmezse projenin video klasörü
+        self.scratch_dir = scratch_dir
+        self.progress = progress or (lambda message: None)
+        # Son run()'ın aşama grafı; aşama durumları ve süreleri için
+        self.last_graph = None
+
+    def report(self, message, progress=None):
+        (progress or self.progress)(message)
+
+    def create_project_folder(self, pdf_content):
+        """PDF içeriğinden proje klasörü oluştur"""
+        # İlk sayfanın ilk birkaç satırını başlık olarak kullan
+        title_lines = pdf_content.split('\n')[:3]  # İlk 3 satır
+        project_title = ' '.join(line.strip() for line in title_lines if line.strip())[:100]
+
+        # Başlığı klasör adına uygun hale getir, tarih ekle (benzersiz olması için)
+        folder_name = clean_title(project_title, fallback="proje")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(self.projects_dir, exist_ok=True)
+
+        # Aynı saniyede aynı PDF için açılan işler ayrı klasör alır
+        suffix = 1
+        while True:
+            name = f"{folder_name}_{timestamp}" + (f"_{suffix}" if suffix > 1 else "")
+            full_project_path = os.path.join(self.projects_dir, name)
+            try:
+                os.mkdir(full_project_path)
+                break
+            except FileExistsError:
+                suffix += 1
+
+        for folder in project_subfolders:
+            os.makedirs(os.path.join(full_project_path, folder), exist_ok=True)
+
+        return full_project_path
+
+    def extract_pdf_text(self, pdf_path, progress=None, on_page=None):
+        """PDF içeriğini oku ve metin kontrolü yap
+
+        Sayfalar paralel okunur; `on_page(sayfa no, metin, toplam)` her sayfa
+        bittiğinde çağrılır. Aynı PDF daha önce okunduysa metin önbellekten gelir.
+        """
+        read_pages = []
+
+        def page_done(index, page_text, total):
+            read_pages.append(index)
+            if len(read_pages) == total or len(read_pages) % 10 == 0:
+                self.report(f"{len(read_pages)}/{total} sayfa okundu", progress)
+            if on_page:
+                on_page(index, page_text, total)
+
+        text = self.pdf_extractor.extract(pdf_path, page_done)
+
+        if not text.strip() or len(text.strip()) < 50:
+            raise PipelineError(
+                "PDF dosyası yeterli metin içermiyor veya sadece görsel içeriyor.\n"
+                "Lütfen metin içeren başka bir PDF dosyası seçin."
+            )
+        return text
+
+    def gemini_cache_dir(self, project_folder, artifact_folder):
+        if project_folder:
+            return os.path.join(project_folder, artifact_folder, 'gemini_cache')
+        return None
+
+    def save_pdf_text(self, text, project_folder):
+        """Çıkarılan PDF metnini proje klasörüne kaydet"""
+        if project_folder:
+            text_path = os.path.join(project_folder, 'pdf_analizi', 'pdf_metni.txt')
+            with open(text_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+
+    def use_chunked_analysis(self, pdf_content):
+        if self.analysis_mode == "auto":
+            return estimate_tokens(pdf_content) > LONG_PDF_TOKENS
+        return self.analysis_mode == "chunked"
+
+    def analyze_pdf(self, pdf_content, project_folder=None, use_cache=True, progress=None, on_chunk=None):
+        """PDF'yi Gemini API ile analiz et ve özet çıkar
+
+        Uzun PDF'ler (veya analysis_mode="chunked") parçalara bölünüp
+        map-reduce ile özetlenir; sonuç aynı beş başlıklı analizdir.
+        use_cache=False önbellekteki analizi yok sayıp Gemini'ye yeniden sorar.
+        on_chunk verilirse analiz metni geldikçe parça parça iletilir.
+        """
+        if not pdf_content or not pdf_content.strip():
+            raise PipelineError("PDF içeriği bulunamadı!")
+
+        cache_dir = self.gemini_cache_dir(project_folder, 'pdf_analizi')
+        if self.use_chunked_analysis(pdf_content):
+            try:
+                analysis, _ = self.chunked_analyzer.analyze(
+                    pdf_content,
+                    use_cache=use_cache,
+                    cache_dir=cache_dir,
+                    report=lambda message: self.report(message, progress),
+                    on_chunk=on_chunk
+                )
+            except ProviderError as e:
+                raise PipelineError(f"PDF analizi yapılamadı: {e}") from e
+        else:
+            analysis, cached = self.generate_text(
+                build_analysis_prompt(pdf_content), use_cache, cache_dir, on_chunk=on_chunk)
+            if cached:
+                self.report("PDF analizi önbellekten alındı", progress)
+
+        if project_folder:
+            analysis_path = os.path.join(project_folder, 'pdf_analizi', 'analiz_sonuclari.txt')
+            with open(analysis_path, 'w', encoding='utf-8') as f:
+                f.write(analysis)
+
+        return analysis
+
+    def save_script(self, json_data, project_folder):
+        """Metin JSON'ını proje klasörüne kaydet"""
+        if project_folder:
+            output_path = os.path.join(project_folder, "prompt_ciktisi", "output.json")
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(json_data, f, ensure_ascii=False, indent=2)
+
+    def load_script(self, project_folder):
+        """Kaydedilmiş metin JSON'ını oku"""
+        output_path = os.path.join(project_folder, "prompt_ciktisi", "output.json")
+        if not os.path.exists(output_path):
+            raise PipelineError("Output JSON dosyası bulunamadı")
+        with open(output_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def generate_text(self, prompt, use_cache=True, cache_dir=None, response_schema=None, on_chunk=None):
+        """Gemini yanıtını ve önbellekten gelip gelmediğini döndür"""
+        try:
+            return self.gemini.generate(prompt, use_cache=use_cache, cache_dir=cache_dir,
+                                        response_schema=response_schema, on_chunk=on_chunk)
+        except ProviderError as e:
+            raise PipelineError(f"Gemini yanıtı alınamadı: {e}") from e
+
+    def generate_script(self, prompt, project_folder=None, use_cache=True, on_chunk=None, on_section=None):
+        """Prompt'u Gemini'ye gönder, çıktıyı şemaya uygun JSON olarak döndür
+
+        structured_output açıkken Gemini şemaya uyan JSON üretmeye zorlanır.
+        Geçersiz alanlar önce yerel olarak onarılır; kalanlar için tüm metin
+        değil yalnızca o alanlar yeniden istenir. (JSON, biçimlenmiş metin) döner.
+
+        on_chunk ham yanıtı geldikçe alır. on_section(numara, bölüm) bir bölüm
+        akışta eksiksiz tamamlandığı anda, yanıtın kalanı beklenmeden çağrılır;
+        son JSON'daki bölüm onarım sonrası farklı olabilir.
+        """
+        cache_dir = self.gemini_cache_dir(project_folder, 'prompt_ciktisi')
+        schema = gemini_schema(SCRIPT_SCHEMA) if self.structured_output else None
+        stream = None
+        if on_chunk is not None or on_section is not None:
+            emitted = set()
+
+            def on_object(path, object_text):
+                parsed = parse_section(path, object_text)
+                if parsed and parsed[0] not in emitted:
+                    emitted.add(parsed[0])
+                    on_section(*parsed)
+
+            parser = IncrementalJSONParser(on_object) if on_section is not None else None
+
+            def forward(chunk):
+                if parser is not None:
+                    parser.feed(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk)
+
+            stream = forward
+
+        text, cached = self.generate_text(prompt, use_cache, cache_dir, schema, stream)
+        try:
+            json_data, invalid = parse_script_json(text)
+        except PipelineError:
+            if not cached:
+                raise
+            # Önbellekteki yanıt bozuksa bir kez yeniden sor
+            if stream is not None and parser is not None:
+                parser = IncrementalJSONParser(on_object)
+            text, cached = self.generate_text(prompt, False, cache_dir, schema, stream)
+            json_data, invalid = parse_script_json(text)
+        if cached:
+            self.report("Metin çıktısı önbellekten alındı")
+        if invalid:
+            json_data = self.repair_script(json_data, invalid, use_cache, cache_dir)
+
+        self.save_script(json_data, project_folder)
+        return json_data, json.dumps(json_data, indent=2, ensure_ascii=False)
+
+    def repair_script(self, json_data, invalid, use_cache=True, cache_dir=None):
+        """Yalnızca eksik/geçersiz alanları Gemini'ye sorup JSON'a yerleştir"""
+        for _ in range(MAX_REPAIR_ROUNDS):
+            self.report(f"{len(invalid)} alan eksik veya geçersiz, yalnızca bu alanlar yeniden isteniyor")
+            text, _ = self.generate_text(
+                build_repair_prompt(json_data, invalid), use_cache, cache_dir, build_repair_schema(invalid))
+            fixes = parse_json_text(text)
+            if isinstance(fixes, dict):
+                for path in invalid:
+                    if path_name(path) in fixes:
+                        set_path(json_data, path, fixes[path_name(path)])
+            json_data = repair(json_data, SCRIPT_SCHEMA)
+            invalid = invalid_fields(json_data, SCRIPT_SCHEMA)
+            if not invalid:
+                return json_data
+        raise PipelineError(f"Gemini çıktısında şu alanlar tamamlanamadı:\n{describe_fields(invalid)}")
+
+    def generate_image(self, prompt, image_path, use_cache=True):
+        """DALL-E ile tek görsel oluştur, (yol, önbellekten mi) döndür"""
+        path, reused = self.image_generator.generate_image(prompt, image_path, use_cache=use_cache)
+        if reused:
+            self.report(f"{os.path.basename(path)} önbellekten kullanıldı")
+        return path, reused
+
+    def generate_images(self, image_prompts, output_dir, progress=None,
+                        cancel_event=None, on_wait=None, on_image=None, use_cache=True):
+        """Tüm görsel promptları için görselleri output_dir'e eşzamanlı oluştur
+
+        `on_image(index, path, reused)` her görsel tamamlandığında çağrılır.
+        use_cache=False önbellekte olan promptlar için de yeni görsel üretir.
+        """
+        items = [
+            (prompt, os.path.join(output_dir, f"image_{i}.png"))
+            for i, prompt in enumerate(image_prompts, 1)
+        ]
+        completed = []
+
+        def on_complete(index, path, reused):
+            completed.append(index)
+            source = " (önbellekten)" if reused else ""
+            self.report(f"{len(completed)}/{len(items)} görsel hazır: {os.path.basename(path)}{source}", progress)
+            if on_image:
+                on_image(index, path, reused)
+
+        self.report(f"{len(items)} görsel oluşturuluyor...", progress)
+        return self.image_generator.generate_images(items, on_complete, cancel_event, on_wait, use_cache)
+
+    def build_stage_graph(self, use_cache=True, use_image_cache=True, encoding_profile=None, on_stage=None):
+        """PDF'den videoya kadar akışı bağımlılık grafı olarak kur
+
+        Girdiler `pdf_path` ve `style_text`, son çıktı `video`. Görseller ve
+        sesler yalnızca metne bağlıdır ve eşzamanlı üretilir; her sahnenin
+        segmenti yalnızca kendi görseli, metni ve sesiyle kodlanır. Aynı graf
+        tekrar çalıştırıldığında yalnızca değişen girdinin sonrasındaki
+        aşamalar çalışır. streaming açıksa bir bölümün görseli metin akışında
+        o bölüm tamamlanınca başlar.
+        """
+        encoding_profile = encoding_profile or self.encoding_profile
+        # En fazla render_workers segment aşaması aynı anda kodlar; çekirdekler aralarında bölüştürülür
+        segment_threads = max(1, (os.cpu_count() or 1) // self.render_workers)
+        # Akışta erken başlatılan görseller: {bölüm: (prompt, future)}
+        early_images = {}
+        # Erken ve normal tüm görsel istekleri aynı eşzamanlılık sınırını paylaşır.
+        # Görsel aşamaları sınırı yalnızca kendi isteklerinde tutar; erken görseli
+        # beklerken tutsalardı, sıra bekleyen erken istekler hiç başlayamazdı.
+        image_slots = threading.BoundedSemaphore(self.image_generator.max_concurrency)
+
+        def create_image(prompt, path):
+            with image_slots:
+                return self.image_generator.generate_image(prompt, path, use_image_cache)
+
+        def pdf_stage(pdf_path):
+            self.report(f"PDF okunuyor: {pdf_path}")
+            return self.extract_pdf_text(pdf_path)
+
+        def project_stage(pdf_content):
+            project_folder = self.create_project_folder(pdf_content)
+            self.save_pdf_text(pdf_content, project_folder)
+            return project_folder
+
+        def analysis_stage(pdf_content, project_folder):
+            self.report("PDF analiz ediliyor...")
+            return self.analyze_pdf(pdf_content, project_folder, use_cache=use_cache)
+
+        def script_stage(analysis, style_text, project_folder):
+            self.report("Prompt işleniyor ve çıktı oluşturuluyor...")
+            executor = ThreadPoolExecutor(max_workers=self.image_generator.max_concurrency)
+
+            def on_section(index, section):
+                prompt = section[f"image_prompt{index}"]
+                self.report(f"{index}. bölüm hazır, görseli oluşturuluyor...")
+                early_images[index] = (prompt, executor.submit(
+                    create_image, prompt, image_path(project_folder, index)))
+
+            try:
+                json_data, _ = self.generate_script(
+                    build_script_prompt(analysis, style_text), project_folder, use_cache,
+                    on_section=on_section if self.streaming else None)
+            except BaseException:
+                # Başarısız çalıştırma için yeni görsel istenmez; sıradakiler iptal edilir
+                executor.shutdown(wait=True, cancel_futures=True)
+                early_images.clear()
+                raise
+            # Başlamış görseller arka planda tamamlanır; görsel aşamaları onları bekler
+            executor.shutdown(wait=False)
+            return json_data
+
+        def title_stage(script):
+            if not script.get('reels_başlık'):
+                raise PipelineError("Video başlığı bulunamadı")
+            return str(script['reels_başlık'])
+
+        def section_stage(index):
+            def run(script):
+                section = script['içerik'][f'bölüm{index}']
+                return {
+                    f"text_{index}": f"{section[f'text{index}_başlık']}: {section[f'text{index}']}",
+                    f"image_prompt_{index}": section[f'image_prompt{index}']
+                }
+            return run
+
+        def image_stage(index):
+            def run(image_prompt, project_folder):
+                early = early_images.pop(index, None)
+                try:
+                    if early is not None and early[0] == image_prompt:
+                        path, reused = early[1].result()
+                    else:
+                        if early is not None:
+                            # Aynı dosyaya iki istek birden yazmasın
+                            wait_quietly(early[1])
+                        path, reused = create_image(image_prompt, image_path(project_folder, index))
+                except ProviderError as e:
+                    raise PipelineError(f"Görsel oluşturulamadı: {e}") from e
+                source = " (önbellekten)" if reused else ""
+                self.report(f"Görsel hazır: {os.path.basename(path)}{source}")
+                return path
+            return run
+
+        def audio_stage(index):
+            def run(text, project_folder):
+                path = audio_path(project_folder, index)
+                try:
+                    self.create_audio_file(text, path)
+                except ProviderError as e:
+                    raise PipelineError(f"Ses dosyası oluşturulamadı: {e}") from e
+                return path
+            return run
+
+        def segment_stage(index):
+            def run(image, text, audio, project_folder):
+                # Segmentler yalnızca önbelleğe kodlanır; video aşaması bunları birleştirir
+                if self.render_mode != "segments" or self.segment_cache is None:
+                    return None
+                video_dir = os.path.join(project_folder, "video_dosyalari")
+                work_dir = tempfile.mkdtemp(prefix="segment_", dir=self.scratch_dir or video_dir)
+                try:
+                    video_gen = VideoGenerator(video_dir, None, "segments", self.segment_cache, encoding_profile)
+                    spec = (image, text, index == 0, int(video_gen.get_audio_duration(audio) * video_gen.fps))
+                    video_gen.precompute_segment(index, spec, work_dir, segment_threads)
+                    return video_gen.segment_key(*spec)
+                finally:
+                    shutil.rmtree(work_dir, ignore_errors=True)
+            return run
+
+        def video_stage(script, project_folder, *artifacts):
+            images = list(artifacts[:SECTION_COUNT])
+            return self.write_video(project_folder, build_video_data(script, images), encoding_profile=encoding_profile)
+
+        stages = [
+            Stage("pdf_metni", pdf_stage, ["pdf_path"], ["pdf_content"]),
+            Stage("proje", project_stage, ["pdf_content"], ["project_folder"]),
+            Stage("analiz", analysis_stage, ["pdf_content", "project_folder"], ["analysis"]),
+            Stage("metin", script_stage, ["analysis", "style_text", "project_folder"], ["script"]),
+            Stage("baslik", title_stage, ["script"], ["title"], cutoff=True),
+            Stage("ses_0", audio_stage(0), ["title", "project_folder"], ["audio_0"], resource="speech"),
+            Stage("segment_0", segment_stage(0), ["image_1", "title", "audio_0", "project_folder"], ["segment_0"],
+                  resource="render")
+        ]
+        for i in range(1, SECTION_COUNT + 1):
+            stages += [
+                Stage(f"bolum_{i}", section_stage(i), ["script"], [f"text_{i}", f"image_prompt_{i}"], cutoff=True),
+                Stage(f"gorsel_{i}", image_stage(i), [f"image_prompt_{i}", "project_folder"], [f"image_{i}"]),
+                Stage(f"ses_{i}", audio_stage(i), [f"text_{i}", "project_folder"], [f"audio_{i}"],
+                      resource="speech"),
+                Stage(f"segment_{i}", segment_stage(i), [f"image_{i}", f"text_{i}", f"audio_{i}", "project_folder"],
+                      [f"segment_{i}"], resource="render")
+            ]
+        # Görseller başta; sesler ve segmentler yalnızca hazır olmaları için beklenir
+        artifacts = [f"image_{i}" for i in range(1, SECTION_COUNT + 1)]
+        artifacts += [f"{kind}_{i}" for kind in ("audio", "segment") for i in range(SECTION_COUNT + 1)]
+        stages.append(Stage("video", video_stage, ["script", "project_folder"] + artifacts, ["video"]))
+
+        return StageGraph(
+            stages,
+            max_workers=8,
+            limits={
+                "speech": self.tts.max_concurrency,
+                "render": self.render_workers
+            },
+            on_stage=on_stage
+        )
+
+    def create_audio_file(self, text, filename):
+        """Eleven Labs API ile ses dosyası oluştur"""
+        return self.tts.create_audio_file(text, filename)
+
+    def synthesize_audio(self, video_data, video_dir, progress=None):
+        """Başlık ve bölüm metinlerini eşzamanlı olarak sese çevir"""
+        ses_klasoru = os.path.join(video_dir, "sesler")
+        items = [(video_data['title'], os.path.join(ses_klasoru, "0_ana_baslik.mp3"))]
+        items += [
+            (text, os.path.join(ses_klasoru, f"{i}_metin.mp3"))
+            for i, text in enumerate(video_data['texts'], 1)
+        ]
+
+        completed = []
+
+        def on_complete(index, ok):
+            completed.append(index)
+            self.report(f"{len(completed)}/{len(items)} ses dosyası oluşturuldu", progress)
+
+        cache = self.tts.cache
+        hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+
+        self.report(f"{len(items)} ses dosyası oluşturuluyor...", progress)
+        try:
+            self.tts.create_audio_files(items, on_complete)
+        except ProviderError as e:
+            raise PipelineError(f"Ses dosyası oluşturulamadı: {e}") from e
+
+        if cache is not None:
+            self.report(
+                f"Ses önbelleği: {cache.hits - hits} isabet, {cache.misses - misses} ıska", progress)
+
+    def render_video(self, project_folder, json_data, images, progress=None, encoding_profile=None):
+        """Sesleri oluştur ve videoyu doğrudan final_video klasörüne render et
+
+        encoding_profile verilmezse pipeline'ın varsayılan profili kullanılır.
+        """
+        video_data = build_video_data(json_data, images)
+
+        video_dosyalari = os.path.join(project_folder, "video_dosyalari")
+        os.makedirs(video_dosyalari, exist_ok=True)
+        self.synthesize_audio(video_data, video_dosyalari, progress)
+        return self.write_video(project_folder, video_data, progress, encoding_profile)
+
+    def write_video(self, project_folder, video_data, progress=None, encoding_profile=None):
+        """Sesleri hazır olan videoyu final_video klasörüne render et"""
+        video_dosyalari = os.path.join(project_folder, "video_dosyalari")
+        self.report("Video oluşturuluyor...", progress)
+        final_video_path = os.path.join(
+            project_folder, "final_video", f"{clean_title(video_data['title'])}.mp4")
+        video_gen = VideoGenerator(
+            video_dosyalari,
+            video_data,
+            self.render_mode,
+            self.segment_cache,
+            encoding_profile or self.encoding_profile,
+            self.render_workers,
+            self.scratch_dir
+        )
+        video_path = video_gen.generate_video(final_video_path)
+        if not video_path or not os.path.exists(video_path):
+            raise PipelineError("Video dosyası oluşturulamadı")
+        if self.render_mode == "segments":
+            self.report(
+                f"Segmentler: {video_gen.segment_stats['encoded']} kodlandı, "
+                f"{video_gen.segment_stats['reused']} önbellekten", progress)
+        return video_path
+
+    def run(self, pdf_path, style="öğretici", custom_style=None, fresh_images=False, fresh_llm=False):
+        """Tek bir PDF için tüm akışı gözetimsiz çalıştır, final video yolunu döndür
+
+        Aşamalar `build_stage_graph` grafında bağımlılıklarına göre, bağımsız
+        dallar eşzamanlı çalışır. fresh_images=True görsel önbelleğini,
+        fresh_llm=True Gemini yanıt önbelleğini atlar.
+        """
+        if custom_style is None and style not in style_texts:
+            raise PipelineError(f"Bilinmeyen anlatım tarzı: {style}")
+        style_text = custom_style or style_texts[style]
+
+        graph = self.build_stage_graph(use_cache=not fresh_llm, use_image_cache=not fresh_images)
+        self.last_graph = graph
+        values = graph.run({"pdf_path": pdf_path, "style_text": style_text})
+        timings = [f"{item['stage']} {item['duration_s']:.1f} sn"
+                   for item in graph.summary() if item["duration_s"] is not None]
+        self.report("Aşama süreleri: " + ", ".join(timings))
+        return values["video"]
@@ -0,0 +1,282 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from disk_cache import DiskCache
+from video_generator import DEFAULT_ENCODING_PROFILE, VideoGenerator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Farklı uzunlukta altyazılar: satır kırma ve ölçüm maliyetini değiştirir
+CAPTIONS = {
+    "kisa": "Fotosentez nedir?",
+    "orta": "Bitkiler güneş ışığını kullanarak karbondioksit ve sudan şeker üretir, "
+            "bu sırada oksijen açığa çıkar.",
+    "uzun": "Fotosentez iki aşamada gerçekleşir: ışığa bağımlı tepkimelerde klorofil güneş "
+            "enerjisini yakalayarak ATP ve NADPH üretir; Calvin döngüsünde ise bu enerji "
+            "karbondioksiti glikoza dönüştürmek için kullanılır. Çiçekli bitkiler, algler ve "
+            "bazı bakteriler bu süreci yürütür; yeryüzündeki yaşamın büyük kısmı buna bağlıdır."
+}
+RESOLUTIONS = {
+    "720p": (720, 1280),
+    "1080p": (1080, 1920)
+}
+TITLE = "Türkçe Başlık Örneği: Işık, Şeker ve Oksijen"
+
+
+def make_image(path, width, height, seed):
+    """Gürültülü renk geçişi; tek renkli görsellerden daha gerçekçi kodlanır"""
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    base = np.broadcast_to(gradient, (height, width, 3)) * rng.uniform(0.3, 1.0, 3)
+    noise = rng.normal(0, 12, (height, width, 3))
+    image = np.clip(base + noise, 0, 255).astype(np.uint8)
+    if not cv2.imwrite(path, image):
+        raise Exception(f"Görsel yazılamadı: {path}")
+
+
+def make_silent_mp3(path, seconds):
+    subprocess.run([
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', 'anullsrc=r=44100:cl=mono',
+        '-t', str(seconds), '-c:a', 'libmp3lame', path
+    ], check=True)
+
+
+def make_assets(work_dir, sections, seconds, caption="orta", image_size=1024):
+    """Sentetik görseller ve sessiz MP3'lerle VideoGenerator verisi hazırla"""
+    ses_klasoru = os.path.join(work_dir, "sesler")
+    os.makedirs(ses_klasoru, exist_ok=True)
+
+    images = []
+    for i in range(sections):
+        image_path = os.path.join(work_dir, f"image_{i + 1}.png")
+        make_image(image_path, image_size, image_size, seed=i)
+        images.append(image_path)
+
+    make_silent_mp3(os.path.join(ses_klasoru, "0_ana_baslik.mp3"), seconds)
+    for i in range(1, sections + 1):
+        make_silent_mp3(os.path.join(ses_klasoru, f"{i}_metin.mp3"), seconds)
+
+    return {
+        'title': TITLE,
+        'images': images,
+        'texts': [f"Bölüm {i + 1}: {CAPTIONS[caption]}" for i in range(sections)]
+    }
+
+
+def peak_rss_mb():
+    """Bu sürecin en yüksek bellek kullanımı; ffmpeg alt süreçleri dahil değildir
+
+    Linux'ta ru_maxrss, exec'ten sonra da süreci başlatan ana sürecin tepe
+    değerini taşır; bu yüzden varsa yalnızca bu sürecin VmHWM değeri okunur.
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS byte döndürür
+    return round(usage / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def build_cases(suite):
+    """Çalıştırılacak ölçümlerin listesi"""
+    cases = []
+    resolutions = ["1080p"] if suite == "quick" else list(RESOLUTIONS)
+    for resolution in resolutions:
+        for caption in CAPTIONS:
+            cases.append({"name": f"text/{caption}/{resolution}", "kind": "text",
+                          "caption": caption, "resolution": resolution})
+        cases.append({"name": f"overlay/{resolution}", "kind": "overlay", "resolution": resolution})
+        cases.append({"name": f"title_overlay/{resolution}", "kind": "title_overlay",
+                      "resolution": resolution})
+        cases.append({"name": f"title_sequence/{resolution}", "kind": "title_sequence",
+                      "resolution": resolution})
+
+    if suite == "quick":
+        video_params = [("segments", DEFAULT_ENCODING_PROFILE, 4, "1080p"),
+                        ("scenes", DEFAULT_ENCODING_PROFILE, 4, "1080p")]
+    else:
+        video_params = [(mode, DEFAULT_ENCODING_PROFILE, 4, "1080p")
+                        for mode in ("segments", "scenes", "stream", "frames")]
+        video_params += [("segments", profile, 4, "1080p") for profile in ("draft", "archive")]
+        video_params += [("segments", DEFAULT_ENCODING_PROFILE, sections, "1080p") for sections in (2, 8)]
+        video_params += [("segments", DEFAULT_ENCODING_PROFILE, 4, "720p")]
+
+    for mode, profile, sections, resolution in video_params:
+        cases.append({"name": f"video/{mode}/{profile}/{sections}b/{resolution}", "kind": "video",
+                      "mode": mode, "profile": profile, "sections": sections, "resolution": resolution})
+    cases.append({"name": f"video/segments-warm/{DEFAULT_ENCODING_PROFILE}/4b/1080p", "kind": "video",
+                  "mode": "segments", "profile": DEFAULT_ENCODING_PROFILE, "sections": 4,
+                  "resolution": "1080p", "warm": True})
+    return cases
+
+
+def run_case(case, work_dir, data, seconds, iterations, render_workers):
+    """Tek ölçümü çalıştır ve metriklerini döndür (ayrı süreçte çağrılır)
+
+    Girdiler ana süreçte hazırlanır; bellek tepe değeri yalnızca ölçülen işi içerir.
+    """
+    video_gen = VideoGenerator(
+        work_dir, data, case.get("mode", "segments"),
+        encoding_profile=case.get("profile", DEFAULT_ENCODING_PROFILE),
+        render_workers=render_workers
+    )
+    video_gen.width, video_gen.height = RESOLUTIONS[case["resolution"]]
+    frame = cv2.resize(cv2.imread(data['images'][0]), (video_gen.width, video_gen.height))
+
+    output_bytes = None
+    kind = case["kind"]
+    start = time.perf_counter()
+    if kind == "text":
+        first = None
+        for _ in range(iterations):
+            video_gen.add_text_to_frame(frame, CAPTIONS[case["caption"]], video_gen.height - 230, 40)
+            first = first or time.perf_counter() - start
+        frames = iterations
+    elif kind == "overlay":
+        for _ in range(iterations):
+            video_gen.add_text_overlay(frame, data['texts'][0], video_gen.height - 250)
+        frames = iterations
+    elif kind == "title_overlay":
+        for _ in range(iterations):
+            video_gen.create_title_overlay(frame, TITLE)
+        frames = iterations
+    elif kind == "title_sequence":
+        frames = sum(1 for _ in video_gen.create_title_sequence(TITLE, seconds))
+    else:
+        if case.get("warm"):
+            # Önbellek doldurulur, yalnızca ikinci render ölçülür
+            video_gen.segment_cache = DiskCache(os.path.join(work_dir, "segment_cache"), suffix=".mp4")
+            video_gen.generate_video(os.path.join(work_dir, "isinma.mp4"))
+            start = time.perf_counter()
+        output_path = video_gen.generate_video(os.path.join(work_dir, "benchmark.mp4"))
+        frames = sum(spec[3] for spec in video_gen.scene_specs())
+        output_bytes = os.path.getsize(output_path)
+    wall = time.perf_counter() - start
+
+    result = {
+        "name": case["name"],
+        "params": {key: value for key, value in case.items() if key not in ("name", "kind")},
+        "wall_s": round(wall, 4),
+        "frames": frames,
+        "fps": round(frames / wall, 1) if wall > 0 else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "output_bytes": output_bytes
+    }
+    if kind == "text":
+        result["first_call_s"] = round(first, 4)
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Önceki bir sonuç dosyasına göre süre farklarını yazdır"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {result["name"]: result for result in json.load(f)["results"]}
+    print(f"\n{'ölçüm':<45} {'önce (sn)':>10} {'şimdi (sn)':>10} {'fark':>8}", file=sys.stderr)
+    for result in results:
+        old = baseline.get(result["name"])
+        if not old or not old["wall_s"]:
+            continue
+        change = (result["wall_s"] - old["wall_s"]) / old["wall_s"] * 100
+        print(f"{result['name']:<45} {old['wall_s']:>10.3f} {result['wall_s']:>10.3f} {change:>+7.1f}%",
+              file=sys.stderr)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="VideoGenerator render performansını API anahtarı olmadan ölçer."
+    )
+    parser.add_argument("--suite", choices=("quick", "full"), default="quick",
+                        help="quick: temel ölçümler, full: tüm modlar, profiller, çözünürlükler ve bölüm sayıları")
+    parser.add_argument("--filter", help="Yalnızca adında bu metin geçen ölçümleri çalıştır")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Her sesin (sahnenin) süresi")
+    parser.add_argument("--iterations", type=int, default=50,
+                        help="Yazı/overlay ölçümlerinde çağrı sayısı")
+    parser.add_argument("--render-workers", type=int, default=1,
+                        help="segments modunda paralel kodlanacak bölüm sayısı")
+    parser.add_argument("--output", help="JSON sonuçların yazılacağı dosya (varsayılan: standart çıktı)")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki JSON sonuç dosyası")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = [case for case in build_cases(args.suite) if not args.filter or args.filter in case["name"]]
+
+    # Her ölçüm temiz bir süreçte çalışır; bellek tepe değerleri birbirine ve girdi hazırlığına karışmaz
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for case in cases:
+            work_dir = tempfile.mkdtemp(prefix="reels_bench_")
+            try:
+                data = make_assets(work_dir, case.get("sections", 4), args.seconds, case.get("caption", "orta"))
+                result = pool.apply(run_case, (case, work_dir, data, args.seconds, args.iterations,
+                                               args.render_workers))
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            results.append(result)
+            print(f"{result['name']:<45} {result['wall_s']:>8.3f} sn {result['fps'] or 0:>9.1f} fps "
+                  f"{result['peak_rss_mb'] or 0:>7.1f} MB", file=sys.stderr, flush=True)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "opencv": cv2.__version__,
+            "suite": args.suite,
+            "seconds": args.seconds,
+            "iterations": args.iterations,
+            "render_workers": args.render_workers
+        },
+        "results": results
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import traceback
+from multiprocessing.connection import wait
+
+from disk_cache import atomic_write_bytes
+
+
+class FarmJob:
+    """Render kuyruğundaki tek bir iş"""
+
+    def __init__(self, index, name, args):
+        self.index = index
+        self.name = name
+        self.args = args
+        self.attempts = 0
+        self.value = None
+        self.error = None
+        self.not_before = 0.0
+
+    @property
+    def succeeded(self):
+        return self.error is None and self.value is not None
+
+
+def farm_worker(target, args, scratch_dir, result_path):
+    """İşçi süreçte hedefi çalıştır ve sonucu JSON dosyasına yaz
+
+    Süreç çökerse sonuç dosyası oluşmaz; ana süreç bunu çıkış koduyla anlar.
+    """
+    try:
+        payload = {"ok": True, "value": target(*args, scratch_dir=scratch_dir)}
+    except Exception as e:
+        payload = {"ok": False, "error": str(e), "traceback": traceback.format_exc()}
+    atomic_write_bytes(result_path, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+
+class RenderFarm:
+    """İşleri ayrı süreçlerde çalıştıran yerel render kuyruğu
+
+    Her deneme kendi sürecinde ve kendi geçici klasöründe (`scratch_dir`)
+    çalışır; bir iş çökse veya hata verse diğerleri etkilenmez. Başarısız
+    işler `retries` kez, her seferinde artan beklemeyle yeniden denenir.
+    `target(*args, scratch_dir=...)` modül seviyesinde tanımlı olmalı ve
+    JSON'a çevrilebilir bir değer döndürmelidir.
+    """
+
+    def __init__(self, target, workers=2, retries=1, scratch_root=None, retry_delay=5.0,
+                 keep_failed_scratch=False, on_event=None):
+        self.target = target
+        self.workers = max(1, int(workers))
+        self.retries = max(0, int(retries))
+        self.scratch_root = scratch_root or os.path.join(tempfile.gettempdir(), "reels_farm")
+        self.retry_delay = retry_delay
+        self.keep_failed_scratch = keep_failed_scratch
+        self.on_event = on_event or (lambda message: None)
+        self.context = multiprocessing.get_context("spawn")
+
+    def start(self, job):
+        job.attempts += 1
+        os.makedirs(self.scratch_root, exist_ok=True)
+        scratch_dir = tempfile.mkdtemp(prefix=f"is{job.index}_deneme{job.attempts}_", dir=self.scratch_root)
+        result_path = os.path.join(scratch_dir, "sonuc.json")
+        process = self.context.Process(
+            target=farm_worker,
+            args=(self.target, job.args, scratch_dir, result_path),
+            name=f"render-{job.index}"
+        )
+        process.start()
+        self.on_event(f"{job.name}: deneme {job.attempts}/{self.retries + 1} başladı")
+        return process, scratch_dir, result_path
+
+    def collect(self, job, process, scratch_dir, result_path):
+        """Biten denemenin sonucunu oku; (başarılı mı, hata mesajı) döndür"""
+        process.join()
+        try:
+            with open(result_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            payload = {"ok": False, "error": f"İşçi süreç çöktü (çıkış kodu {process.exitcode})"}
+
+        if payload["ok"]:
+            job.value = payload["value"]
+            job.error = None
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+            return True
+        job.error = payload["error"]
+        if not self.keep_failed_scratch:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+        return False
+
+    def run(self, jobs, stop_on_error=False):
+        """(ad, argümanlar) listesindeki işleri çalıştır, FarmJob listesini girdi sırasıyla döndür"""
+        all_jobs = [FarmJob(index, name, tuple(args)) for index, (name, args) in enumerate(jobs, 1)]
+        queue = list(all_jobs)
+        running = {}
+        stopped = False
+
+        try:
+            while running or (queue and not stopped):
+                now = time.time()
+                while not stopped and len(running) < self.workers:
+                    ready = [job for job in queue if job.not_before <= now]
+                    if not ready:
+                        break
+                    job = ready[0]
+                    queue.remove(job)
+                    process, scratch_dir, result_path = self.start(job)
+                    running[process.sentinel] = (job, process, scratch_dir, result_path)
+
+                if not running:
+                    # Yalnızca yeniden denemeyi bekleyen işler var
+                    time.sleep(max(0.0, min(job.not_before for job in queue) - now))
+                    continue
+
+                for sentinel in wait(list(running), timeout=0.5):
+                    job, process, scratch_dir, result_path = running.pop(sentinel)
+                    if self.collect(job, process, scratch_dir, result_path):
+                        self.on_event(f"{job.name}: tamamlandı")
+                    elif job.attempts <= self.retries:
+                        delay = self.retry_delay * 2 ** (job.attempts - 1)
+                        job.not_before = time.time() + delay
+                        queue.append(job)
+                        self.on_event(f"{job.name}: hata ({job.error}), {delay:.0f} sn sonra yeniden denenecek")
+                    else:
+                        self.on_event(f"{job.name}: başarısız ({job.error})")
+                        stopped = stopped or stop_on_error
+        finally:
+            for job, process, scratch_dir, _ in running.values():
+                process.terminate()
+                process.join()
+                shutil.rmtree(scratch_dir, ignore_errors=True)
+
+        for job in queue:
+            job.error = job.error or "Çalıştırılmadı"
+        return all_jobs
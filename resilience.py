@@ -0,0 +1,315 @@
+import queue
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+import httpx
+import openai
+import requests
+
+from providers import ProviderError
+
+
+SERVICE_NAMES = {
+    "text": "Gemini",
+    "speech": "Eleven Labs",
+    "image": "DALL-E"
+}
+
+BREAKER_CLOSED = "kapalı"
+BREAKER_OPEN = "açık"
+BREAKER_HALF_OPEN = "yarı açık"
+
+
+class DeadlineExceeded(ProviderError):
+    """Çağrı, tekrar denemeler dahil kendisine ayrılan sürede tamamlanamadı"""
+
+    def __init__(self, message):
+        super().__init__(message, retryable=False)
+
+
+class CircuitOpenError(ProviderError):
+    """Servis art arda hata verdiği için çağrı hiç gönderilmedi"""
+
+    def __init__(self, message):
+        super().__init__(message, retryable=False)
+
+
+def is_retryable(error):
+    """Geçici hatalar (zaman aşımı, bağlantı, 408/429/5xx) tekrar denenir"""
+    if isinstance(error, ProviderError):
+        return error.retryable
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None and isinstance(getattr(error, "code", None), int):
+        # google.api_core hataları HTTP kodunu `code` olarak taşır
+        status = error.code
+    if status is not None:
+        return status in (408, 429) or status >= 500
+    return isinstance(error, (
+        requests.ConnectionError, requests.Timeout, httpx.TransportError,
+        openai.APIConnectionError, TimeoutError, ConnectionError
+    ))
+
+
+class ResiliencePolicy:
+    """Bir servis (aşama) için zaman, tekrar ve hedge ayarları
+
+    `deadline`: tekrar denemeler dahil bir çağrının toplam süresi (sn).
+    `attempts`: en fazla deneme sayısı; denemeler arasında `base_delay *
+    2^n` üst sınırlı (`max_delay`) tam rastgele (full jitter) beklenir.
+    `hedge_after`: bir deneme bu kadar sürede bitmezse aynı istek
+    `max_hedges` kez daha gönderilir, ilk başarılı yanıt kullanılır.
+    """
+
+    def __init__(self, deadline=120.0, attempts=3, base_delay=1.0, max_delay=20.0,
+                 hedge_after=None, max_hedges=1):
+        self.deadline = deadline
+        self.attempts = max(1, int(attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_after = hedge_after
+        self.max_hedges = max_hedges
+
+    def backoff(self, attempt, rng=random):
+        return rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+# Gemini uzun yanıt üretir ve görseller pahalıdır; hedge yalnızca kısa ses isteklerinde açık
+DEFAULT_POLICIES = {
+    "text": ResiliencePolicy(deadline=600.0, attempts=3, base_delay=2.0),
+    "speech": ResiliencePolicy(deadline=120.0, attempts=4, hedge_after=20.0),
+    "image": ResiliencePolicy(deadline=240.0, attempts=3, base_delay=2.0)
+}
+
+
+class CircuitBreaker:
+    """Art arda `failure_threshold` geçici hatadan sonra devreyi açar
+
+    Açık devrede çağrılar servise gitmeden CircuitOpenError ile reddedilir.
+    `reset_timeout` saniye sonra tek bir deneme isteğine izin verilir
+    (yarı açık); başarılı olursa devre kapanır, olmazsa yeniden açılır.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def before_call(self):
+        with self.lock:
+            if self.state == BREAKER_CLOSED:
+                return
+            if self.state == BREAKER_OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = BREAKER_HALF_OPEN
+                self.probing = False
+            if self.state == BREAKER_HALF_OPEN and not self.probing:
+                self.probing = True
+                return
+            raise CircuitOpenError(f"{self.name} geçici olarak devre dışı (art arda hatalar)")
+
+    def record_success(self):
+        with self.lock:
+            self.state = BREAKER_CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def release(self):
+        """Sonucu servisin sağlığı hakkında bilgi vermeyen çağrı; durum değişmez
+
+        Yarı açık devrede deneme hakkı serbest bırakılır, bir sonraki çağrı
+        yeniden deneme isteği olur.
+        """
+        with self.lock:
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == BREAKER_HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = BREAKER_OPEN
+                self.opened_at = time.monotonic()
+                self.probing = False
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(name, **options):
+    """Süreç içinde aynı servisi kullanan tüm pipeline'ların paylaştığı devre kesici"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **options)
+        return _breakers[name]
+
+
+class ResilientProvider:
+    """Bir servisi süre sınırı, tekrar deneme, hedge ve devre kesiciyle sarar
+
+    Her deneme ayrı bir daemon thread'de çalışır; süre dolduğunda çağıran
+    beklemeyi bırakır ve takılan istek kendi HTTP zaman aşımıyla sonlanır.
+    Son hata her zaman ProviderError olarak yükselir.
+    """
+
+    def __init__(self, inner, policy=None, breaker=None):
+        self.inner = inner
+        self.kind = inner.kind
+        self.policy = policy or DEFAULT_POLICIES.get(self.kind, ResiliencePolicy())
+        self.service = SERVICE_NAMES.get(self.kind, self.kind)
+        self.breaker = breaker or circuit_breaker(f"{self.service} ({type(inner).__name__})")
+        self.random = random.Random()
+        self.lock = threading.Lock()
+        self.stats = {"calls": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "deadline_exceeded": 0,
+                      "rejected": 0, "failures": 0}
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def start_attempt(self, request):
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(self.inner.call(request))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"{self.kind}-istek", daemon=True).start()
+        return future
+
+    def attempt(self, request, deadline):
+        """Tek deneme; gecikirse hedge kopyaları gönderilir, ilk başarılı yanıt döner"""
+        policy = self.policy
+        first = self.start_attempt(request)
+        pending = {first}
+        hedges = 0
+        error = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded(f"{self.service} isteği {policy.deadline:g} sn içinde tamamlanamadı")
+            can_hedge = policy.hedge_after is not None and hedges < policy.max_hedges
+            timeout = min(remaining, policy.hedge_after) if can_hedge else remaining
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is not first:
+                        self.count("hedge_wins")
+                    return future.result()
+                error = error or future.exception()
+            if not done and can_hedge:
+                hedges += 1
+                self.count("hedges")
+                pending.add(self.start_attempt(request))
+        raise error
+
+    def call(self, request):
+        deadline = time.monotonic() + self.policy.deadline
+        self.count("calls")
+        return self.with_retries(lambda: self.attempt(request, deadline), deadline)
+
+    def open_stream(self, request, deadline):
+        """Akışı ayrı thread'de başlat, ilk parçayı bekle; (ilk olay, kuyruk) döndür"""
+        events = queue.Queue()
+
+        def run():
+            try:
+                for chunk in self.inner.stream(request):
+                    events.put(("chunk", chunk))
+                events.put(("end", None))
+            except BaseException as e:
+                events.put(("error", e))
+
+        threading.Thread(target=run, name=f"{self.kind}-akis", daemon=True).start()
+        event = self.next_event(events, deadline)
+        if event[0] == "error":
+            raise event[1]
+        return event, events
+
+    def next_event(self, events, deadline):
+        try:
+            return events.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            raise DeadlineExceeded(
+                f"{self.service} isteği {self.policy.deadline:g} sn içinde tamamlanamadı") from None
+
+    def stream(self, request):
+        """Yanıtı parça parça üret
+
+        Yalnızca ilk parça gelmeden önceki hatalar tekrar denenir; akış
+        başladıktan sonraki hata ProviderError olarak yükselir. Süre sınırı
+        akışın tamamı için geçerlidir.
+        """
+        if not hasattr(self.inner, "stream"):
+            yield self.call(request)
+            return
+        deadline = time.monotonic() + self.policy.deadline
+        self.count("calls")
+        event, events = self.with_retries(lambda: self.open_stream(request, deadline), deadline)
+        while event[0] == "chunk":
+            yield event[1]
+            try:
+                event = self.next_event(events, deadline)
+            except DeadlineExceeded:
+                self.count("deadline_exceeded")
+                raise
+        if event[0] == "error":
+            self.breaker.record_failure()
+            self.count("failures")
+            raise ProviderError(f"{self.service} yanıt akışı yarıda kesildi: {event[1]}") from event[1]
+
+    def with_retries(self, attempt, deadline):
+        """`attempt()` fonksiyonunu devre kesici ve geri çekilmeli tekrarlarla çalıştır"""
+        policy = self.policy
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self.count("rejected")
+                raise
+            try:
+                result = attempt()
+            except DeadlineExceeded:
+                self.breaker.record_failure()
+                self.count("deadline_exceeded")
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    # İstek kaynaklı hatalar (ör. 400, 401) servisin ne çöktüğünü ne de
+                    # düzeldiğini gösterir; devre durumu değişmez
+                    self.breaker.release()
+                    self.count("failures")
+                    if isinstance(e, ProviderError):
+                        raise
+                    raise ProviderError(f"{self.service} hatası: {e}", retryable=False) from e
+                self.breaker.record_failure()
+                delay = policy.backoff(attempts, self.random)
+                if attempts >= policy.attempts or time.monotonic() + delay >= deadline:
+                    self.count("failures")
+                    raise ProviderError(f"{self.service} hatası ({attempts} deneme): {e}") from e
+                self.count("retries")
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+
+def resilient_providers(providers, policies=None):
+    """{tür: servis} sözlüğündeki her servisi ResilientProvider ile sar"""
+    policies = policies or {}
+    return {
+        kind: provider if isinstance(provider, ResilientProvider)
+        else ResilientProvider(provider, policies.get(kind))
+        for kind, provider in providers.items()
+    }
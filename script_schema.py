@@ -0,0 +1,210 @@
+import json
+import re
+
+
+# Gemini response_schema'nın desteklediği alanlar; diğerleri yalnızca yerel doğrulamada kullanılır
+GEMINI_SCHEMA_KEYS = ("type", "format", "description", "nullable", "enum", "properties", "required", "items")
+TURKISH_ASCII = str.maketrans("çğıöşüÇĞİÖŞÜ", "cgiosuCGIOSU")
+
+
+def section_fields(index):
+    return (f"text{index}_başlık", f"text{index}", f"image_prompt{index}")
+
+
+def build_script_schema(section_count):
+    """`reels_başlık` / `içerik` şablonunun JSON Schema karşılığı"""
+    text = {"type": "string", "minLength": 1}
+    sections = {
+        f"bölüm{i}": {
+            "type": "object",
+            "properties": {field: dict(text) for field in section_fields(i)},
+            "required": list(section_fields(i))
+        }
+        for i in range(1, section_count + 1)
+    }
+    return {
+        "type": "object",
+        "properties": {
+            "reels_başlık": dict(text),
+            "içerik": {"type": "object", "properties": sections, "required": list(sections)}
+        },
+        "required": ["reels_başlık", "içerik"]
+    }
+
+
+def gemini_schema(schema):
+    """Şemadan Gemini'nin kabul etmediği anahtarları (ör. minLength) çıkar"""
+    result = {key: value for key, value in schema.items() if key in GEMINI_SCHEMA_KEYS}
+    if "properties" in result:
+        result["properties"] = {name: gemini_schema(sub) for name, sub in result["properties"].items()}
+    if "items" in result:
+        result["items"] = gemini_schema(result["items"])
+    return result
+
+
+def fold_key(key):
+    """Büyük/küçük harf, Türkçe karakter ve ayraç farklarını yok say"""
+    return re.sub(r"[^a-z0-9]", "", str(key).translate(TURKISH_ASCII).lower())
+
+
+class IncrementalJSONParser:
+    """Akışla gelen JSON metninde tamamlanan nesneleri anında bildirir
+
+    `feed(parça)` ile beslenir; kapanan her nesne için `on_object(yol,
+    metin)` çağrılır (yol anahtar tuple'ı, ör. ("içerik", "bölüm1")).
+    Kod bloğu işaretleri gibi kök nesne dışındaki karakterler yok sayılır.
+    """
+
+    def __init__(self, on_object):
+        self.on_object = on_object
+        self.buffer = []
+        self.position = 0
+        self.stack = []
+        self.in_string = False
+        self.escaped = False
+        self.string_start = None
+        self.pending_key = None
+
+    def feed(self, chunk):
+        for char in chunk:
+            self.buffer.append(char)
+            self.consume(char)
+            self.position += 1
+
+    def consume(self, char):
+        if self.in_string:
+            if self.escaped:
+                self.escaped = False
+            elif char == "\\":
+                self.escaped = True
+            elif char == '"':
+                self.in_string = False
+                frame = self.stack[-1] if self.stack else None
+                if frame and frame["type"] == "object" and frame["expect_key"]:
+                    self.pending_key = json.loads("".join(self.buffer[self.string_start:self.position + 1]))
+                    frame["expect_key"] = False
+            return
+
+        if not self.stack and char not in "{[":
+            return
+        if char == '"':
+            self.in_string = True
+            self.string_start = self.position
+        elif char in "{[":
+            parent = self.stack[-1] if self.stack else None
+            if parent is None:
+                path = ()
+            elif parent["type"] == "object":
+                path = parent["path"] + (self.pending_key,)
+            else:
+                path = parent["path"] + (parent["index"],)
+            self.stack.append({"type": "object" if char == "{" else "array", "path": path,
+                               "start": self.position, "expect_key": char == "{", "index": 0})
+        elif char in "}]":
+            frame = self.stack.pop()
+            if frame["type"] == "object":
+                self.on_object(frame["path"], "".join(self.buffer[frame["start"]:self.position + 1]))
+        elif char == ",":
+            frame = self.stack[-1]
+            if frame["type"] == "object":
+                frame["expect_key"] = True
+            else:
+                frame["index"] += 1
+
+
+def parse_json_text(text):
+    """Kod bloğu işaretlerini ve JSON dışındaki metni temizleyip çöz; olmazsa None"""
+    text = text.replace("```json", "").replace("```", "").strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        return json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+
+
+def repair(value, schema):
+    """Değeri API'ye gitmeden şemaya yaklaştır
+
+    Anahtarlar katlanarak eşleştirilir ("bolum1" -> "bölüm1"), sayılar
+    metne çevrilir, metin listeleri birleştirilir, boşluklar kırpılır.
+    Onarılamayan alanlar olduğu gibi bırakılır; `invalid_fields` bulur.
+    """
+    if schema.get("type") == "object":
+        if not isinstance(value, dict):
+            return value
+        folded = {fold_key(key): key for key in value}
+        result = {}
+        for name, sub_schema in schema.get("properties", {}).items():
+            key = name if name in value else folded.get(fold_key(name))
+            if key is not None:
+                result[name] = repair(value[key], sub_schema)
+        return result
+    if schema.get("type") == "string":
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return " ".join(item.strip() for item in value)
+        if isinstance(value, str):
+            return value.strip()
+    return value
+
+
+def invalid_fields(value, schema, path=()):
+    """Eksik, boş veya yanlış tipteki yaprak alanların yol listesi
+
+    Eksik ya da nesne olmayan bir bölümün tüm alanları ayrı ayrı listelenir;
+    böylece yalnızca bu alanlar yeniden istenebilir.
+    """
+    if schema.get("type") == "object":
+        if not isinstance(value, dict):
+            value = {}
+        paths = []
+        for name, sub_schema in schema.get("properties", {}).items():
+            paths.extend(invalid_fields(value.get(name), sub_schema, path + (name,)))
+        return paths
+    if schema.get("type") == "string":
+        if not isinstance(value, str) or len(value.strip()) < schema.get("minLength", 0):
+            return [path]
+    return []
+
+
+def path_name(path):
+    return ".".join(path)
+
+
+def set_path(data, path, value):
+    for name in path[:-1]:
+        if not isinstance(data.get(name), dict):
+            data[name] = {}
+        data = data[name]
+    data[path[-1]] = value
+
+
+def build_repair_prompt(data, paths):
+    """Yalnızca geçersiz alanları yeniden isteyen kısa prompt"""
+    fields = "\n".join(f"- {path_name(path)}" for path in paths)
+    return f"""
+            Aşağıdaki reels metni JSON'ında bazı alanlar eksik veya geçersiz.
+            Mevcut içerikle tutarlı olacak şekilde yalnızca bu alanlar için değer üret.
+            Her anahtar alanın noktalı yoludur, değerler Türkçe düz metin olmalıdır.
+
+            Eksik alanlar:
+            {fields}
+
+            Mevcut JSON:
+            {json.dumps(data, indent=2, ensure_ascii=False)}
+            """
+
+
+def build_repair_schema(paths):
+    return {
+        "type": "object",
+        "properties": {path_name(path): {"type": "string"} for path in paths},
+        "required": [path_name(path) for path in paths]
+    }
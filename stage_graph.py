@@ -0,0 +1,219 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+STAGE_PENDING = "bekliyor"
+STAGE_RUNNING = "çalışıyor"
+STAGE_DONE = "tamamlandı"
+STAGE_REUSED = "güncel"
+STAGE_FAILED = "hata"
+
+
+class Stage:
+    """Girdileri ve çıktıları adlandırılmış tek bir aşama
+
+    `fn(*girdiler)` girdiler bildirildiği sırayla verilerek çağrılır; tek
+    çıktılı aşama değeri, çok çıktılı aşama {çıktı adı: değer} sözlüğünü
+    döndürür. Çıktılar verilmezse aşamanın adı tek çıktısıdır. `resource`
+    aynı kaynağı (ör. "image") kullanan aşamaların eşzamanlılığını sınırlar.
+
+    cutoff=True ise yeniden çalışan aşamanın çıktısı öncekine eşitse
+    sonraki aşamalar yeniden çalışmaz. Yalnızca saf değer üreten aşamalar
+    içindir; içeriği değişse de aynı dosya yolunu döndüren aşamalarda
+    kullanılmamalıdır.
+    """
+
+    def __init__(self, name, fn, inputs=(), outputs=None, resource=None, cutoff=False):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs) if outputs is not None else (name,)
+        self.resource = resource
+        self.cutoff = cutoff
+        self.state = STAGE_PENDING
+        self.started_at = None
+        self.duration = None
+        self.runs = 0
+        self.error = None
+
+
+class StageGraph:
+    """Aşamaları bağımlılık sırasına göre, bağımsız dalları eşzamanlı çalıştırır
+
+    Graf çalıştırmalar arasında değerleri ve her aşamanın hangi girdi
+    sürümleriyle çalıştığını saklar. `run` yeniden çağrıldığında yalnızca
+    girdisi değişen aşamalar ve onların sonrasındakiler çalışır; diğerleri
+    "güncel" olarak işaretlenir. `invalidate(aşama)` girdileri aynı kalsa da
+    bir aşamayı (ör. yeniden istenen görseli) tekrar çalıştırır.
+    """
+
+    def __init__(self, stages=(), max_workers=8, limits=None, on_stage=None):
+        self.stages = {}
+        self.producers = {}
+        self.values = {}
+        self.versions = {}
+        self.seen = {}
+        self.max_workers = max(1, int(max_workers))
+        # {kaynak: en fazla eşzamanlı aşama}
+        self.semaphores = {name: threading.BoundedSemaphore(max(1, int(limit)))
+                           for name, limit in (limits or {}).items()}
+        # on_stage(stage) her durum değişikliğinde run'ı çağıran thread'de çağrılır
+        self.on_stage = on_stage or (lambda stage: None)
+        for stage in stages:
+            self.add(stage)
+
+    def add(self, stage):
+        if stage.name in self.stages:
+            raise Exception(f"Aynı adlı iki aşama var: {stage.name}")
+        for output in stage.outputs:
+            if output in self.producers:
+                raise Exception(f"'{output}' çıktısını iki aşama üretiyor: "
+                                f"{self.producers[output].name}, {stage.name}")
+        self.stages[stage.name] = stage
+        for output in stage.outputs:
+            self.producers[output] = stage
+        return stage
+
+    def order(self):
+        """Aşamaları bağımlılık sırasına diz; döngü veya eksik girdi varsa hata ver"""
+        for stage in self.stages.values():
+            for name in stage.inputs:
+                if name not in self.producers and name not in self.values:
+                    raise Exception(f"{stage.name} aşamasının girdisi bulunamadı: {name}")
+        ordered = []
+        marks = {}
+
+        def visit(stage):
+            if marks.get(stage.name) == "bitti":
+                return
+            if marks.get(stage.name) == "ziyarette":
+                raise Exception(f"Aşamalar arasında döngü var: {stage.name}")
+            marks[stage.name] = "ziyarette"
+            for name in stage.inputs:
+                if name in self.producers:
+                    visit(self.producers[name])
+            marks[stage.name] = "bitti"
+            ordered.append(stage)
+
+        for stage in self.stages.values():
+            visit(stage)
+        return ordered
+
+    def set_input(self, name, value):
+        """Dış girdiyi ver; değer değiştiyse ona bağlı aşamalar yeniden çalışır"""
+        if name in self.producers:
+            raise Exception(f"'{name}' bir aşamanın çıktısı, dışarıdan verilemez")
+        self.store(name, value, cutoff=True)
+
+    def store(self, name, value, cutoff=False):
+        if cutoff and name in self.values and self.values[name] == value:
+            return
+        self.values[name] = value
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+    def invalidate(self, stage_name):
+        """Aşamayı bir sonraki run'da girdileri değişmemiş olsa da çalıştır"""
+        self.seen.pop(stage_name, None)
+
+    def is_dirty(self, stage):
+        seen = self.seen.get(stage.name)
+        if seen is None or any(output not in self.values for output in stage.outputs):
+            return True
+        return any(self.versions.get(name) != seen.get(name) for name in stage.inputs)
+
+    def is_ready(self, stage):
+        """Girdilerini üreten tüm aşamalar bitti mi"""
+        return all(
+            self.producers[name].state in (STAGE_DONE, STAGE_REUSED)
+            for name in stage.inputs if name in self.producers
+        )
+
+    def run_stage(self, stage, inputs):
+        semaphore = self.semaphores.get(stage.resource)
+        if semaphore is None:
+            started = time.perf_counter()
+            return stage.fn(*inputs), started
+        with semaphore:
+            # Süre kaynak beklemesini içermez
+            started = time.perf_counter()
+            return stage.fn(*inputs), started
+
+    def set_state(self, stage, state):
+        stage.state = state
+        self.on_stage(stage)
+
+    def run(self, inputs=None):
+        """Değişen aşamaları çalıştır ve tüm değerleri döndür
+
+        Bir aşama hata verirse yeni aşama başlatılmaz, çalışanlar beklenir
+        ve ilk hata yükselir.
+        """
+        for name, value in (inputs or {}).items():
+            self.set_input(name, value)
+        ordered = self.order()
+        for stage in ordered:
+            stage.state = STAGE_PENDING
+            stage.error = None
+
+        remaining = list(ordered)
+        running = {}
+        error = None
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="asama") as executor:
+            while remaining or running:
+                # Güncel sayılan aşamalar sonrakileri hemen hazır hale getirebilir; değişiklik kalmayana dek tara
+                progressed = error is None
+                while progressed:
+                    progressed = False
+                    for stage in list(remaining):
+                        if not self.is_ready(stage):
+                            continue
+                        remaining.remove(stage)
+                        progressed = True
+                        if not self.is_dirty(stage):
+                            self.set_state(stage, STAGE_REUSED)
+                            continue
+                        stage_inputs = [self.values[name] for name in stage.inputs]
+                        versions = {name: self.versions.get(name) for name in stage.inputs}
+                        stage.started_at = time.perf_counter()
+                        stage.runs += 1
+                        self.set_state(stage, STAGE_RUNNING)
+                        running[executor.submit(self.run_stage, stage, stage_inputs)] = (stage, versions)
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, versions = running.pop(future)
+                    try:
+                        result, started = future.result()
+                    except Exception as e:
+                        stage.duration = time.perf_counter() - stage.started_at
+                        stage.error = e
+                        self.seen.pop(stage.name, None)
+                        self.set_state(stage, STAGE_FAILED)
+                        error = error or e
+                        continue
+                    stage.duration = time.perf_counter() - started
+                    outputs = result if len(stage.outputs) > 1 else {stage.outputs[0]: result}
+                    for name in stage.outputs:
+                        self.store(name, outputs[name], stage.cutoff)
+                    self.seen[stage.name] = versions
+                    self.set_state(stage, STAGE_DONE)
+
+        if error is not None:
+            raise error
+        return dict(self.values)
+
+    def summary(self):
+        """Her aşamanın durumu, son çalışma süresi ve kaç kez çalıştığı"""
+        return [
+            {
+                "stage": stage.name,
+                "state": stage.state,
+                "duration_s": round(stage.duration, 4) if stage.duration is not None else None,
+                "runs": stage.runs,
+                "error": str(stage.error) if stage.error else None
+            }
+            for stage in self.order()
+        ]
@@ -0,0 +1,109 @@
+import os
+import warnings
+from functools import lru_cache
+
+from PIL import ImageDraw, ImageFont
+
+
+# Öncelik sırasıyla denenecek fontlar; REELS_FONT ile başka bir font verilebilir
+FONT_CANDIDATES = (
+    "arial.ttf",
+    "Arial.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "/Library/Fonts/Arial.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+    "DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    "/usr/share/fonts/liberation-sans/LiberationSans-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",
+    "/usr/share/fonts/noto/NotoSans-Regular.ttf",
+)
+TURKISH_GLYPHS = "çğıöşüÇĞİÖŞÜ"
+LINE_SPACING = 1.5
+
+
+def font_supports(font, chars):
+    """Fontta karakterlerin glifi var mı (eksik glifler .notdef kutusuyla çizilir)"""
+    missing = bytes(font.getmask("\uffff"))
+    return all(bytes(font.getmask(char)) != missing for char in chars)
+
+
+def font_candidates():
+    custom = os.getenv("REELS_FONT")
+    return ((custom,) if custom else ()) + FONT_CANDIDATES
+
+
+@lru_cache(maxsize=None)
+def resolve_font_path():
+    """Türkçe karakterleri çizebilen ilk fontun yolu, yoksa None"""
+    for path in font_candidates():
+        try:
+            font = ImageFont.truetype(path, 40)
+        except OSError:
+            continue
+        if font_supports(font, TURKISH_GLYPHS):
+            return path
+    warnings.warn(
+        "Türkçe karakterleri destekleyen bir font bulunamadı; Pillow'un varsayılan fontu "
+        "kullanılacak. REELS_FONT ortam değişkeniyle bir .ttf dosyası belirtebilirsiniz."
+    )
+    return None
+
+
+@lru_cache(maxsize=64)
+def load_font(size, path=None):
+    """(yol, boyut) başına bir kez yüklenen font"""
+    path = path or resolve_font_path()
+    if path is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=8192)
+def text_width(text, size, path=None):
+    return load_font(size, path).getlength(text)
+
+
+@lru_cache(maxsize=1024)
+def wrap_text(text, size, max_width, path=None):
+    """Metni max_width'e sığan satırlara böl, satırları tuple olarak döndür
+
+    Her kelime bir kez ölçülür; satır genişliği kelime ve boşluk
+    genişliklerinin toplamıyla tutulur. Tek başına sığmayan kelime kendi
+    satırına yazılır.
+    """
+    space = text_width(" ", size, path)
+    lines = []
+    current_line = []
+    current_width = 0
+    for word in text.split():
+        word_width = text_width(word, size, path)
+        if current_line and current_width + space + word_width > max_width:
+            lines.append(" ".join(current_line))
+            current_line = []
+        current_width = current_width + space + word_width if current_line else word_width
+        current_line.append(word)
+    lines.append(" ".join(current_line))
+    return tuple(lines)
+
+
+def draw_centered_lines(img_pil, lines, y, size, line_height, color=(255, 255, 255), path=None):
+    """Satırları yatayda ortalayarak y'den başlayarak çiz"""
+    draw = ImageDraw.Draw(img_pil)
+    font = load_font(size, path)
+    for line in lines:
+        x = (img_pil.width - text_width(line, size, path)) / 2
+        draw.text((x, y), line, font=font, fill=color)
+        y += line_height
+    return img_pil
+
+
+def layout_cache_info():
+    """Font, ölçüm ve satır kırma önbelleklerinin isabet istatistikleri"""
+    return {
+        "fonts": load_font.cache_info()._asdict(),
+        "widths": text_width.cache_info()._asdict(),
+        "layouts": wrap_text.cache_info()._asdict(),
+    }
@@ -0,0 +1,110 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from disk_cache import DEFAULT_CACHE_DIR, DiskCache, make_key
+from providers import ElevenLabsSpeechProvider
+from rate_limiter import RateLimitedProvider
+
+
+ELEVENLABS_VOICE_ID = "KbaseEXyT9EE0CQLEfbB"
+ELEVENLABS_MODEL_ID = "eleven_multilingual_v2"
+ELEVENLABS_VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.5
+}
+AUDIO_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+
+def default_audio_cache(max_bytes=AUDIO_CACHE_MAX_BYTES):
+    """Projeler arasında paylaşılan ses önbelleği"""
+    return DiskCache(os.path.join(DEFAULT_CACHE_DIR, "audio"), max_bytes=max_bytes, suffix=".mp3")
+
+
+class ElevenLabsTTS:
+    """Eleven Labs metin-ses istemcisi
+
+    Birden çok metin `max_concurrency` işçili bir havuzda eşzamanlı sese
+    çevrilir. İstekler `requests_per_second` hızında ve `burst` kapasiteli
+    bir token bucket ile sınırlandırılır; değerler Eleven Labs planının
+    eşzamanlılık ve istek limitlerine göre ayarlanmalıdır.
+
+    `cache` verilirse metin + ses + model + ses ayarlarıyla aynı olan bir
+    klip API'ye gitmeden önbellekten kopyalanır. İstekler `provider`
+    üzerinden gider (varsayılan: hız sınırlı gerçek Eleven Labs API'si).
+    Verilen provider'ın hız sınırı provider zincirine aittir; tekrar ve
+    hedge kopyalarının da sınıra uyması için sınırlayıcı dayanıklılık
+    katmanının altında olmalıdır (bkz. ReelsPipeline).
+    """
+
+    def __init__(self, api_key, voice_id=ELEVENLABS_VOICE_ID, model_id=ELEVENLABS_MODEL_ID,
+                 voice_settings=None, max_concurrency=2, requests_per_second=2.0, burst=None,
+                 cache=None, provider=None):
+        self.api_key = api_key
+        self.voice_id = voice_id
+        self.model_id = model_id
+        self.voice_settings = dict(voice_settings or ELEVENLABS_VOICE_SETTINGS)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.cache = cache
+        if provider is None:
+            provider = RateLimitedProvider(ElevenLabsSpeechProvider(api_key, self.max_concurrency),
+                                           requests_per_second, self.max_concurrency, burst)
+        self.provider = provider
+
+    def cache_key(self, text):
+        return make_key("elevenlabs", text, self.voice_id, self.model_id, self.voice_settings)
+
+    def create_audio_file(self, text, filename):
+        """Eleven Labs API ile ses dosyası oluştur, varsa önbellekten al
+
+        Servis hatası ProviderError olarak yukarı aktarılır.
+        """
+        key = self.cache_key(text)
+        if self.cache is not None and self.cache.materialize(key, filename):
+            return True
+
+        request = {
+            "text": text,
+            "voice_id": self.voice_id,
+            "model_id": self.model_id,
+            "voice_settings": self.voice_settings
+        }
+
+        audio = self.provider.call(request)
+
+        with open(filename, 'wb') as f:
+            f.write(audio)
+
+        if self.cache is not None:
+            self.cache.put_file(key, filename)
+        return True
+
+    def create_audio_files(self, items, on_complete=None):
+        """(metin, dosya yolu) listesini eşzamanlı sese çevir
+
+        Sonuçlar girdi sırasıyla True listesi olarak döner. `on_complete`
+        her dosya bittiğinde çağıran thread üzerinde (index, başarı) ile
+        çağrılır; bu sayede Tk gibi tek thread'li arayüzler güvenle güncellenir.
+        Bir klip hata verirse başlamamış istekler iptal edilip hata yukarı aktarılır.
+        """
+        results = [False] * len(items)
+        if not items:
+            return results
+
+        for _, filename in items:
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items)))
+        try:
+            futures = {
+                executor.submit(self.create_audio_file, text, filename): index
+                for index, (text, filename) in enumerate(items)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index] = future.result()
+                if on_complete:
+                    on_complete(index, results[index])
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return results
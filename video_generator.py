@@ -0,0 +1,570 @@
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+from mutagen.mp3 import MP3
+from PIL import Image
+
+from disk_cache import DEFAULT_CACHE_DIR, DiskCache, file_sha256, make_key
+from text_layout import LINE_SPACING, draw_centered_lines, resolve_font_path, wrap_text
+
+
+# "segments": her bölüm ayrı, önbelleklenen bir segment olarak kodlanır ve
+#             segmentler yeniden kodlanmadan birleştirilir
+# "scenes": her durağan sahne bir kez kodlanır (değişken frame hızı)
+# "stream": frame'ler pipe ile tek ffmpeg sürecine akıtılır, ses aynı çağrıda eklenir
+# "frames": her frame ayrı ayrı cv2.VideoWriter'a yazılır
+RENDER_MODES = ("segments", "scenes", "stream", "frames")
+SEGMENT_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+# Sahne çizimi değiştiğinde eski segmentlerin kullanılmaması için artırılır
+SEGMENT_FORMAT_VERSION = 1
+
+# Kodlama profilleri: draft hızlı önizleme, standard paylaşım, archive yüksek kalite.
+# Durağan görseller için x264 "stillimage" ayarı; faststart moov atomunu dosyanın
+# başına taşır, video indirilirken oynatılmaya başlar.
+ENCODING_PROFILES = {
+    "draft": {
+        "codec": "libx264",
+        "preset": "ultrafast",
+        "crf": 30,
+        "tune": "stillimage",
+        "pix_fmt": "yuv420p",
+        "audio_bitrate": "96k",
+        "faststart": True
+    },
+    "standard": {
+        "codec": "libx264",
+        "preset": "medium",
+        "crf": 23,
+        "tune": "stillimage",
+        "pix_fmt": "yuv420p",
+        "audio_bitrate": "128k",
+        "faststart": True
+    },
+    "archive": {
+        "codec": "libx264",
+        "preset": "slow",
+        "crf": 16,
+        "tune": "stillimage",
+        "pix_fmt": "yuv420p",
+        "audio_bitrate": "192k",
+        "faststart": True
+    }
+}
+DEFAULT_ENCODING_PROFILE = "standard"
+
+
+def default_segment_cache(max_bytes=SEGMENT_CACHE_MAX_BYTES):
+    """Görsel, metin ve süreye göre kodlanmış bölüm segmentleri"""
+    return DiskCache(os.path.join(DEFAULT_CACHE_DIR, "segments"), max_bytes=max_bytes, suffix=".mp4")
+
+
+def clean_title(title, fallback="video"):
+    """Başlığı dosya/klasör adına uygun hale getir"""
+    cleaned = "".join(x for x in str(title) if x.isalnum() or x in (" ", "-", "_"))
+    return cleaned.replace(" ", "_")[:50] or fallback
+
+
+def encode_segment_worker(output_dir, generation_data, encoding_profile, frame_settings, index, spec, segment_dir,
+                          threads):
+    """İşçi süreçte tek bir segmenti kodla
+
+    frame_settings (genişlik, yükseklik, fps) ana süreçteki ayarlardır;
+    segment anahtarı bu değerlerle hesaplandığı için işçide de aynısı kullanılır.
+    """
+    video_gen = VideoGenerator(output_dir, generation_data, "segments", encoding_profile=encoding_profile)
+    video_gen.width, video_gen.height, video_gen.fps = frame_settings
+    return video_gen.encode_segment(index, spec, segment_dir, threads)
+
+
+class VideoGenerator:
+    def __init__(self, output_dir, generation_data, render_mode="scenes", segment_cache=None,
+                 encoding_profile=DEFAULT_ENCODING_PROFILE, render_workers=1, scratch_dir=None):
+        self.output_dir = output_dir
+        # Ara dosyalar her render için bu dizinde açılan ayrı bir klasöre yazılır
+        self.scratch_dir = scratch_dir
+        self.generation_data = generation_data
+        self.render_mode = render_mode
+        self.encoding_profile = encoding_profile
+        # "segments" modunda aynı anda kodlanacak en fazla segment (süreç) sayısı
+        self.render_workers = max(1, int(render_workers))
+        self.segment_cache = segment_cache
+        self.segment_stats = {"reused": 0, "encoded": 0}
+        self.height = 1920
+        self.width = 1080
+        self.fps = 30
+
+    def create_base_frame(self):
+        """Temel frame oluştur"""
+        return np.zeros((self.height, self.width, 3), dtype=np.uint8)
+
+    def add_text_to_frame(self, frame, text, y_position, font_size=60, color=(255, 255, 255)):
+        """Frame'e text ekle"""
+        lines = wrap_text(text, font_size, self.width - 100)  # Margins
+        img_pil = draw_centered_lines(
+            Image.fromarray(frame), lines, y_position, font_size, font_size * LINE_SPACING, color
+        )
+        return np.array(img_pil)
+
+    def add_text_overlay(self, frame, text, pos_y, font_size=40):
+        """Yarı saydam arkaplan üzerine text ekle"""
+        overlay = frame.copy()
+        overlay_height = 200
+        cv2.rectangle(overlay, 
+                     (0, pos_y), 
+                     (self.width, pos_y + overlay_height),
+                     (0, 0, 0), 
+                     -1)
+        
+        alpha = 0.7
+        frame = cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0)
+        return self.add_text_to_frame(frame, text, pos_y + 20, font_size)
+
+    def get_audio_duration(self, audio_path):
+        """MP3 dosyasının süresini al"""
+        try:
+            audio = MP3(audio_path)
+            return audio.info.length
+        except Exception as e:
+            print(f"Ses süresi alınamadı: {str(e)}")
+            return 5.0  # Varsayılan süre
+
+    def create_title_overlay(self, image, title):
+        """İlk görsele başlık ekle"""
+        overlay_height = 200
+        overlay = image.copy()
+        
+        # Üst kısma yarı saydam siyah overlay ekle
+        cv2.rectangle(overlay, 
+                     (0, 0),
+                     (self.width, overlay_height),
+                     (0, 0, 0),
+                     -1)
+        
+        # Blend the overlay
+        alpha = 0.7
+        image = cv2.addWeighted(overlay, alpha, image, 1 - alpha, 0)
+        
+        # Başlığı ekle
+        return self.add_text_to_frame(image, title, 50, 60)
+
+    def section_count(self):
+        return len(self.generation_data['texts'])
+
+    def get_audio_paths(self):
+        """Başlık ve bölüm seslerinin yollarını sırayla döndür"""
+        ses_klasoru = os.path.join(self.output_dir, "sesler")
+        return [os.path.join(ses_klasoru, "0_ana_baslik.mp3")] + [
+            os.path.join(ses_klasoru, f"{i}_metin.mp3") for i in range(1, self.section_count() + 1)
+        ]
+
+    def scene_frames(self, frame, n_frames):
+        """Durağan bir sahnenin frame'lerini tek tek üret
+
+        Her adımda aynı salt okunur buffer döner; süre ne olursa olsun bellekte
+        tek frame tutulur. Frame'i değiştirmek isteyen çağıran kopyalamalıdır.
+        """
+        frame = np.ascontiguousarray(frame)
+        frame.setflags(write=False)
+        for _ in range(n_frames):
+            yield frame
+
+    def iter_frames(self, scenes):
+        """Sahne akışını frame akışına çevir"""
+        for frame, n_frames in scenes:
+            yield from self.scene_frames(frame, n_frames)
+
+    def scene_specs(self):
+        """Her sahne için (görsel yolu, metin, başlık mı, frame sayısı) listesi
+
+        İlk sahne ilk görsel üzerine başlıktır ve başlık sesi süresince
+        gösterilir; diğerleri bölüm görselleri ve metinleridir.
+        """
+        return [
+            self.scene_spec(index, self.get_audio_duration(audio_path))
+            for index, audio_path in enumerate(self.get_audio_paths())
+        ]
+
+    def scene_spec(self, index, duration):
+        """Tek sahnenin bilgisi; 0 başlık sahnesi, i. sahne i. bölümdür"""
+        if index == 0:
+            return (self.generation_data['images'][0], str(self.generation_data['title']), True,
+                    int(duration * self.fps))
+        return (self.generation_data['images'][index - 1], self.generation_data['texts'][index - 1], False,
+                int(duration * self.fps))
+
+    def render_scene(self, image_path, text, is_title):
+        """Sahnenin tek frame'ini çiz"""
+        image = cv2.imread(image_path)
+        if image is None:
+            raise Exception(f"Görsel okunamadı: {image_path}")
+        image = cv2.resize(image, (self.width, self.height))
+        if is_title:
+            return self.create_title_overlay(image, text)
+        return self.add_text_overlay(image, text, self.height - 250)
+
+    def iter_scenes(self):
+        """Her sahne için (frame, frame sayısı) üret
+
+        Sahneler durağan görsellerdir; her biri yalnızca bir kez ve ihtiyaç
+        anında hazırlanır, böylece bellekte aynı anda tek sahne bulunur.
+        """
+        for image_path, text, is_title, n_frames in self.scene_specs():
+            yield self.render_scene(image_path, text, is_title), n_frames
+
+    def audio_concat_args(self, first_input_index=1):
+        """Sesleri aynı ffmpeg çağrısında birleştirip videoya eklemek için argümanlar"""
+        audio_paths = self.get_audio_paths()
+        args = []
+        for audio_path in audio_paths:
+            args += ['-i', audio_path]
+
+        labels = ''.join(f'[{first_input_index + i}:a]' for i in range(len(audio_paths)))
+        args += [
+            '-filter_complex', f'{labels}concat=n={len(audio_paths)}:v=0:a=1[a]',
+            '-map', '0:v', '-map', '[a]',
+            '-c:a', 'aac', '-b:a', self.profile()['audio_bitrate']
+        ]
+        return args
+
+    def run_ffmpeg(self, args, output_path, stdin_writer=None):
+        """ffmpeg'i çalıştır; hata olursa yarım kalan çıktıyı sil"""
+        process = subprocess.Popen(
+            ['ffmpeg', '-y', '-loglevel', 'error'] + args + [output_path],
+            stdin=subprocess.PIPE if stdin_writer else subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        try:
+            if stdin_writer:
+                try:
+                    stdin_writer(process.stdin)
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+            stderr = process.stderr.read()
+            process.wait()
+        except BaseException:
+            process.kill()
+            process.wait()
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+
+        if process.returncode != 0:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise Exception(f"ffmpeg hatası: {stderr.decode('utf-8', errors='replace').strip()}")
+
+    def profile(self):
+        if self.encoding_profile not in ENCODING_PROFILES:
+            raise Exception(f"Bilinmeyen kodlama profili: {self.encoding_profile}")
+        return ENCODING_PROFILES[self.encoding_profile]
+
+    def video_codec_args(self):
+        """Seçili profile göre video kodlama argümanları"""
+        profile = self.profile()
+        args = ['-c:v', profile['codec']]
+        if profile.get('preset'):
+            args += ['-preset', profile['preset']]
+        if profile.get('crf') is not None:
+            args += ['-crf', str(profile['crf'])]
+        if profile.get('bitrate'):
+            args += ['-b:v', profile['bitrate']]
+        if profile.get('tune'):
+            args += ['-tune', profile['tune']]
+        return args + ['-pix_fmt', profile['pix_fmt']]
+
+    def container_args(self):
+        """Final dosya için kapsayıcı argümanları"""
+        return ['-movflags', '+faststart'] if self.profile().get('faststart') else []
+
+    def segment_key(self, image_path, text, is_title, n_frames):
+        return make_key(
+            "segment", SEGMENT_FORMAT_VERSION, file_sha256(image_path), text, is_title, n_frames,
+            self.width, self.height, self.fps, resolve_font_path(), self.video_codec_args()
+        )
+
+    def encode_segment(self, index, spec, segment_dir, threads=None):
+        """Sahneyi sabit frame hızlı, sessiz bir segment olarak kodla, yolunu döndür
+
+        Görsel okuma, boyutlandırma, yazı bindirme ve kodlama bu çağrıda
+        yapılır; paralel modda her segment ayrı bir süreçte çalışır.
+        """
+        image_path, text, is_title, n_frames = spec
+        scene_path = os.path.join(segment_dir, f"sahne_{index}.png")
+        if not cv2.imwrite(scene_path, self.render_scene(image_path, text, is_title)):
+            raise Exception(f"Sahne görseli yazılamadı: {scene_path}")
+
+        # Görsel tek frame olarak kodlanır; son frame'in zaman damgası
+        # segmentin tam n_frames / fps sürmesini sağlar
+        scene_list = os.path.join(segment_dir, f"sahne_{index}.txt")
+        self.write_scene_list(scene_list, [(os.path.abspath(scene_path), (n_frames - 1) / self.fps)])
+        segment_path = os.path.abspath(os.path.join(segment_dir, f"segment_{index}.mp4"))
+        thread_args = ['-threads', str(threads)] if threads else []
+        self.run_ffmpeg([
+            '-f', 'concat', '-safe', '0',
+            '-i', scene_list,
+            '-vsync', 'vfr',
+            '-enc_time_base', f'1/{self.fps}',
+        ] + self.video_codec_args() + thread_args, segment_path)
+        return segment_path
+
+    def precompute_segment(self, index, spec, segment_dir, threads=None):
+        """Segment önbellekte yoksa kodlayıp önbelleğe koy; kodlandıysa True döndür
+
+        Render'dan önce arka planda çağrılır; render sırasında aynı anahtar
+        önbellekte bulunur ve yalnızca birleştirme yapılır. Aynı anda birden
+        fazla segment kodlanıyorsa `threads` ffmpeg'in thread sayısını sınırlar.
+        """
+        if self.segment_cache is None or spec[3] <= 0:
+            return False
+        key = self.segment_key(*spec)
+        if self.segment_cache.get(key, count=False) is not None:
+            return False
+        self.segment_cache.put_file(key, self.encode_segment(index, spec, segment_dir, threads))
+        return True
+
+    def encode_segments(self, jobs, segment_dir):
+        """(index, spec) listesindeki segmentleri kodla; {index: yol} döndür
+
+        Birden fazla segment ve worker varsa segmentler ayrı süreçlerde
+        eşzamanlı kodlanır; ffmpeg thread'leri çekirdeklere bölüştürülür.
+        """
+        workers = min(self.render_workers, len(jobs))
+        if workers < 2:
+            return {index: self.encode_segment(index, spec, segment_dir) for index, spec in jobs}
+
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = {
+                index: executor.submit(
+                    encode_segment_worker, self.output_dir, self.generation_data, self.encoding_profile,
+                    (self.width, self.height, self.fps), index, spec, segment_dir, threads
+                )
+                for index, spec in jobs
+            }
+            return {index: future.result() for index, future in futures.items()}
+
+    def write_segment_video(self, final_video_path, work_dir):
+        """Bölümleri ayrı segmentler olarak kodla ve yeniden kodlamadan birleştir
+
+        Yalnızca görseli, metni veya süresi değişen bölümler kodlanır; tek
+        görsel yenilendiğinde yalnızca o bölümün segmenti yeniden üretilir.
+        Sesler birleştirme sırasında eklenir.
+        """
+        segment_dir = os.path.abspath(work_dir)
+        self.segment_stats = {"reused": 0, "encoded": 0}
+
+        specs = [(index, spec) for index, spec in enumerate(self.scene_specs()) if spec[3] > 0]
+        if not specs:
+            raise Exception("Video için sahne bulunamadı")
+
+        # Önbellekte olan segmentler kullanılır, kalanlar kodlanır
+        segment_paths = {}
+        keys = {}
+        for index, spec in specs:
+            if self.segment_cache is None:
+                continue
+            keys[index] = self.segment_key(*spec)
+            cached_path = self.segment_cache.get(keys[index])
+            if cached_path is not None:
+                segment_paths[index] = os.path.abspath(cached_path)
+        self.segment_stats["reused"] = len(segment_paths)
+
+        missing = [(index, spec) for index, spec in specs if index not in segment_paths]
+        for index, segment_path in self.encode_segments(missing, segment_dir).items():
+            if self.segment_cache is not None:
+                segment_path = os.path.abspath(self.segment_cache.put_file(keys[index], segment_path))
+            segment_paths[index] = segment_path
+        self.segment_stats["encoded"] = len(missing)
+
+        segment_list = os.path.join(segment_dir, "segmentler.txt")
+        with open(segment_list, "w", encoding="utf-8") as f:
+            f.write("ffconcat version 1.0\n")
+            for index, _ in specs:
+                f.write(f"file '{segment_paths[index]}'\n")
+
+        self.run_ffmpeg([
+            '-f', 'concat', '-safe', '0',
+            '-i', segment_list,
+        ] + self.audio_concat_args() + [
+            '-c:v', 'copy'
+        ] + self.container_args(), final_video_path)
+
+    def write_frame_video(self, scenes, final_video_path, work_dir):
+        """Sahneleri frame frame cv2.VideoWriter ile yaz, ardından sesle birleştir"""
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        temp_video_path = os.path.join(work_dir, 'temp_video.mp4')
+        out = cv2.VideoWriter(
+            temp_video_path,
+            fourcc,
+            self.fps,
+            (self.width, self.height)
+        )
+
+        if not out.isOpened():
+            raise Exception("Video writer açılamadı")
+
+        try:
+            for frame in self.iter_frames(scenes):
+                out.write(frame)
+        finally:
+            out.release()
+
+        # Ses listesi dosyası
+        concat_list = os.path.join(work_dir, "concat_list.txt")
+        with open(concat_list, "w") as f:
+            for audio_file in self.get_audio_paths():
+                f.write(f"file '{os.path.abspath(audio_file)}'\n")
+
+        # Sesleri birleştir
+        combined_audio = os.path.join(work_dir, "combined_audio.mp3")
+        self.run_ffmpeg([
+            '-f', 'concat', '-safe', '0',
+            '-i', concat_list,
+            '-c', 'copy'
+        ], combined_audio)
+
+        # Final video oluştur; ara mp4v akışı profile göre yeniden kodlanır
+        self.run_ffmpeg([
+            '-i', temp_video_path,
+            '-i', combined_audio,
+        ] + self.video_codec_args() + [
+            '-c:a', 'aac', '-b:a', self.profile()['audio_bitrate']
+        ] + self.container_args(), final_video_path)
+
+    def write_scene_list(self, scene_list, entries):
+        """(görsel yolu, süre) listesinden ffmpeg concat listesi yaz"""
+        with open(scene_list, "w", encoding="utf-8") as f:
+            f.write("ffconcat version 1.0\n")
+            for scene_path, duration in entries:
+                f.write(f"file '{scene_path}'\n")
+                f.write(f"option framerate {self.fps}\n")
+                f.write(f"duration {duration:.6f}\n")
+            # Son sahnenin süresinin uygulanması için dosya tekrar edilir
+            f.write(f"file '{entries[-1][0]}'\n")
+            f.write(f"option framerate {self.fps}\n")
+
+    def write_scene_video(self, scenes, final_video_path, work_dir):
+        """Her sahneyi süresi boyunca tek frame olarak kodla (değişken frame hızı)
+
+        Sahne görselleri bir kez PNG olarak yazılır, ffmpeg concat demuxer her
+        görsele sahne süresi kadar zaman damgası verir. Kodlama süresi frame
+        sayısına değil sahne sayısına bağlıdır. Sesler aynı çağrıda eklenir.
+        """
+        entries = []
+        for index, (frame, n_frames) in enumerate(scenes):
+            if n_frames <= 0:
+                continue
+            scene_path = os.path.abspath(os.path.join(work_dir, f"sahne_{index}.png"))
+            if not cv2.imwrite(scene_path, frame):
+                raise Exception(f"Sahne görseli yazılamadı: {scene_path}")
+            entries.append((scene_path, n_frames / self.fps))
+
+        if not entries:
+            raise Exception("Video için sahne bulunamadı")
+
+        scene_list = os.path.join(work_dir, "sahneler.txt")
+        self.write_scene_list(scene_list, entries)
+
+        self.run_ffmpeg([
+            '-f', 'concat', '-safe', '0',
+            '-i', scene_list,
+        ] + self.audio_concat_args() + [
+            '-vsync', 'vfr',
+            '-enc_time_base', f'1/{self.fps}',
+        ] + self.video_codec_args() + self.container_args(), final_video_path)
+
+    def stream_frame_video(self, scenes, final_video_path, work_dir):
+        """Frame'leri pipe üzerinden tek bir ffmpeg sürecine akıt
+
+        Ara video ve birleşik ses dosyası yazılmaz; sesler aynı çağrıda
+        birleştirilir ve çıktı doğrudan hedef konuma yazılır.
+        """
+        def write_frames(stdin):
+            for frame in self.iter_frames(scenes):
+                stdin.write(frame.data)
+
+        self.run_ffmpeg([
+            '-f', 'rawvideo',
+            '-pix_fmt', 'bgr24',
+            '-s', f'{self.width}x{self.height}',
+            '-r', str(self.fps),
+            '-i', 'pipe:0',
+        ] + self.audio_concat_args() + self.video_codec_args() + self.container_args(),
+            final_video_path, stdin_writer=write_frames)
+
+    def generate_video(self, output_path=None):
+        """Videoyu oluştur; output_path verilmezse output_dir içine yazılır"""
+        try:
+            if not self.generation_data or 'title' not in self.generation_data:
+                raise Exception("Video başlığı bulunamadı")
+                
+            if not self.generation_data.get('images'):
+                raise Exception("Görsel dosyaları bulunamadı")
+                
+            if not self.generation_data.get('texts'):
+                raise Exception("Metin içeriği bulunamadı")
+
+            if self.render_mode not in RENDER_MODES:
+                raise Exception(f"Bilinmeyen render modu: {self.render_mode}")
+
+            if self.encoding_profile not in ENCODING_PROFILES:
+                raise Exception(f"Bilinmeyen kodlama profili: {self.encoding_profile}")
+            
+            os.makedirs(self.output_dir, exist_ok=True)
+            
+            # Varsayılan dosya adı pipeline'ın final video adıyla aynı kurala uyar
+            final_video_path = output_path or os.path.join(
+                self.output_dir, f"{clean_title(self.generation_data['title'])}.mp4")
+            os.makedirs(os.path.dirname(final_video_path) or ".", exist_ok=True)
+            
+            # Ara dosyalar bu render'a özel klasöre yazılır; eşzamanlı
+            # render'lar birbirinin dosyalarını ezmez
+            scratch_root = self.scratch_dir or self.output_dir
+            os.makedirs(scratch_root, exist_ok=True)
+            work_dir = tempfile.mkdtemp(prefix="render_", dir=scratch_root)
+            
+            # Sahneleri hazırla ve seçilen modda videoyu yaz
+            try:
+                scenes = self.iter_scenes()
+                if self.render_mode == "segments":
+                    self.write_segment_video(final_video_path, work_dir)
+                elif self.render_mode == "scenes":
+                    self.write_scene_video(scenes, final_video_path, work_dir)
+                elif self.render_mode == "stream":
+                    self.stream_frame_video(scenes, final_video_path, work_dir)
+                else:
+                    self.write_frame_video(scenes, final_video_path, work_dir)
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            
+            return final_video_path
+            
+        except Exception as e:
+            print(f"Video generation error details: {str(e)}")
+            raise Exception(f"Video generation error: {str(e)}")
+
+    def create_title_sequence(self, title, duration):
+        """Başlık sekansının frame'lerini üreten generator döndür
+
+        Başlık bir kez çizilir; tüm frame'ler aynı buffer'ı paylaşır.
+        """
+        n_frames = int(duration * self.fps)
+        
+        # Siyah arkaplan oluştur
+        base_frame = self.create_base_frame()
+        
+        # Başlığı ekle ve dikeyde ortala (80 piksel line spacing)
+        lines = wrap_text(title, 60, self.width - 100)
+        y = (self.height - (len(lines) * 80)) // 2
+        img_pil = draw_centered_lines(Image.fromarray(base_frame), lines, y, 60, 80)
+        frame_with_text = np.array(img_pil)
+        
+        return self.scene_frames(frame_with_text, n_frames)